@@ -1,260 +1,98 @@
-import json
-import os
-import threading
 import time
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-import pyautogui
-from pynput import keyboard
-
-def parse_hotkey_string(s: str):
-    s = s.strip().lower()
-    if not s:
-        return None
-    try:
-        key_obj = getattr(keyboard.Key, s)
-        return key_obj
-    except (AttributeError, TypeError):
-        pass
-    if len(s) == 1:
-        return keyboard.KeyCode.from_char(s)
-    return None
-
-def hotkey_to_string(key_obj):
-    if isinstance(key_obj, keyboard.Key):
-        return key_obj.name
-    elif isinstance(key_obj, keyboard.KeyCode):
-        return key_obj.char or ""
-    else:
-        return ""
-
-class Macro:
-    def __init__(self, name: str, trigger_key, button: str, key_to_send: str,
-                 n_clicks: int, interval: float, x_coord=None, y_coord=None, start_delay=0.0):
-        self.name = name
-        self.trigger_key = trigger_key
-        self.button = button
-        self.key_to_send = key_to_send
-        self.n_clicks = max(1, n_clicks)
-        self.interval = max(0.0, interval)
-        self.x_coord = x_coord if x_coord is not None else None
-        self.y_coord = y_coord if y_coord is not None else None
-        self.start_delay = max(0.0, start_delay)
-
-    def display_name(self):
-        hk = hotkey_to_string(self.trigger_key) or "?"
-        return f"{self.name} [{hk}]"
-
-    def to_dict(self):
-        return {
-            "name": self.name,
-            "trigger_key": hotkey_to_string(self.trigger_key),
-            "button": self.button,
-            "key_to_send": self.key_to_send,
-            "n_clicks": self.n_clicks,
-            "interval": self.interval,
-            "x_coord": self.x_coord,
-            "y_coord": self.y_coord,
-            "start_delay": self.start_delay,
-        }
-
-    @staticmethod
-    def from_dict(d):
-        tk_str = d.get("trigger_key", "").strip()
-        tk_parsed = parse_hotkey_string(tk_str)
-        return Macro(
-            name=d.get("name", "(no name)"),
-            trigger_key=tk_parsed,
-            button=d.get("button", "left"),
-            key_to_send=d.get("key_to_send", ""),
-            n_clicks=int(d.get("n_clicks", 1)),
-            interval=float(d.get("interval", 0.1)),
-            x_coord=(None if d.get("x_coord") is None else int(d.get("x_coord"))),
-            y_coord=(None if d.get("y_coord") is None else int(d.get("y_coord"))),
-            start_delay=float(d.get("start_delay", 0.0)),
-        )
-
-class AutoClicker:
-    def __init__(self, gui_reference):
-        self.gui = gui_reference
-        self.clicks_per_second = 1.0
-        self.trigger_key = keyboard.Key.f3
-        self.stop_after_total = 0
-        self.mode = "press"
-        self.button = "left"
-        self.key_to_send = ""
-        self.use_fixed_master = False
-        self.master_x = None
-        self.master_y = None
-        self._clicking = False
-        self._total_clicks_sent = 0
-        self._toggle_thread = None
-        self.macros = []
-        self._load_macros_from_disk()
-        self._listener = keyboard.Listener(
-            on_press=self._on_key_press,
-            on_release=self._on_key_release
-        )
-        self._listener.daemon = True
-        self._listener.start()
-
-    def _load_macros_from_disk(self):
-        try:
-            if os.path.isfile("macros.json"):
-                with open("macros.json", "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self.macros = [Macro.from_dict(item) for item in data]
-            else:
-                self.macros = []
-        except Exception as e:
-            messagebox.showwarning("Load Error", f"Failed to load macros.json:\n{e}")
-            self.macros = []
-
-    def _save_macros_to_disk(self):
-        try:
-            with open("macros.json", "w", encoding="utf-8") as f:
-                json.dump([m.to_dict() for m in self.macros], f, indent=2)
-        except Exception as e:
-            messagebox.showerror("Save Error", f"Failed to save macros.json:\n{e}")
-
-    def _on_key_press(self, key):
-        for macro in self.macros:
-            if key == macro.trigger_key:
-                threading.Thread(target=self._run_macro, args=(macro,), daemon=True).start()
-                return
-        if key == self.trigger_key:
-            if self.mode == "press":
-                if not self._clicking:
-                    self._start_continuous_master()
-            elif self.mode == "toggle":
-                if not self._clicking:
-                    self._start_continuous_master()
-                else:
-                    self._stop_continuous_master()
-
-    def _on_key_release(self, key):
-        if self.mode == "press" and key == self.trigger_key:
-            self._stop_continuous_master()
-
-    def _start_continuous_master(self):
-        if self._toggle_thread and self._toggle_thread.is_alive():
-            return
-        self._clicking = True
-        self.gui.set_status("clicking")
-        self._toggle_thread = threading.Thread(target=self._continuous_master_loop, daemon=True)
-        self._toggle_thread.start()
-
-    def _continuous_master_loop(self):
-        cps = max(self.clicks_per_second, 0.01)
-        interval = 1.0 / cps
-        while self._clicking:
-            if self.stop_after_total > 0 and self._total_clicks_sent >= self.stop_after_total:
-                break
-            self._send_one_click_master()
-            self._total_clicks_sent += 1
-            time.sleep(interval)
-        self._clicking = False
-        self.gui.set_status("idle")
-
-    def _stop_continuous_master(self):
-        self._clicking = False
-        self.gui.set_status("idle")
-
-    def _send_one_click_master(self):
-        if self.use_fixed_master and self.master_x is not None and self.master_y is not None:
-            pyautogui.click(x=self.master_x, y=self.master_y, button=self.button)
+from tkinter import ttk
+from autoclicker_core import (
+    AutoClicker, ClickerChannel, INPUT_BACKENDS, MACRO_POLICIES, Macro, MacroSearchIndex, PyAutoGUIBackend,
+    check_profile_name, format_pattern_text,
+    format_steps_text, format_watch_text, hotkey_index_key, hotkey_to_string, key_name, parse_hotkey_string,
+    parse_pattern_text, parse_steps_text, parse_watch_text,
+)
+from autoclicker_sim import estimate_macro, format_duration
+
+FRAME_MS = 16
+IDLE_FRAME_MS = 100
+COUNTER_REFRESH_MS = 100
+MACRO_LOAD_CHUNK = 500
+STATS_REFRESH_MS = 500
+MACRO_ROWS = 8
+ESTIMATE_DELAY_MS = 150
+
+class MacroListView:
+    def __init__(self, parent, rows: int = MACRO_ROWS):
+        self.rows = rows
+        self.items = []
+        self.top = 0
+        self.selected = None
+        self._shown = None
+        self.listbox = tk.Listbox(parent, height=rows, exportselection=False, activestyle="none")
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self._on_scrollbar)
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1) or "break")
+        self.listbox.bind("<Button-4>", lambda e: self.scroll(-1) or "break")
+        self.listbox.bind("<Button-5>", lambda e: self.scroll(1) or "break")
+        self.listbox.bind("<Up>", lambda e: self.move_selection(-1) or "break")
+        self.listbox.bind("<Down>", lambda e: self.move_selection(1) or "break")
+        self.listbox.bind("<Prior>", lambda e: self.move_selection(-rows) or "break")
+        self.listbox.bind("<Next>", lambda e: self.move_selection(rows) or "break")
+
+    def set_items(self, items):
+        self.items = items
+        self.top = max(0, min(self.top, len(items) - self.rows))
+        self.render()
+
+    def scroll(self, rows: int):
+        self.scroll_to(self.top + rows)
+
+    def scroll_to(self, top: int):
+        top = max(0, min(top, len(self.items) - self.rows))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.items)))
+        elif unit == "pages":
+            self.scroll(int(amount) * self.rows)
         else:
-            if self.button in ("left", "middle", "right"):
-                pyautogui.click(button=self.button)
-            else:
-                k = self.key_to_send.strip().lower()
-                if k:
-                    pyautogui.press(k)
-
-    def _run_macro(self, macro: Macro):
-        if macro.start_delay > 0:
-            self.gui.set_status(f"delaying {macro.name}")
-            self.gui.set_status_color("orange")
-            time.sleep(macro.start_delay)
-        self.gui.set_status(f"macro: {macro.name}")
-        self.gui.set_status_color("orange")
-        for _ in range(macro.n_clicks):
-            if self.stop_after_total > 0 and self._total_clicks_sent >= self.stop_after_total:
-                break
-            if macro.x_coord is not None and macro.y_coord is not None:
-                pyautogui.click(x=macro.x_coord, y=macro.y_coord, button=macro.button)
-            else:
-                if macro.button in ("left", "middle", "right"):
-                    pyautogui.click(button=macro.button)
-                else:
-                    k = macro.key_to_send.strip().lower()
-                    if k:
-                        pyautogui.press(k)
-            self._total_clicks_sent += 1
-            time.sleep(macro.interval)
-        if self._clicking:
-            self.gui.set_status("clicking")
-            self.gui.set_status_color("red")
+            self.scroll(int(amount))
+
+    def render(self):
+        visible = self.items[self.top:self.top + self.rows]
+        names = tuple(m.display_name() for m in visible)
+        if names != self._shown:
+            self._shown = names
+            self.listbox.delete(0, tk.END)
+            self.listbox.insert(tk.END, *names)
+        self.listbox.selection_clear(0, tk.END)
+        for row, macro in enumerate(visible):
+            if macro is self.selected:
+                self.listbox.selection_set(row)
+        count = len(self.items)
+        if count:
+            self.scrollbar.set(self.top / count, (self.top + len(visible)) / count)
         else:
-            self.gui.set_status("idle")
-            self.gui.set_status_color("green")
+            self.scrollbar.set(0.0, 1.0)
 
-    def update_settings_from_gui(self):
-        try:
-            cps = float(self.gui.var_n_clicks.get())
-            if cps <= 0:
-                cps = 0.01
-        except ValueError:
-            cps = 0.01
-        self.clicks_per_second = cps
-        desired = self.gui.var_trigger_key.get().strip()
-        pk = parse_hotkey_string(desired)
-        if pk:
-            self.trigger_key = pk
+    def _on_select(self, _event):
+        sel = self.listbox.curselection()
+        if sel and self.top + sel[0] < len(self.items):
+            self.selected = self.items[self.top + sel[0]]
+
+    def move_selection(self, delta: int):
+        if not self.items:
+            return
         try:
-            sa = int(self.gui.var_stop_at.get())
-            if sa < 0:
-                sa = 0
-        except ValueError:
-            sa = 0
-        self.stop_after_total = sa
-        self.mode = self.gui.var_mode.get()
-        sel = self.gui.var_button_choice.get()
-        if sel in ("left", "middle", "right", "key"):
-            self.button = sel
-        else:
-            self.button = "left"
-        self.key_to_send = self.gui.var_key_to_send.get().strip().lower()
-        self.use_fixed_master = bool(self.gui.var_use_fixed.get())
-        if self.use_fixed_master:
-            try:
-                mx = int(self.gui.var_master_x.get())
-                my = int(self.gui.var_master_y.get())
-            except ValueError:
-                mx = None
-                my = None
-            self.master_x = mx
-            self.master_y = my
-        else:
-            self.master_x = None
-            self.master_y = None
-
-    def stop_immediately(self):
-        self._clicking = False
-        self._total_clicks_sent = 0
-        self.gui.set_status("idle")
-        self.gui.set_status_color("green")
-
-    def shutdown(self):
-        self._clicking = False
-        self._total_clicks_sent = 0
-        if self._listener:
-            self._listener.stop()
-        self._save_macros_to_disk()
-
-    @property
-    def total_clicks_sent(self):
-        return self._total_clicks_sent
+            pos = next(i for i, m in enumerate(self.items) if m is self.selected) + delta
+        except StopIteration:
+            pos = self.top
+        pos = max(0, min(pos, len(self.items) - 1))
+        self.selected = self.items[pos]
+        if pos < self.top:
+            self.scroll_to(pos)
+        elif pos >= self.top + self.rows:
+            self.scroll_to(pos - self.rows + 1)
+        self.render()
 
 class AutoClickerGUI:
     def __init__(self, root):
@@ -273,6 +111,10 @@ class AutoClickerGUI:
         self.total_var = tk.IntVar(value=0)
         self.total_label = ttk.Label(status_frame, textvariable=self.total_var, foreground="blue")
         self.total_label.grid(row=0, column=3, sticky="w", padx=(4, 0))
+        ttk.Label(status_frame, text="achieved:", font=("Segoe UI", 10, "bold")).grid(row=1, column=0, sticky="w")
+        self.achieved_var = tk.StringVar(value="-")
+        ttk.Label(status_frame, textvariable=self.achieved_var, foreground="gray30").grid(
+            row=1, column=1, columnspan=3, sticky="w", padx=(4, 0))
         settings_frame = ttk.LabelFrame(root, text="Master Clicker Settings", padding=(8, 8))
         settings_frame.grid(row=1, column=0, sticky="ew", padx=8, pady=(0, 8))
         for c in range(4):
@@ -283,7 +125,7 @@ class AutoClickerGUI:
         self.entry_n_clicks.grid(row=0, column=1, sticky="w", padx=(4, 0), pady=(2, 2))
         ttk.Label(settings_frame, text="trigger (master):").grid(row=1, column=0, sticky="w")
         self.var_trigger_key = tk.StringVar(value="f3")
-        self.entry_trigger_key = ttk.Entry(settings_frame, textvariable=self.var_trigger_key, width=8)
+        self.entry_trigger_key = ttk.Entry(settings_frame, textvariable=self.var_trigger_key, width=16)
         self.entry_trigger_key.grid(row=1, column=1, sticky="w", padx=(4, 0), pady=(2, 2))
         ttk.Label(settings_frame, text="stop at:").grid(row=2, column=0, sticky="w")
         self.var_stop_at = tk.StringVar(value="0")
@@ -300,13 +142,29 @@ class AutoClickerGUI:
         self.var_master_y = tk.StringVar(value="")
         self.entry_master_y = ttk.Entry(settings_frame, textvariable=self.var_master_y, width=6, state="disabled")
         self.entry_master_y.grid(row=2, column=3, sticky="w", padx=(4, 0), pady=(2, 2))
+        self.var_catch_up = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Catch up missed clicks", variable=self.var_catch_up).grid(
+            row=3, column=0, columnspan=2, sticky="w", pady=(2, 0))
+        ttk.Label(settings_frame, text="backend:").grid(row=3, column=2, sticky="e", padx=(8, 0), pady=(2, 0))
+        self.var_backend = tk.StringVar(value=PyAutoGUIBackend.name)
+        ttk.Combobox(settings_frame, textvariable=self.var_backend, values=list(INPUT_BACKENDS),
+                     state="readonly", width=10).grid(row=3, column=3, sticky="w", padx=(4, 0), pady=(2, 0))
+        self.var_burst = tk.BooleanVar(value=False)
+        ttk.Checkbutton(settings_frame, text="Burst mode (group clicks per tick)", variable=self.var_burst).grid(
+            row=4, column=0, columnspan=4, sticky="w", pady=(2, 0))
+        ttk.Label(settings_frame, text="pattern:").grid(row=5, column=0, sticky="w", pady=(2, 0))
+        self.var_pattern = tk.StringVar(value="")
+        self.entry_pattern = tk.Entry(settings_frame, textvariable=self.var_pattern)
+        self.entry_pattern.grid(row=5, column=1, columnspan=3, sticky="ew", padx=(4, 0), pady=(2, 0))
         button_frame = ttk.Frame(root, padding=(8, 0))
         button_frame.grid(row=2, column=0, sticky="ew", padx=8)
-        button_frame.columnconfigure((0, 1), weight=1)
+        button_frame.columnconfigure((0, 1, 2), weight=1)
         self.btn_stop = ttk.Button(button_frame, text="STOP!", command=self._on_stop_pressed, state="disabled")
         self.btn_stop.grid(row=0, column=0, sticky="ew", padx=(0, 4), pady=(4, 4))
+        ttk.Button(button_frame, text="Stats", command=self._on_stats_pressed).grid(
+            row=0, column=1, sticky="ew", padx=(4, 4), pady=(4, 4))
         ttk.Button(button_frame, text="Help", command=self._on_help_pressed).grid(
-            row=0, column=1, sticky="ew", padx=(4, 0), pady=(4, 4))
+            row=0, column=2, sticky="ew", padx=(4, 0), pady=(4, 4))
         mode_frame = ttk.LabelFrame(root, text="Press / Toggle (Master)", padding=(8, 8))
         mode_frame.grid(row=3, column=0, sticky="ew", padx=8, pady=(0, 8))
         mode_frame.columnconfigure((0, 1), weight=1)
@@ -335,73 +193,260 @@ class AutoClickerGUI:
         macros_frame = ttk.LabelFrame(root, text="Macros", padding=(8, 8))
         macros_frame.grid(row=5, column=0, sticky="ew", padx=8, pady=(0, 8))
         macros_frame.columnconfigure(0, weight=1)
-        self.listbox_macros = tk.Listbox(macros_frame, height=6, exportselection=False)
-        self.listbox_macros.grid(row=0, column=0, sticky="ew")
-        scrollbar = ttk.Scrollbar(macros_frame, orient="vertical", command=self.listbox_macros.yview)
-        scrollbar.grid(row=0, column=1, sticky="ns", padx=(4, 0))
-        self.listbox_macros.configure(yscrollcommand=scrollbar.set)
+        search_frame = ttk.Frame(macros_frame)
+        search_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 4))
+        search_frame.columnconfigure(1, weight=1)
+        ttk.Label(search_frame, text="Search:").grid(row=0, column=0, sticky="w")
+        self.var_macro_search = tk.StringVar(value="")
+        ttk.Entry(search_frame, textvariable=self.var_macro_search).grid(row=0, column=1, sticky="ew", padx=(4, 0))
+        self.var_macro_search.trace_add("write", lambda *_: self._refresh_macro_listbox())
+        ttk.Label(search_frame, text="Profile:").grid(row=0, column=2, sticky="e", padx=(8, 0))
+        self.var_profile = tk.StringVar(value="")
+        self.combo_profile = ttk.Combobox(search_frame, textvariable=self.var_profile, width=14,
+                                          postcommand=lambda: self.combo_profile.config(values=self.clicker.profiles))
+        self.combo_profile.grid(row=0, column=3, sticky="w", padx=(4, 0))
+        self.combo_profile.bind("<<ComboboxSelected>>", lambda e: self._on_profile_selected())
+        self.combo_profile.bind("<Return>", lambda e: self._on_profile_selected())
+        self.macro_index = MacroSearchIndex()
+        self.macro_view = MacroListView(macros_frame)
+        self.macro_view.listbox.grid(row=1, column=0, sticky="ew")
+        self.macro_view.scrollbar.grid(row=1, column=1, sticky="ns", padx=(4, 0))
+        self.macro_view.listbox.bind("<Double-Button-1>", lambda e: self._on_edit_macro())
         btn_frame = ttk.Frame(macros_frame)
-        btn_frame.grid(row=1, column=0, columnspan=2, pady=(8, 0), sticky="ew")
-        btn_frame.columnconfigure((0, 1, 2), weight=1)
+        btn_frame.grid(row=2, column=0, columnspan=2, pady=(8, 0), sticky="ew")
+        btn_frame.columnconfigure((0, 1, 2, 3), weight=1)
         ttk.Button(btn_frame, text="Add Macro", command=self._on_add_macro).grid(
             row=0, column=0, sticky="ew", padx=(0, 4))
         ttk.Button(btn_frame, text="Edit Macro", command=self._on_edit_macro).grid(
             row=0, column=1, sticky="ew", padx=(0, 4))
         ttk.Button(btn_frame, text="Remove Macro", command=self._on_remove_macro).grid(
-            row=0, column=2, sticky="ew", padx=(4, 0))
+            row=0, column=2, sticky="ew", padx=(4, 4))
+        self.btn_record = ttk.Button(btn_frame, text="Record Macro", command=self._on_record_pressed)
+        self.btn_record.grid(row=0, column=3, sticky="ew", padx=(4, 0))
         self.var_macro_status = tk.StringVar(value=f"Macros loaded: {len([])}")
         ttk.Label(macros_frame, textvariable=self.var_macro_status, foreground="gray50").grid(
-            row=2, column=0, sticky="w", pady=(4, 0))
-        self.clicker = AutoClicker(self)
-        self._poll_gui_to_clicker()
+            row=3, column=0, sticky="w", pady=(4, 0))
+        channels_frame = ttk.LabelFrame(root, text="Extra Clickers", padding=(8, 8))
+        channels_frame.grid(row=6, column=0, sticky="ew", padx=8, pady=(0, 8))
+        channels_frame.columnconfigure(0, weight=1)
+        self.listbox_channels = tk.Listbox(channels_frame, height=3, exportselection=False)
+        self.listbox_channels.grid(row=0, column=0, columnspan=3, sticky="ew")
+        ttk.Button(channels_frame, text="Add Clicker", command=self._on_add_channel).grid(
+            row=1, column=0, sticky="ew", padx=(0, 4), pady=(8, 0))
+        ttk.Button(channels_frame, text="Edit Clicker", command=self._on_edit_channel).grid(
+            row=1, column=1, sticky="ew", padx=(4, 4), pady=(8, 0))
+        ttk.Button(channels_frame, text="Remove Clicker", command=self._on_remove_channel).grid(
+            row=1, column=2, sticky="ew", padx=(4, 0), pady=(8, 0))
+        self._shown_status = "idle"
+        self._shown_color = "green"
+        self._shown_total = None
+        self._shown_clicking = None
+        self._shown_channels = None
+        self._counter_shown_at = 0.0
+        self._macro_loader = None
+        self._macro_editor = None
+        self._recording = False
+        self._stats_window = None
+        self._stats_tree = None
+        self._stats_after = None
+        self.clicker = AutoClicker(on_error=self._show_engine_error, load_macros=False)
+        self._shown_profile = self.clicker.profile
+        self.var_profile.set(self._shown_profile.name)
+        for var in (self.var_n_clicks, self.var_trigger_key, self.var_stop_at, self.var_mode,
+                    self.var_button_choice, self.var_key_to_send, self.var_use_fixed, self.var_master_x,
+                    self.var_master_y, self.var_catch_up, self.var_backend, self.var_burst, self.var_pattern):
+            var.trace_add("write", lambda *_: self._on_settings_changed())
+        self._on_settings_changed()
+        self._refresh_macro_listbox()
+        self.root.after_idle(lambda: self.root.after(0, self._load_macros_after_first_frame))
+        self._on_frame()
         self.root.protocol("WM_DELETE_WINDOW", self._on_window_close)
 
-    def _poll_gui_to_clicker(self):
-        self.clicker.update_settings_from_gui()
+    def _current_settings(self):
+        return {
+            "clicks_per_second": self.var_n_clicks.get(),
+            "trigger_key": self.var_trigger_key.get(),
+            "stop_at": self.var_stop_at.get(),
+            "mode": self.var_mode.get(),
+            "button": self.var_button_choice.get(),
+            "key_to_send": self.var_key_to_send.get(),
+            "use_fixed": self.var_use_fixed.get(),
+            "master_x": self.var_master_x.get(),
+            "master_y": self.var_master_y.get(),
+            "catch_up": self.var_catch_up.get(),
+            "burst": self.var_burst.get(),
+            "pattern": self.var_pattern.get(),
+            "backend": self.var_backend.get(),
+        }
+
+    def _show_engine_error(self, title: str, message: str, warning: bool = False):
+        from tkinter import messagebox
+        if warning:
+            messagebox.showwarning(title, message)
+        else:
+            messagebox.showerror(title, message)
+
+    def _on_settings_changed(self):
+        settings = self._current_settings()
+        try:
+            self.clicker.apply_settings(settings)
+        except Exception as e:
+            from tkinter import messagebox
+            self.var_backend.set(self.clicker.backend_name)
+            messagebox.showerror("Backend Error", f"Cannot use input backend '{settings['backend']}':\n{e}")
         if self.var_button_choice.get() == "key":
             self.entry_key_to_send.config(state="normal")
         else:
             self.entry_key_to_send.config(state="disabled")
-            self.var_key_to_send.set("")
+            if self.var_key_to_send.get():
+                self.var_key_to_send.set("")
         if self.var_use_fixed.get():
             self.entry_master_x.config(state="normal")
             self.entry_master_y.config(state="normal")
         else:
             self.entry_master_x.config(state="disabled")
             self.entry_master_y.config(state="disabled")
-            self.var_master_x.set("")
-            self.var_master_y.set("")
+            if self.var_master_x.get():
+                self.var_master_x.set("")
+            if self.var_master_y.get():
+                self.var_master_y.set("")
         tk_key = self.var_trigger_key.get().strip()
         if parse_hotkey_string(tk_key) is None and tk_key != "":
             self.entry_trigger_key.config(background="#ffcccc")
         else:
             self.entry_trigger_key.config(background="white")
-        self.total_var.set(self.clicker.total_clicks_sent)
-        if self.clicker._clicking:
-            self.btn_stop.config(state="normal")
-        else:
-            self.btn_stop.config(state="disabled")
-        self._refresh_macro_listbox()
-        self.var_macro_status.set(f"Macros loaded: {len(self.clicker.macros)}")
-        self.root.after(100, self._poll_gui_to_clicker)
-
-    def set_status(self, text: str):
-        self.status_var.set(text)
-
-    def set_status_color(self, color_name: str):
-        self.status_label.config(foreground=color_name)
+        try:
+            parse_pattern_text(self.var_pattern.get())
+            self.entry_pattern.config(background="white")
+        except ValueError:
+            self.entry_pattern.config(background="#ffcccc")
+
+    def _on_frame(self):
+        if self._recording and not self.clicker.is_recording:
+            self._finish_recording()
+        if self.clicker.profile is not self._shown_profile and self._macro_loader is None:
+            self._show_profile()
+        fields = self.clicker.status.take()
+        busy = (fields is not None or self._macro_loader is not None or self._recording
+                or self.clicker.is_clicking)
+        if fields is not None:
+            if fields["status"] != self._shown_status:
+                self._shown_status = fields["status"]
+                self.status_var.set(self._shown_status)
+            if fields["color"] != self._shown_color:
+                self._shown_color = fields["color"]
+                self.status_label.config(foreground=self._shown_color)
+        now = time.perf_counter()
+        if now - self._counter_shown_at >= COUNTER_REFRESH_MS / 1000.0:
+            self._counter_shown_at = now
+            self._refresh_counters()
+        self.root.after(FRAME_MS if busy else IDLE_FRAME_MS, self._on_frame)
+
+    def _refresh_counters(self):
+        total = self.clicker.total_clicks_sent
+        if total != self._shown_total:
+            self._shown_total = total
+            self.total_var.set(total)
+        clicking = self.clicker.is_clicking
+        if clicking or clicking != self._shown_clicking:
+            stats = self.clicker.master_stats
+            if stats and stats["ticks"] > 1:
+                self.achieved_var.set(
+                    f"{stats['achieved_cps']:.2f} / {stats['target_cps']:.2f} cps, "
+                    f"jitter {stats['jitter_ms']:.3f} ms, missed {stats['missed']}")
+        if clicking != self._shown_clicking:
+            self._shown_clicking = clicking
+            self.btn_stop.config(state=("normal" if clicking else "disabled"))
+        shown = tuple(channel.active for channel in self.clicker.channels[1:])
+        if shown != self._shown_channels:
+            self._refresh_channel_listbox()
 
     def _on_stop_pressed(self):
         self.clicker.stop_immediately()
 
+    def _on_stats_pressed(self):
+        if self._stats_window is not None:
+            self._stats_window.lift()
+            return
+        metrics = self.clicker.metrics
+        metrics.enabled = True
+        win = tk.Toplevel(self.root)
+        win.title("Timing Stats")
+        self._stats_window = win
+        frame = ttk.Frame(win, padding=(8, 8))
+        frame.grid(row=0, column=0, sticky="nsew")
+        frame.columnconfigure(0, weight=1)
+        var_enabled = tk.BooleanVar(value=True)
+        ttk.Checkbutton(frame, text="Collect timing metrics", variable=var_enabled,
+                        command=lambda: setattr(metrics, "enabled", var_enabled.get())).grid(
+            row=0, column=0, sticky="w")
+        ttk.Button(frame, text="Reset", command=metrics.reset).grid(row=0, column=1, sticky="e")
+        columns = (("source", "source", 160), ("metric", "metric", 110), ("count", "count", 70),
+                   ("p50", "p50 µs", 80), ("p99", "p99 µs", 80), ("max", "max µs", 80))
+        tree = ttk.Treeview(frame, columns=[c[0] for c in columns], show="headings", height=12)
+        for name, heading, width in columns:
+            tree.heading(name, text=heading)
+            tree.column(name, width=width, anchor="w" if name in ("source", "metric") else "e")
+        tree.grid(row=1, column=0, columnspan=2, sticky="nsew", pady=(8, 0))
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        scrollbar.grid(row=1, column=2, sticky="ns", pady=(8, 0))
+        tree.configure(yscrollcommand=scrollbar.set)
+        self._stats_tree = tree
+
+        def close_stats():
+            if self._stats_after is not None:
+                self.root.after_cancel(self._stats_after)
+                self._stats_after = None
+            metrics.enabled = False
+            self._stats_window = None
+            self._stats_tree = None
+            win.destroy()
+
+        win.protocol("WM_DELETE_WINDOW", close_stats)
+        self._refresh_stats()
+
+    def _refresh_stats(self):
+        tree = self._stats_tree
+        if tree is None:
+            return
+        snapshot = self.clicker.metrics.snapshot()
+        rows = [("listener", "dispatch", snapshot["dispatch"])]
+        for source, metrics in snapshot["sources"].items():
+            for metric, summary in metrics.items():
+                if summary["count"]:
+                    rows.append((source, metric, summary))
+        tree.delete(*tree.get_children())
+        for source, metric, summary in rows:
+            tree.insert("", "end", values=(source, metric, summary["count"], f"{summary['p50'] / 1000:.1f}",
+                                           f"{summary['p99'] / 1000:.1f}", f"{summary['max'] / 1000:.1f}"))
+        self._stats_after = self.root.after(STATS_REFRESH_MS, self._refresh_stats)
+
     def _on_help_pressed(self):
+        from tkinter import messagebox
         msg = (
             "=== Master Clicker ===\n"
             "1) Adjust the fields under 'Master Clicker Settings':\n"
             "   • # clicks (per sec): how many clicks you want per second.\n"
             "   • trigger (master): type a key name (e.g. 'f3', 'f6', 'space', 'a', 'enter').\n"
+            "       – Combos and sequences work too: 'ctrl+shift+f5' holds modifiers (ctrl, shift, alt, cmd),\n"
+            "         'g g' or 'ctrl+k x' are pressed one after another within a second.\n"
             "       – If it’s invalid or empty, the box turns pink.\n"
             "   • stop at: total-click cap (0 = no automatic stop).\n"
+            "   • Catch up missed clicks: if the clicker falls behind schedule, send the missed clicks\n"
+            "     back to back instead of skipping them.\n"
+            "   • backend: how input is sent. 'pyautogui' is the default; 'pynput' keeps one open input\n"
+            "     connection and skips pyautogui's per-click pause, so it reaches much higher rates;\n"
+            "     'dry-run' only counts clicks (for benchmarking without touching the screen).\n"
+            "   • Burst mode: at high rates, send several clicks per timer tick instead of one, so rates in\n"
+            "     the thousands per second are reachable. The 'stop at' cap is still respected exactly.\n"
+            "   • pattern (optional): humanize the clicks; combine any of these words:\n"
+            "       timing uniform|normal|lognormal [SPREAD] – random intervals around the rate (SPREAD 0.2 = ±20%)\n"
+            "       jitter PIXELS – random offset around the fixed X/Y\n"
+            "       area W H – click anywhere in a W x H box centred on the fixed X/Y\n"
+            "       path X1 Y1 X2 Y2 ... – click anywhere along that line\n"
+            "       glide STEPS [curve C] – move the cursor along a curve between clicks\n"
+            "       seed N – repeat exactly the same sequence every time it starts\n"
+            "     e.g. 'timing normal 0.15 jitter 3 glide 6'. Burst and catch-up are ignored with a pattern.\n"
             "2) Choose Press / Toggle mode:\n"
             "   • Press mode: clicker only runs while you hold the trigger key.\n"
             "   • Toggle mode: press the trigger once → it starts clicking; press again → it stops.\n"
@@ -412,22 +457,58 @@ class AutoClickerGUI:
             "   • Enter integer X and Y values when the checkbox is checked.\n"
             "5) STOP! button immediately halts the master clicker & resets the total to 0.\n"
             "6) The 'status:' label shows 'idle' (green) or 'clicking' (red).\n"
-            "   The 'Total sent:' label shows how many clicks/keypresses have fired overall.\n\n"
+            "   The 'Total sent:' label shows how many clicks/keypresses have fired overall.\n"
+            "   The 'achieved:' label shows the measured master rate vs. the target, and the timing jitter.\n"
+            "7) Stats opens a live table of timing histograms while it is open: per master clicker and per\n"
+            "   macro, the time spent sending each click, the error against the scheduled gap between\n"
+            "   clicks, and the queue delay (trigger or due tick until the click starts), in microseconds.\n\n"
             "=== Macros ===\n"
             "• The list at the bottom shows all currently defined macros by name and trigger.\n"
+            "• 'Profile' switches between macro sets: pick one, or type a new name and press Enter to start an\n"
+            "  empty one. Each profile is its own file next to macros.json (e.g. macros.work.json) and is only\n"
+            "  read the first time you switch to it; recently used profiles stay in memory, so switching back is\n"
+            "  instant. Macros that are already running keep going after a switch.\n"
+            "• Type in 'Search' to filter it: every word must appear in the name or trigger key\n"
+            "  (words of one or two letters match the start of a word, e.g. 'f' finds 'farm' and 'f5').\n"
             "• To add a new macro, click 'Add Macro'. A pop-up will ask you to:\n"
             "    – Name: a friendly name (only for your list).\n"
-            "    – Trigger Key: e.g. 'f5', 'a', 'space'. When you press that key, the macro runs.\n"
+            "    – Trigger Key: e.g. 'f5', 'a', 'space', 'ctrl+shift+f5' or a sequence like 'g g'.\n"
+            "      When you press that key, the macro runs.\n"
             "    – Action: choose left/middle/right click or 'key'. If 'key', type the key name.\n"
             "    – # clicks: how many times to click (or send that keystroke).\n"
             "    – Interval (sec): how many seconds to wait between each click/keypress.\n"
             "    – X/Y (optional): leave blank to use current cursor; or fill in to always click at that coordinate.\n"
             "    – Start Delay (sec): how many seconds to wait before the macro begins firing.\n"
+            "    – Burst: group clicks into batches per timer tick (for very small intervals).\n"
+            "    – Steps (optional): a sequence to run instead of the single action above, one step per line:\n"
+            "        move X Y | click BUTTON [X Y] | mousedown BUTTON [X Y] | mouseup BUTTON [X Y] |\n"
+            "        press KEY | down KEY | up KEY | type TEXT | wait SECONDS | repeat N ... end\n"
+            "      Keys and buttons held down are released when the macro ends or is stopped.\n"
+            "    – Watch (optional): run the macro when something appears on screen; the trigger key may then\n"
+            "      be left blank. One line, X Y W H being the screen region:\n"
+            "        change X Y W H [pixels N]          – at least N pixels changed since the last run\n"
+            "        color X Y W H #RRGGBB [fraction F] – the region (or fraction F of it) turned that colour\n"
+            "        pixel X Y #RRGGBB                  – a single pixel turned that colour\n"
+            "      Add 'tolerance T' (0-255, default 16) per colour channel and 'every S' to poll every S seconds\n"
+            "      (default 0.1). Watching needs numpy; mss makes screen capture faster.\n"
+            "    – While running: what happens if the trigger is pressed again while the macro runs:\n"
+            "        ignore (default), restart, queue (run again afterwards), or concurrent (up to\n"
+            "        'Max concurrent' runs at once).\n"
+            "    – Below the fields the editor shows how many clicks one run sends and how long it takes,\n"
+            "      including when the 'stop at' cap would cut it short.\n"
             "• To edit an existing macro, select it and click 'Edit Macro'.\n"
             "• To remove an existing macro, select it and click 'Remove Macro'.\n"
+            "• 'Record Macro' captures your keyboard and mouse input with its timing until you press F9\n"
+            "  (or click 'Stop'), then opens the editor with the recorded steps; add a name and trigger.\n"
             "• Macros are automatically saved to 'macros.json' in this folder, and loaded at startup.\n"
             "• Pressing a macro’s Trigger Key will run it in the background (status becomes orange).\n"
             "• Macros share the same 'stop at' cap: if you reach that total, all clicking/macro actions stop.\n\n"
+            "=== Extra Clickers ===\n"
+            "• Each extra clicker runs alongside the master with its own rate, trigger key, press/toggle mode,\n"
+            "  button or key, optional fixed X/Y and pattern (same words as the master 'pattern' box), e.g.\n"
+            "  20 cps left click at one point and 2 cps 'e' presses.\n"
+            "• All clickers share one timer, so adding more does not add threads. STOP! halts all of them;\n"
+            "  they also share the 'stop at' cap. Extra clickers are not saved between sessions.\n\n"
             "Close the window to exit the entire program."
         )
         messagebox.showinfo("AutoClicker + Persistent Macros Help", msg)
@@ -436,34 +517,263 @@ class AutoClickerGUI:
         self.clicker.shutdown()
         self.root.destroy()
 
+    def _load_macros_after_first_frame(self):
+        self.macro_index.clear()
+        self._macro_loader = self.clicker.iter_load_macros(MACRO_LOAD_CHUNK)
+        self._load_next_macro_chunk()
+
+    def _load_next_macro_chunk(self):
+        chunk = next(self._macro_loader, None)
+        if chunk is None:
+            self._macro_loader = None
+            if len(self.macro_index) != len(self.clicker.macros):
+                self.macro_index = MacroSearchIndex(self.clicker.macros)
+            self._refresh_macro_listbox()
+            return
+        self.macro_index.extend(chunk)
+        self._refresh_macro_listbox()
+        self.var_macro_status.set(f"Loading macros: {len(self.clicker.macros)}...")
+        self.root.after(1, self._load_next_macro_chunk)
+
+    def _on_profile_selected(self):
+        from tkinter import messagebox
+        try:
+            name = check_profile_name(self.var_profile.get())
+        except ValueError as e:
+            messagebox.showerror("Invalid profile", str(e))
+            self.var_profile.set(self.clicker.profile.name)
+            return
+        self.clicker.switch_profile(name)
+
+    def _show_profile(self):
+        if self._macro_editor is not None and self._macro_editor.winfo_exists():
+            self._macro_editor.destroy()
+        self._macro_editor = None
+        self._shown_profile = self.clicker.profile
+        self.var_profile.set(self._shown_profile.name)
+        self.macro_index = MacroSearchIndex(self.clicker.macros)
+        self._refresh_macro_listbox()
+
     def _refresh_macro_listbox(self):
-        current = self.listbox_macros.get(0, tk.END)
-        desired = [m.display_name() for m in self.clicker.macros]
-        if tuple(current) != tuple(desired):
-            self.listbox_macros.delete(0, tk.END)
-            for name in desired:
-                self.listbox_macros.insert(tk.END, name)
+        query = self.var_macro_search.get()
+        self.macro_view.set_items(self.macro_index.search(query))
+        total = len(self.clicker.macros)
+        if query.strip():
+            self.var_macro_status.set(f"Showing {len(self.macro_view.items)} of {total} macros")
+        else:
+            self.var_macro_status.set(f"Macros loaded: {total}")
+
+    def _selected_macro_index(self):
+        macro = self.macro_view.selected
+        if macro is None:
+            return None
+        try:
+            return self.clicker.macros.index(macro)
+        except ValueError:
+            return None
+
+    def _refresh_channel_listbox(self):
+        channels = self.clicker.channels[1:]
+        self._shown_channels = tuple(channel.active for channel in channels)
+        self.listbox_channels.delete(0, tk.END)
+        self.listbox_channels.insert(
+            tk.END, *[c.display_name() + ("   ● clicking" if c.active else "") for c in channels])
+
+    def _selected_channel(self):
+        sel = self.listbox_channels.curselection()
+        if not sel:
+            return None
+        return self.clicker.channels[1 + sel[0]]
+
+    def _on_add_channel(self):
+        self._open_channel_editor()
+
+    def _on_edit_channel(self):
+        channel = self._selected_channel()
+        if channel is not None:
+            self._open_channel_editor(channel)
+
+    def _on_remove_channel(self):
+        channel = self._selected_channel()
+        if channel is not None:
+            self.clicker.remove_channel(channel)
+            self._refresh_channel_listbox()
+
+    def _open_channel_editor(self, channel=None):
+        def save_channel():
+            from tkinter import messagebox
+            try:
+                cps = float(var_cps.get())
+                if cps <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Invalid rate", "Clicks per second must be a positive number.")
+                return
+            trigger = var_trigger.get().strip()
+            pk = parse_hotkey_string(trigger)
+            if pk is None:
+                messagebox.showerror("Invalid trigger key", f"Cannot parse '{trigger}' as a valid key name.")
+                return
+            index_key = hotkey_index_key(pk)
+            if any(hotkey_index_key(m.trigger_key) == index_key for m in self.clicker.macros
+                   if m.trigger_key is not None) or any(
+                    c is not channel and c.trigger_key is not None and hotkey_index_key(c.trigger_key) == index_key
+                    for c in self.clicker.channels):
+                messagebox.showerror("Duplicate Trigger", "A macro or clicker with that trigger key already exists.")
+                return
+            action = var_button_choice.get()
+            key_text = var_key_to_send.get().strip().lower()
+            if action == "key":
+                try:
+                    key_name(key_text)
+                except ValueError as e:
+                    messagebox.showerror("Invalid Key", f"Enter a key name for the 'key' action: {e}")
+                    return
+            x_val = y_val = None
+            if var_x.get().strip() or var_y.get().strip():
+                try:
+                    x_val = int(var_x.get().strip())
+                    y_val = int(var_y.get().strip())
+                except ValueError:
+                    messagebox.showerror("Invalid X/Y", "X and Y must both be integers (or both blank).")
+                    return
+            try:
+                pattern = parse_pattern_text(var_pattern.get())
+            except ValueError as e:
+                messagebox.showerror("Invalid Pattern", str(e))
+                return
+            fields = {
+                "name": var_name.get().strip() or "(no name)",
+                "clicks_per_second": cps,
+                "trigger_key": trigger,
+                "mode": var_mode.get(),
+                "button": action,
+                "key_to_send": key_text,
+                "x": x_val,
+                "y": y_val,
+                "catch_up": bool(var_catch_up.get()),
+                "burst": bool(var_burst.get()),
+                "pattern": pattern,
+            }
+            if channel is None:
+                self.clicker.add_channel(ClickerChannel.from_dict(fields))
+            else:
+                fresh = ClickerChannel.from_dict(fields)
+                for name in fields:
+                    setattr(channel, name, getattr(fresh, name))
+                self.clicker.channel_changed(channel)
+            self._refresh_channel_listbox()
+            popup.destroy()
+
+        c = channel
+        popup = tk.Toplevel(self.root)
+        popup.title("Edit Clicker" if c else "Add Clicker")
+        popup.resizable(False, False)
+        popup.columnconfigure(1, weight=1)
+        ttk.Label(popup, text="Name:").grid(row=0, column=0, sticky="w", pady=(8, 2), padx=(8, 4))
+        var_name = tk.StringVar(value=(c.name if c else f"clicker {len(self.clicker.channels)}"))
+        ttk.Entry(popup, textvariable=var_name).grid(row=0, column=1, sticky="ew", pady=(8, 2), padx=(4, 8))
+        ttk.Label(popup, text="Clicks per sec:").grid(row=1, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
+        var_cps = tk.StringVar(value=(f"{c.clicks_per_second:g}" if c else "1"))
+        ttk.Entry(popup, textvariable=var_cps).grid(row=1, column=1, sticky="ew", pady=(2, 2), padx=(4, 8))
+        ttk.Label(popup, text="Trigger Key:").grid(row=2, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
+        var_trigger = tk.StringVar(value=(hotkey_to_string(c.trigger_key) if c else ""))
+        ttk.Entry(popup, textvariable=var_trigger).grid(row=2, column=1, sticky="ew", pady=(2, 2), padx=(4, 8))
+        ttk.Label(popup, text="Mode:").grid(row=3, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
+        var_mode = tk.StringVar(value=(c.mode if c else "press"))
+        mode_frame = ttk.Frame(popup)
+        mode_frame.grid(row=3, column=1, sticky="w", pady=(2, 2), padx=(4, 8))
+        ttk.Radiobutton(mode_frame, text="press (hold key)", variable=var_mode, value="press").grid(
+            row=0, column=0, sticky="w")
+        ttk.Radiobutton(mode_frame, text="toggle", variable=var_mode, value="toggle").grid(
+            row=0, column=1, sticky="w", padx=(8, 0))
+        ttk.Label(popup, text="Action:").grid(row=4, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
+        var_button_choice = tk.StringVar(value=(c.button if c else "left"))
+        action_frame = ttk.Frame(popup)
+        action_frame.grid(row=4, column=1, sticky="w", pady=(2, 2), padx=(4, 8))
+        for col, value in enumerate(("left", "middle", "right")):
+            ttk.Radiobutton(action_frame, text=value, variable=var_button_choice, value=value).grid(
+                row=0, column=col, sticky="w")
+        ttk.Radiobutton(action_frame, text="key", variable=var_button_choice, value="key").grid(
+            row=1, column=0, sticky="w", pady=(4, 0))
+        ttk.Label(action_frame, text="key:").grid(row=1, column=1, sticky="e", pady=(4, 0))
+        var_key_to_send = tk.StringVar(value=(c.key_to_send if (c and c.button == "key") else ""))
+        entry_key_to_send = ttk.Entry(action_frame, textvariable=var_key_to_send, width=10, state="disabled")
+        entry_key_to_send.grid(row=1, column=2, sticky="w", padx=(4, 0), pady=(4, 0))
+        def on_action_changed():
+            if var_button_choice.get() == "key":
+                entry_key_to_send.config(state="normal")
+            else:
+                entry_key_to_send.config(state="disabled")
+                var_key_to_send.set("")
+        var_button_choice.trace_add("write", lambda *_: on_action_changed())
+        on_action_changed()
+        ttk.Label(popup, text="X (optional):").grid(row=5, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
+        var_x = tk.StringVar(value=(str(c.x) if (c and c.x is not None) else ""))
+        ttk.Entry(popup, textvariable=var_x, width=8).grid(row=5, column=1, sticky="w", pady=(2, 2), padx=(4, 8))
+        ttk.Label(popup, text="Y (optional):").grid(row=6, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
+        var_y = tk.StringVar(value=(str(c.y) if (c and c.y is not None) else ""))
+        ttk.Entry(popup, textvariable=var_y, width=8).grid(row=6, column=1, sticky="w", pady=(2, 2), padx=(4, 8))
+        var_catch_up = tk.BooleanVar(value=(c.catch_up if c else False))
+        ttk.Checkbutton(popup, text="Catch up missed clicks", variable=var_catch_up).grid(
+            row=7, column=0, columnspan=2, sticky="w", pady=(2, 2), padx=(8, 8))
+        var_burst = tk.BooleanVar(value=(c.burst if c else False))
+        ttk.Checkbutton(popup, text="Burst mode (group clicks per tick)", variable=var_burst).grid(
+            row=8, column=0, columnspan=2, sticky="w", pady=(2, 2), padx=(8, 8))
+        ttk.Label(popup, text="Pattern (optional):").grid(row=9, column=0, sticky="w", pady=(2, 8), padx=(8, 4))
+        var_pattern = tk.StringVar(value=(format_pattern_text(c.pattern) if c else ""))
+        ttk.Entry(popup, textvariable=var_pattern).grid(row=9, column=1, sticky="ew", pady=(2, 8), padx=(4, 8))
+        btn_frame = ttk.Frame(popup)
+        btn_frame.grid(row=10, column=0, columnspan=2, pady=(0, 8), padx=8, sticky="ew")
+        btn_frame.columnconfigure((0, 1), weight=1)
+        ttk.Button(btn_frame, text="Save", command=save_channel).grid(row=0, column=0, sticky="ew", padx=(0, 4))
+        ttk.Button(btn_frame, text="Cancel", command=popup.destroy).grid(row=0, column=1, sticky="ew", padx=(4, 0))
+        popup.grab_set()
+
+    def _on_record_pressed(self):
+        if self._recording:
+            self.clicker.stop_recording()
+            return
+        if self._macro_loader is not None:
+            return
+        self.clicker.start_recording()
+        self._recording = True
+        self.btn_record.config(text="Stop (F9)")
+
+    def _finish_recording(self):
+        self._recording = False
+        self.btn_record.config(text="Record Macro")
+        root = self.root
+        x, y = root.winfo_rootx(), root.winfo_rooty()
+        steps = self.clicker.recorded_steps(exclude=(x, y, x + root.winfo_width(), y + root.winfo_height()))
+        if steps:
+            self._open_macro_editor(steps=steps)
 
     def _on_add_macro(self):
+        if self._macro_loader is not None:
+            return
         self._open_macro_editor()
 
     def _on_edit_macro(self):
-        sel = self.listbox_macros.curselection()
-        if not sel:
+        if self._macro_loader is not None:
+            return
+        idx = self._selected_macro_index()
+        if idx is None:
             return
-        idx = sel[0]
         self._open_macro_editor(edit_index=idx)
 
     def _on_remove_macro(self):
-        sel = self.listbox_macros.curselection()
-        if not sel:
+        if self._macro_loader is not None:
             return
-        idx = sel[0]
-        del self.clicker.macros[idx]
-        self.clicker._save_macros_to_disk()
+        idx = self._selected_macro_index()
+        if idx is None:
+            return
+        self.macro_index.remove(self.clicker.macros[idx])
+        self.macro_view.selected = None
+        self.clicker.remove_macro(idx)
         self._refresh_macro_listbox()
 
-    def _open_macro_editor(self, edit_index=None):
+    def _open_macro_editor(self, edit_index=None, steps=None):
         is_edit = (edit_index is not None)
         if is_edit:
             macro = self.clicker.macros[edit_index]
@@ -471,6 +781,15 @@ class AutoClickerGUI:
             macro = None
 
         def save_macro():
+            from tkinter import messagebox
+            nonlocal edit_index
+            if is_edit:
+                edit_index = next((i for i, m in enumerate(self.clicker.macros) if m is macro), None)
+                if edit_index is None:
+                    messagebox.showerror("Macro Not Found", "The profile was switched; this macro is no longer "
+                                                            "in the active profile.")
+                    popup.destroy()
+                    return
             name = var_name.get().strip()
             trigger = var_trigger.get().strip()
             action = var_button_choice.get()
@@ -510,17 +829,40 @@ class AutoClickerGUI:
             except ValueError:
                 messagebox.showerror("Invalid Delay", "Start delay must be a non-negative number.")
                 return
+            try:
+                watch = parse_watch_text(var_watch.get())
+            except ValueError as e:
+                messagebox.showerror("Invalid Watch", str(e))
+                return
             pk = parse_hotkey_string(trigger)
-            if pk is None:
+            if pk is None and (trigger or not watch):
                 messagebox.showerror("Invalid trigger key", f"Cannot parse '{trigger}' as a valid key name.")
                 return
-            if action == "key" and not key_text:
-                messagebox.showerror("Invalid Key", "Enter a key name for the 'key' action.")
+            try:
+                steps = parse_steps_text(text_steps.get("1.0", tk.END))
+                Macro("", None, "left", "", 1, 0.0, steps=steps).timeline()
+            except (TypeError, ValueError) as e:
+                messagebox.showerror("Invalid Steps", str(e))
                 return
+            if action == "key" and not steps:
+                try:
+                    key_name(key_text)
+                except ValueError as e:
+                    messagebox.showerror("Invalid Key", f"Enter a key name for the 'key' action: {e}")
+                    return
             for i, existing in enumerate(self.clicker.macros):
-                if existing.trigger_key == pk and (not is_edit or i != edit_index):
+                if pk is not None and existing.trigger_key == pk and (not is_edit or i != edit_index):
                     messagebox.showerror("Duplicate Trigger", "A macro with that trigger key already exists.")
                     return
+            burst = bool(var_burst.get())
+            policy = var_policy.get()
+            try:
+                max_concurrent = int(var_max_concurrent.get())
+                if max_concurrent < 1:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Invalid max concurrent", "Max concurrent runs must be a positive integer.")
+                return
             if is_edit:
                 m = self.clicker.macros[edit_index]
                 m.name = name if name else "(no name)"
@@ -532,6 +874,13 @@ class AutoClickerGUI:
                 m.x_coord = x_val
                 m.y_coord = y_val
                 m.start_delay = sd
+                m.burst = burst
+                m.policy = policy
+                m.max_concurrent = max_concurrent
+                m.steps = steps or None
+                m.watch = watch
+                self.clicker.macro_changed(edit_index)
+                self.macro_index.update(m)
             else:
                 new_macro = Macro(
                     name=name if name else "(no name)",
@@ -543,12 +892,20 @@ class AutoClickerGUI:
                     x_coord=x_val,
                     y_coord=y_val,
                     start_delay=sd,
+                    burst=burst,
+                    policy=policy,
+                    max_concurrent=max_concurrent,
+                    steps=steps,
+                    watch=watch,
                 )
-                self.clicker.macros.append(new_macro)
-            self.clicker._save_macros_to_disk()
+                self.clicker.add_macro(new_macro)
+                self.macro_index.add(new_macro)
+                self.macro_view.selected = new_macro
+            self._refresh_macro_listbox()
             popup.destroy()
 
         popup = tk.Toplevel(self.root)
+        self._macro_editor = popup
         popup.title("Edit Macro" if is_edit else "Add Macro")
         popup.resizable(False, False)
         for c in range(2):
@@ -591,11 +948,61 @@ class AutoClickerGUI:
         ttk.Label(popup, text="Y (optional):").grid(row=6, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
         var_y_coord = tk.StringVar(value=(str(macro.y_coord) if (macro and macro.y_coord is not None) else ""))
         ttk.Entry(popup, textvariable=var_y_coord).grid(row=6, column=1, sticky="w", pady=(2, 2), padx=(4, 8))
-        ttk.Label(popup, text="Start Delay (sec):").grid(row=7, column=0, sticky="w", pady=(2, 8), padx=(8, 4))
+        ttk.Label(popup, text="Start Delay (sec):").grid(row=7, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
         var_start_delay = tk.StringVar(value=(str(macro.start_delay) if macro else "0.0"))
-        ttk.Entry(popup, textvariable=var_start_delay).grid(row=7, column=1, sticky="ew", pady=(2, 8), padx=(4, 8))
+        ttk.Entry(popup, textvariable=var_start_delay).grid(row=7, column=1, sticky="ew", pady=(2, 2), padx=(4, 8))
+        var_burst = tk.BooleanVar(value=(macro.burst if macro else False))
+        ttk.Checkbutton(popup, text="Burst (group clicks per tick)", variable=var_burst).grid(
+            row=8, column=0, columnspan=2, sticky="w", pady=(2, 2), padx=(8, 8))
+        ttk.Label(popup, text="While running:").grid(row=9, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
+        var_policy = tk.StringVar(value=(macro.policy if macro else "ignore"))
+        ttk.Combobox(popup, textvariable=var_policy, values=MACRO_POLICIES, state="readonly", width=12).grid(
+            row=9, column=1, sticky="w", pady=(2, 2), padx=(4, 8))
+        ttk.Label(popup, text="Max concurrent:").grid(row=10, column=0, sticky="w", pady=(2, 2), padx=(8, 4))
+        var_max_concurrent = tk.StringVar(value=(str(macro.max_concurrent) if macro else "1"))
+        entry_max_concurrent = ttk.Entry(popup, textvariable=var_max_concurrent, width=6)
+        entry_max_concurrent.grid(row=10, column=1, sticky="w", pady=(2, 2), padx=(4, 8))
+        def on_policy_changed():
+            entry_max_concurrent.config(state=("normal" if var_policy.get() == "concurrent" else "disabled"))
+        var_policy.trace_add("write", lambda *_: on_policy_changed())
+        on_policy_changed()
+        ttk.Label(popup, text="Steps (optional):").grid(row=11, column=0, sticky="nw", pady=(2, 8), padx=(8, 4))
+        text_steps = tk.Text(popup, height=6, width=30, wrap="none")
+        text_steps.grid(row=11, column=1, sticky="ew", pady=(2, 8), padx=(4, 8))
+        if macro and macro.steps:
+            text_steps.insert("1.0", format_steps_text(macro.steps))
+        elif steps:
+            text_steps.insert("1.0", format_steps_text(steps))
+        ttk.Label(popup, text="Watch (optional):").grid(row=12, column=0, sticky="w", pady=(2, 8), padx=(8, 4))
+        var_watch = tk.StringVar(value=(format_watch_text(macro.watch) if macro else ""))
+        ttk.Entry(popup, textvariable=var_watch).grid(row=12, column=1, sticky="ew", pady=(2, 8), padx=(4, 8))
+        var_estimate = tk.StringVar(value="")
+        ttk.Label(popup, textvariable=var_estimate, foreground="gray").grid(
+            row=13, column=0, columnspan=2, sticky="w", pady=(0, 8), padx=(8, 8))
+        estimate_after = [None]
+        def update_estimate():
+            estimate_after[0] = None
+            try:
+                draft = Macro("", None, var_button_choice.get(), var_key_to_send.get().strip().lower(),
+                              max(1, int(var_n_clicks.get())), max(0.0, float(var_interval.get())),
+                              start_delay=max(0.0, float(var_start_delay.get())), burst=bool(var_burst.get()),
+                              steps=parse_steps_text(text_steps.get("1.0", tk.END)) or None)
+                est = estimate_macro(draft, self.clicker.stop_after_total)
+            except (TypeError, ValueError, KeyError):
+                var_estimate.set("Estimate: -")
+                return
+            capped = " (stops at cap)" if est["capped"] else ""
+            var_estimate.set(f"Estimate: {est['clicks']} clicks over {format_duration(est['duration'])}{capped}")
+        def schedule_estimate(*_):
+            if estimate_after[0] is not None:
+                popup.after_cancel(estimate_after[0])
+            estimate_after[0] = popup.after(ESTIMATE_DELAY_MS, update_estimate)
+        for var in (var_button_choice, var_key_to_send, var_n_clicks, var_interval, var_start_delay, var_burst):
+            var.trace_add("write", schedule_estimate)
+        text_steps.bind("<KeyRelease>", schedule_estimate)
+        update_estimate()
         btn_frame = ttk.Frame(popup)
-        btn_frame.grid(row=8, column=0, columnspan=2, pady=(0, 8), padx=8, sticky="ew")
+        btn_frame.grid(row=14, column=0, columnspan=2, pady=(0, 8), padx=8, sticky="ew")
         btn_frame.columnconfigure((0, 1), weight=1)
         ttk.Button(btn_frame, text="Save", command=save_macro).grid(row=0, column=0, sticky="ew", padx=(0, 4))
         ttk.Button(btn_frame, text="Cancel", command=popup.destroy).grid(row=0, column=1, sticky="ew", padx=(4, 0))
@@ -0,0 +1,2854 @@
+import functools
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from pynput import keyboard
+
+HOTKEY_MODIFIERS = {"ctrl": 1, "control": 1, "shift": 2, "alt": 4, "option": 4, "cmd": 8, "win": 8, "super": 8}
+MODIFIER_ORDER = ((1, "ctrl"), (2, "shift"), (4, "alt"), (8, "cmd"))
+SEQUENCE_TIMEOUT = 1.0
+KEY_ID_CACHE = 4096
+
+def _modifier_keys():
+    keys = {}
+    for bit, names in ((1, ("ctrl", "ctrl_l", "ctrl_r")), (2, ("shift", "shift_l", "shift_r")),
+                       (4, ("alt", "alt_l", "alt_r", "alt_gr")), (8, ("cmd", "cmd_l", "cmd_r"))):
+        base = getattr(keyboard.Key, names[0], None)
+        for name in names:
+            key = getattr(keyboard.Key, name, None)
+            if key is not None:
+                keys[key] = (bit, base)
+    return keys
+
+MODIFIER_KEYS = _modifier_keys()
+
+def _key_id(key):
+    if isinstance(key, keyboard.KeyCode):
+        key = key.char if key.char is not None else key.vk
+    if isinstance(key, str):
+        if len(key) == 1 and ord(key) < 32:
+            key = chr(ord(key) + 96)
+        return key.lower()
+    modifier = MODIFIER_KEYS.get(key)
+    return modifier[1] if modifier is not None else key
+
+class Hotkey:
+    __slots__ = ("keys", "chords")
+
+    def __init__(self, keys):
+        self.keys = tuple(keys)
+        self.chords = tuple((mods, _key_id(key)) for mods, key in self.keys)
+
+    def __eq__(self, other):
+        return isinstance(other, Hotkey) and self.chords == other.chords
+
+    def __hash__(self):
+        return hash(self.chords)
+
+    def __str__(self):
+        return " ".join("+".join([name for bit, name in MODIFIER_ORDER if mods & bit] + [hotkey_to_string(key)])
+                        for mods, key in self.keys)
+
+    def __repr__(self):
+        return f"Hotkey({str(self)!r})"
+
+def _parse_single_key(s: str):
+    try:
+        return getattr(keyboard.Key, s)
+    except (AttributeError, TypeError):
+        pass
+    if len(s) == 1:
+        return keyboard.KeyCode.from_char(s)
+    return None
+
+@functools.lru_cache(maxsize=4096)
+def parse_hotkey_string(s: str):
+    s = s.strip().lower()
+    if not s:
+        return None
+    keys = []
+    for chord in s.split():
+        if chord == "+":
+            names = ["+"]
+        elif chord.endswith("++"):
+            names = chord[:-2].split("+") + ["+"]
+        else:
+            names = chord.split("+")
+        mods = 0
+        for name in names[:-1]:
+            bit = HOTKEY_MODIFIERS.get(name)
+            if bit is None:
+                return None
+            mods |= bit
+        key = _parse_single_key(names[-1])
+        if key is None:
+            return None
+        keys.append((mods, key))
+    if len(keys) == 1 and keys[0][0] == 0:
+        return keys[0][1]
+    return Hotkey(keys)
+
+def hotkey_to_string(key_obj):
+    if isinstance(key_obj, keyboard.Key):
+        return key_obj.name
+    elif isinstance(key_obj, keyboard.KeyCode):
+        return key_obj.char or ""
+    elif isinstance(key_obj, Hotkey):
+        return str(key_obj)
+    else:
+        return ""
+
+MACRO_POLICIES = ("ignore", "restart", "queue", "concurrent")
+MOUSE_BUTTONS = ("left", "middle", "right")
+KEY_NAMES = frozenset([
+    "accept", "add", "alt", "altleft", "altright", "apps", "backspace", "browserback", "browserfavorites",
+    "browserforward", "browserhome", "browserrefresh", "browsersearch", "browserstop", "capslock", "clear", "command",
+    "convert", "ctrl", "ctrlleft", "ctrlright", "decimal", "delete", "divide", "down", "end", "enter", "esc",
+    "execute", "final", "fn", "hangul", "hanja", "help", "home", "insert", "junja", "kana", "kanji", "launchapp1",
+    "launchapp2", "launchmail", "launchmediaselect", "left", "modechange", "multiply", "nexttrack", "nonconvert",
+    "numlock", "option", "optionleft", "optionright", "pagedown", "pageup", "pause", "playpause", "prevtrack",
+    "print", "printscreen", "right", "scrolllock", "select", "separator", "shift", "shiftleft", "shiftright",
+    "sleep", "space", "stop", "subtract", "tab", "up", "volumedown", "volumemute", "volumeup", "win", "winleft",
+    "winright", "yen",
+] + [f"f{i}" for i in range(1, 25)] + [f"num{i}" for i in range(10)])
+KEY_ALIASES = {
+    "alt_l": "altleft", "alt_r": "altright", "alt_gr": "altright", "caps_lock": "capslock", "cmd": "win",
+    "cmd_l": "winleft", "cmd_r": "winright", "control": "ctrl", "ctrl_l": "ctrlleft", "ctrl_r": "ctrlright",
+    "del": "delete", "escape": "esc", "hanguel": "hangul", "media_next": "nexttrack", "media_play_pause": "playpause",
+    "media_previous": "prevtrack", "media_volume_down": "volumedown", "media_volume_mute": "volumemute",
+    "media_volume_up": "volumeup", "menu": "apps", "num_lock": "numlock", "page_down": "pagedown",
+    "page_up": "pageup", "pgdn": "pagedown", "pgup": "pageup", "print_screen": "printscreen", "prntscrn": "printscreen",
+    "prtsc": "printscreen", "prtscr": "printscreen", "return": "enter", "scroll_lock": "scrolllock",
+    "shift_l": "shiftleft", "shift_r": "shiftright", "super": "win",
+}
+PYNPUT_KEY_NAMES = {
+    "altleft": "alt_l", "altright": "alt_r", "apps": "menu", "capslock": "caps_lock", "command": "cmd",
+    "ctrlleft": "ctrl_l", "ctrlright": "ctrl_r", "nexttrack": "media_next", "numlock": "num_lock", "option": "alt",
+    "optionleft": "alt_l", "optionright": "alt_r", "pagedown": "page_down", "pageup": "page_up",
+    "playpause": "media_play_pause", "prevtrack": "media_previous", "printscreen": "print_screen",
+    "scrolllock": "scroll_lock", "shiftleft": "shift_l", "shiftright": "shift_r", "volumedown": "media_volume_down",
+    "volumemute": "media_volume_mute", "volumeup": "media_volume_up", "win": "cmd", "winleft": "cmd_l",
+    "winright": "cmd_r",
+}
+
+@functools.lru_cache(maxsize=1024)
+def key_name(name: str) -> str:
+    key = str(name).strip().lower()
+    if len(key) == 1:
+        return key
+    key = KEY_ALIASES.get(key, key)
+    if key in KEY_NAMES:
+        return key
+    if not key:
+        raise ValueError("no key name given")
+    if "+" in key or " " in key:
+        raise ValueError(f"{name!r} is more than one key; use separate down/up steps for combinations")
+    raise ValueError(f"unknown key name {name!r}")
+MAX_TIMELINE_ENTRIES = 1000000
+
+def hotkey_index_key(key_obj):
+    if isinstance(key_obj, keyboard.KeyCode):
+        return key_obj.char if key_obj.char is not None else key_obj.vk
+    return key_obj
+
+def hotkey_chords(key_obj):
+    if isinstance(key_obj, Hotkey):
+        return key_obj.chords
+    return ((0, _key_id(key_obj)),)
+
+class _HotkeyNode:
+    __slots__ = ("children", "target")
+
+    def __init__(self):
+        self.children = {}
+        self.target = None
+
+class HotkeyMachine:
+    def __init__(self, timeout: float = SEQUENCE_TIMEOUT):
+        self.timeout = timeout
+        self.mods = 0
+        self._root = _HotkeyNode()
+        self._release = {}
+        self._node = None
+        self._node_at = 0.0
+        self._ids = {}
+
+    @classmethod
+    def build(cls, bindings, release=()):
+        root = _HotkeyNode()
+        for key_obj, target in bindings:
+            cls._bind(root, key_obj, target)
+        release_index = {}
+        for key_obj, target in release:
+            release_index.setdefault(hotkey_chords(key_obj)[-1][1], target)
+        return root, release_index
+
+    def install(self, compiled):
+        self._root, self._release = compiled
+        self._node = None
+
+    def compile(self, bindings, release=()):
+        self.install(self.build(bindings, release))
+
+    def bind(self, key_obj, target):
+        self._bind(self._root, key_obj, target)
+
+    @staticmethod
+    def _bind(root: _HotkeyNode, key_obj, target):
+        node = root
+        for mods, kid in hotkey_chords(key_obj):
+            by_mods = node.children.setdefault(kid, {})
+            child = by_mods.get(mods)
+            if child is None:
+                child = by_mods[mods] = _HotkeyNode()
+            node = child
+        if node.target is None:
+            node.target = target
+
+    def reset(self):
+        self.mods = 0
+        self._node = None
+
+    def _classify(self, key):
+        if isinstance(key, keyboard.KeyCode):
+            if key.char is None:
+                return 0, key.vk
+            key = key.char
+        ids = self._ids
+        info = ids.get(key)
+        if info is None:
+            info = MODIFIER_KEYS.get(key) or (0, _key_id(key))
+            if len(ids) >= KEY_ID_CACHE:
+                ids.clear()
+            ids[key] = info
+        return info
+
+    def press(self, key):
+        bit, kid = self._classify(key)
+        mods = self.mods
+        if bit:
+            self.mods = mods | bit
+            if self._node is not None:
+                return None
+            mods &= ~bit
+        node = self._node
+        if node is not None:
+            self._node = None
+            if time.perf_counter() - self._node_at <= self.timeout:
+                by_mods = node.children.get(kid)
+                child = by_mods and (by_mods.get(mods) or by_mods.get(0))
+                if child is not None:
+                    return self._enter(child)
+        by_mods = self._root.children.get(kid)
+        if by_mods is None:
+            return None
+        child = by_mods.get(mods) or by_mods.get(0)
+        if child is None:
+            return None
+        return self._enter(child)
+
+    def _enter(self, child: _HotkeyNode):
+        if child.children:
+            self._node = child
+            self._node_at = time.perf_counter()
+        return child.target
+
+    def release(self, key):
+        bit, kid = self._classify(key)
+        if bit:
+            self.mods &= ~bit
+        return self._release.get(kid)
+
+class Macro:
+    __slots__ = ("name", "trigger_key", "button", "key_to_send", "n_clicks", "interval", "x_coord", "y_coord",
+                 "start_delay", "burst", "policy", "max_concurrent", "steps", "watch", "_timeline")
+
+    def __init__(self, name: str, trigger_key, button: str, key_to_send: str,
+                 n_clicks: int, interval: float, x_coord=None, y_coord=None, start_delay=0.0,
+                 burst=False, policy="ignore", max_concurrent=1, steps=None, watch=None):
+        self.name = name
+        self.trigger_key = trigger_key
+        self.button = button
+        self.key_to_send = key_to_send
+        self.n_clicks = max(1, n_clicks)
+        self.interval = max(0.0, interval)
+        self.x_coord = x_coord if x_coord is not None else None
+        self.y_coord = y_coord if y_coord is not None else None
+        self.start_delay = max(0.0, start_delay)
+        self.burst = bool(burst)
+        self.policy = policy if policy in MACRO_POLICIES else "ignore"
+        self.max_concurrent = max(1, max_concurrent)
+        self.steps = steps or None
+        self.watch = watch or None
+        self._timeline = None
+
+    def timeline(self):
+        timeline = self._timeline
+        if timeline is None:
+            timeline = self._timeline = compile_macro(self)
+        return timeline
+
+    def invalidate_timeline(self):
+        self._timeline = None
+
+    def display_name(self):
+        hk = hotkey_to_string(self.trigger_key)
+        if self.watch:
+            when = f"when {self.watch.get('mode', '?')}"
+            return f"{self.name} [{hk}, {when}]" if hk else f"{self.name} [{when}]"
+        return f"{self.name} [{hk or '?'}]"
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "trigger_key": hotkey_to_string(self.trigger_key),
+            "button": self.button,
+            "key_to_send": self.key_to_send,
+            "n_clicks": self.n_clicks,
+            "interval": self.interval,
+            "x_coord": self.x_coord,
+            "y_coord": self.y_coord,
+            "start_delay": self.start_delay,
+            "burst": self.burst,
+            "policy": self.policy,
+            "max_concurrent": self.max_concurrent,
+            "steps": self.steps or [],
+            "watch": self.watch,
+        }
+
+    @staticmethod
+    def from_dict(d):
+        tk_str = d.get("trigger_key", "").strip()
+        tk_parsed = parse_hotkey_string(tk_str)
+        return Macro(
+            name=d.get("name", "(no name)"),
+            trigger_key=tk_parsed,
+            button=d.get("button", "left"),
+            key_to_send=d.get("key_to_send", ""),
+            n_clicks=int(d.get("n_clicks", 1)),
+            interval=float(d.get("interval", 0.1)),
+            x_coord=(None if d.get("x_coord") is None else int(d.get("x_coord"))),
+            y_coord=(None if d.get("y_coord") is None else int(d.get("y_coord"))),
+            start_delay=float(d.get("start_delay", 0.0)),
+            burst=bool(d.get("burst", False)),
+            policy=d.get("policy", "ignore"),
+            max_concurrent=int(d.get("max_concurrent", 1)),
+            steps=d.get("steps") or None,
+            watch=d.get("watch") or None,
+        )
+
+class RepeatedAction:
+    __slots__ = ("entries", "spacing", "action", "count", "last_count")
+
+    def __init__(self, entries: int, spacing: float, action: tuple, count: int = 1, last_count: int = None):
+        self.entries = entries
+        self.spacing = spacing
+        self.action = action
+        self.count = count
+        self.last_count = count if last_count is None else last_count
+
+    def __len__(self):
+        return self.entries
+
+    def __iter__(self):
+        kind, target, x, y = self.action
+        spacing = self.spacing
+        count = self.count
+        for i in range(self.entries - 1):
+            yield (i * spacing, kind, target, x, y, count)
+        if self.entries:
+            yield ((self.entries - 1) * spacing, kind, target, x, y, self.last_count)
+
+def _opt_int(value):
+    return None if value is None else int(value)
+
+def _compile_steps(steps, offset: float, out: list) -> float:
+    for step in steps:
+        kind = step.get("type")
+        if kind == "wait":
+            offset += max(0.0, float(step.get("seconds", 0.0)))
+            continue
+        if kind == "repeat":
+            times = max(0, int(step.get("times", 1)))
+            body = []
+            span = _compile_steps(step.get("steps", []), 0.0, body)
+            if len(out) + times * len(body) > MAX_TIMELINE_ENTRIES:
+                raise ValueError(f"macro expands to more than {MAX_TIMELINE_ENTRIES} actions")
+            if body:
+                for i in range(times):
+                    start = offset + i * span
+                    out.extend([(start + entry[0],) + entry[1:] for entry in body])
+            offset += times * span
+            continue
+        if kind == "move":
+            out.append((offset, "move", None, int(step["x"]), int(step["y"]), 1))
+        elif kind == "click":
+            button = step.get("button", "left")
+            if button not in MOUSE_BUTTONS:
+                raise ValueError(f"unknown mouse button {button!r}")
+            out.append((offset, "click", button, _opt_int(step.get("x")), _opt_int(step.get("y")),
+                        max(1, int(step.get("count", 1)))))
+        elif kind in ("mouse_down", "mouse_up"):
+            button = step.get("button", "left")
+            if button not in MOUSE_BUTTONS:
+                raise ValueError(f"unknown mouse button {button!r}")
+            out.append((offset, kind, button, _opt_int(step.get("x")), _opt_int(step.get("y")), 1))
+        elif kind in ("press", "key_down", "key_up"):
+            key = str(step.get("key", "")).strip()
+            if not key:
+                raise ValueError(f"'{kind}' step needs a key")
+            out.append((offset, kind, key_name(key), None, None, 1))
+        elif kind == "type":
+            out.append((offset, "type", str(step.get("text", "")), None, None, 1))
+        else:
+            raise ValueError(f"unknown step type {kind!r}")
+        if len(out) > MAX_TIMELINE_ENTRIES:
+            raise ValueError(f"macro expands to more than {MAX_TIMELINE_ENTRIES} actions")
+    return offset
+
+def compile_macro(macro):
+    if macro.steps:
+        out = []
+        _compile_steps(macro.steps, 0.0, out)
+        return tuple(out)
+    if macro.button in MOUSE_BUTTONS:
+        action = ("click", macro.button, macro.x_coord, macro.y_coord)
+    else:
+        key = macro.key_to_send.strip()
+        if not key:
+            return ()
+        action = ("press", key_name(key), None, None)
+    if not macro.burst:
+        return RepeatedAction(macro.n_clicks, macro.interval, action)
+    if macro.interval > 0:
+        rate, per_tick = burst_plan(1.0 / macro.interval)
+        spacing = 1.0 / rate
+    else:
+        per_tick, spacing = macro.n_clicks, 0.0
+    entries = math.ceil(macro.n_clicks / per_tick)
+    return RepeatedAction(entries, spacing, action, per_tick, macro.n_clicks - (entries - 1) * per_tick)
+
+STEP_WORDS = {"press": "press", "down": "key_down", "up": "key_up"}
+BUTTON_STEP_WORDS = {"click": "click", "mousedown": "mouse_down", "mouseup": "mouse_up"}
+
+def parse_steps_text(text: str) -> list:
+    root = []
+    stack = [(root, 0)]
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        word, _, rest = line.partition(" ")
+        word = word.lower()
+        args = rest.split()
+        try:
+            if word == "move":
+                x, y = args
+                step = {"type": "move", "x": int(x), "y": int(y)}
+            elif word in BUTTON_STEP_WORDS:
+                button = args[0].lower() if args else "left"
+                if button not in MOUSE_BUTTONS or len(args) not in (0, 1, 3):
+                    raise ValueError
+                step = {"type": BUTTON_STEP_WORDS[word], "button": button}
+                if len(args) == 3:
+                    step["x"], step["y"] = int(args[1]), int(args[2])
+            elif word in STEP_WORDS:
+                (key,) = args
+                step = {"type": STEP_WORDS[word], "key": key.lower()}
+            elif word == "type":
+                step = {"type": "type", "text": rest}
+            elif word == "wait":
+                (seconds,) = args
+                if float(seconds) < 0:
+                    raise ValueError
+                step = {"type": "wait", "seconds": float(seconds)}
+            elif word == "repeat":
+                (times,) = args
+                if int(times) < 0:
+                    raise ValueError
+                step = {"type": "repeat", "times": int(times), "steps": []}
+                stack[-1][0].append(step)
+                stack.append((step["steps"], lineno))
+                continue
+            elif word == "end" and not args and len(stack) > 1:
+                stack.pop()
+                continue
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"line {lineno}: cannot parse '{line}'") from None
+        stack[-1][0].append(step)
+    if len(stack) > 1:
+        raise ValueError(f"line {stack[-1][1]}: 'repeat' without 'end'")
+    return root
+
+def format_steps_text(steps, indent: int = 0) -> str:
+    pad = "  " * indent
+    lines = []
+    for step in steps:
+        kind = step.get("type")
+        if kind == "move":
+            lines.append(f"{pad}move {step['x']} {step['y']}")
+        elif kind in BUTTON_STEP_WORDS.values():
+            word = {v: k for k, v in BUTTON_STEP_WORDS.items()}[kind]
+            coords = f" {step['x']} {step['y']}" if step.get("x") is not None and step.get("y") is not None else ""
+            lines.append(f"{pad}{word} {step.get('button', 'left')}{coords}")
+        elif kind in ("press", "key_down", "key_up"):
+            word = {v: k for k, v in STEP_WORDS.items()}[kind]
+            lines.append(f"{pad}{word} {step['key']}")
+        elif kind == "type":
+            lines.append(f"{pad}type {step.get('text', '')}")
+        elif kind == "wait":
+            lines.append(f"{pad}wait {step.get('seconds', 0.0):g}")
+        elif kind == "repeat":
+            lines.append(f"{pad}repeat {step.get('times', 1)}")
+            inner = format_steps_text(step.get("steps", []), indent + 1)
+            if inner:
+                lines.append(inner)
+            lines.append(f"{pad}end")
+    return "\n".join(lines)
+
+WATCH_MODES = ("change", "color")
+WATCH_TOLERANCE = 16
+WATCH_INTERVAL = 0.1
+MIN_WATCH_INTERVAL = 0.005
+
+def _parse_color(text: str) -> list:
+    text = text.strip().lstrip("#")
+    if "," in text:
+        rgb = [int(part) for part in text.split(",")]
+    elif len(text) == 6:
+        rgb = [int(text[i:i + 2], 16) for i in (0, 2, 4)]
+    else:
+        raise ValueError
+    if len(rgb) != 3 or not all(0 <= c <= 255 for c in rgb):
+        raise ValueError
+    return rgb
+
+def normalize_watch(watch: dict) -> dict:
+    mode = watch.get("mode")
+    if mode not in WATCH_MODES:
+        raise ValueError(f"unknown watch mode '{mode}'")
+    x, y, w, h = (int(v) for v in watch["region"])
+    if w < 1 or h < 1:
+        raise ValueError("watch region must be at least 1x1")
+    out = {"mode": mode, "region": [x, y, w, h],
+           "tolerance": max(0, min(255, int(watch.get("tolerance", WATCH_TOLERANCE)))),
+           "interval": max(MIN_WATCH_INTERVAL, float(watch.get("interval", WATCH_INTERVAL)))}
+    if mode == "color":
+        color = watch["color"]
+        out["color"] = _parse_color(color) if isinstance(color, str) else _parse_color(",".join(map(str, color)))
+        fraction = float(watch.get("fraction", 1.0))
+        if not 0.0 < fraction <= 1.0:
+            raise ValueError("watch fraction must be in (0, 1]")
+        out["fraction"] = fraction
+    else:
+        out["pixels"] = max(1, int(watch.get("pixels", 1)))
+    return out
+
+def parse_watch_text(text: str):
+    words = text.split()
+    if not words:
+        return None
+    word = words[0].lower()
+    try:
+        if word == "pixel":
+            x, y, color = words[1:4]
+            watch = {"mode": "color", "region": [x, y, 1, 1], "color": color}
+            rest = words[4:]
+        elif word == "color":
+            watch = {"mode": "color", "region": words[1:5], "color": words[5]}
+            rest = words[6:]
+        elif word == "change":
+            watch = {"mode": "change", "region": words[1:5]}
+            rest = words[5:]
+        else:
+            raise ValueError
+        if len(watch["region"]) != 4 or len(rest) % 2:
+            raise ValueError
+        options = {"tolerance": "tolerance", "every": "interval", "fraction": "fraction", "pixels": "pixels"}
+        for name, value in zip(rest[::2], rest[1::2]):
+            watch[options[name.lower()]] = value
+        return normalize_watch(watch)
+    except (ValueError, KeyError, IndexError):
+        raise ValueError(f"cannot parse watch '{text.strip()}'") from None
+
+def format_watch_text(watch) -> str:
+    if not watch:
+        return ""
+    x, y, w, h = watch["region"]
+    if watch["mode"] == "color":
+        color = "#" + "".join(f"{c:02x}" for c in watch["color"])
+        head = f"pixel {x} {y} {color}" if w == 1 and h == 1 else f"color {x} {y} {w} {h} {color}"
+        extra = [("fraction", watch.get("fraction", 1.0), 1.0)]
+    else:
+        head = f"change {x} {y} {w} {h}"
+        extra = [("pixels", watch.get("pixels", 1), 1)]
+    extra += [("tolerance", watch.get("tolerance", WATCH_TOLERANCE), WATCH_TOLERANCE),
+              ("every", watch.get("interval", WATCH_INTERVAL), WATCH_INTERVAL)]
+    return " ".join([head] + [f"{name} {value:g}" for name, value, default in extra if value != default])
+
+PATTERN_TIMINGS = ("fixed", "uniform", "normal", "lognormal")
+PATTERN_SPREAD = 0.2
+PATTERN_CURVE = 0.2
+MAX_GLIDE_STEPS = 50
+
+def normalize_pattern(pattern: dict) -> dict:
+    timing = pattern.get("timing", "fixed")
+    if timing not in PATTERN_TIMINGS:
+        raise ValueError(f"unknown timing '{timing}'")
+    spread = float(pattern.get("spread", PATTERN_SPREAD))
+    if not 0.0 <= spread < 1.0:
+        raise ValueError("timing spread must be in [0, 1)")
+    out = {"timing": timing, "spread": spread,
+           "jitter": max(0.0, float(pattern.get("jitter", 0.0))),
+           "area": None, "path": None,
+           "glide": max(0, min(MAX_GLIDE_STEPS, int(pattern.get("glide", 0)))),
+           "curve": max(0.0, float(pattern.get("curve", PATTERN_CURVE))),
+           "seed": None if pattern.get("seed") is None else int(pattern["seed"])}
+    if pattern.get("area"):
+        w, h = (int(v) for v in pattern["area"])
+        if w < 1 or h < 1:
+            raise ValueError("pattern area must be at least 1x1")
+        out["area"] = [w, h]
+    if pattern.get("path"):
+        path = [[int(x), int(y)] for x, y in pattern["path"]]
+        if len(path) < 2:
+            raise ValueError("pattern path needs at least two points")
+        out["path"] = path
+    return out
+
+def parse_pattern_text(text: str):
+    words = text.split()
+    if not words:
+        return None
+    pattern = {}
+    i = 0
+    try:
+        while i < len(words):
+            word = words[i].lower()
+            if word == "timing":
+                pattern["timing"] = words[i + 1].lower()
+                i += 2
+                if i < len(words) and words[i][0].isdigit():
+                    pattern["spread"] = words[i]
+                    i += 1
+            elif word == "area":
+                pattern["area"] = words[i + 1:i + 3]
+                i += 3
+            elif word == "path":
+                numbers = []
+                i += 1
+                while i < len(words) and words[i].lstrip("-").isdigit():
+                    numbers.append(words[i])
+                    i += 1
+                if len(numbers) % 2:
+                    raise ValueError
+                pattern["path"] = list(zip(numbers[::2], numbers[1::2]))
+            elif word in ("jitter", "glide", "curve", "seed"):
+                pattern[word] = words[i + 1]
+                i += 2
+            else:
+                raise ValueError
+        return normalize_pattern(pattern)
+    except (ValueError, KeyError, IndexError):
+        raise ValueError(f"cannot parse pattern '{text.strip()}'") from None
+
+def format_pattern_text(pattern) -> str:
+    if not pattern:
+        return ""
+    words = []
+    if pattern.get("timing", "fixed") != "fixed":
+        words.append(f"timing {pattern['timing']}")
+        if pattern.get("spread", PATTERN_SPREAD) != PATTERN_SPREAD:
+            words.append(f"{pattern['spread']:g}")
+    if pattern.get("jitter"):
+        words.append(f"jitter {pattern['jitter']:g}")
+    if pattern.get("area"):
+        words.append(f"area {pattern['area'][0]} {pattern['area'][1]}")
+    if pattern.get("path"):
+        words.append("path " + " ".join(f"{x} {y}" for x, y in pattern["path"]))
+    if pattern.get("glide"):
+        words.append(f"glide {pattern['glide']}")
+        if pattern.get("curve", PATTERN_CURVE) != PATTERN_CURVE:
+            words.append(f"curve {pattern['curve']:g}")
+    if pattern.get("seed") is not None:
+        words.append(f"seed {pattern['seed']}")
+    return " ".join(words)
+
+SEARCH_GRAM = 3
+
+def macro_search_text(macro) -> str:
+    return f" {macro.name.lower()} {(hotkey_to_string(macro.trigger_key) or '').lower()}"
+
+def _search_keys(text: str):
+    grams = {text[i:i + SEARCH_GRAM] for i in range(len(text) - SEARCH_GRAM + 1)}
+    grams = {gram for gram in grams if " " not in gram}
+    prefixes = {word[:n] for word in text.split() for n in range(1, SEARCH_GRAM)}
+    return grams, prefixes
+
+class MacroSearchIndex:
+    def __init__(self, macros=()):
+        self.clear()
+        self.extend(macros)
+
+    def clear(self):
+        self._macros = []
+        self._texts = []
+        self._slots = {}
+        self._grams = {}
+        self._prefixes = {}
+        self._dead = 0
+        self._unordered = False
+        self._last_tokens = None
+        self._last_slots = None
+
+    def __len__(self):
+        return len(self._macros) - self._dead
+
+    def _post(self, slot: int, keys, old=(set(), set())):
+        for table, new, stale in ((self._grams, keys[0], old[0]), (self._prefixes, keys[1], old[1])):
+            for key in new - stale:
+                postings = table.get(key)
+                if postings is None:
+                    table[key] = [slot]
+                else:
+                    postings.append(slot)
+
+    def add(self, macro):
+        slot = len(self._macros)
+        text = macro_search_text(macro)
+        self._macros.append(macro)
+        self._texts.append(text)
+        self._slots[id(macro)] = slot
+        self._post(slot, _search_keys(text))
+        self._last_tokens = None
+
+    def extend(self, macros):
+        for macro in macros:
+            self.add(macro)
+
+    def update(self, macro):
+        slot = self._slots.get(id(macro))
+        if slot is None:
+            self.add(macro)
+            return
+        old = self._texts[slot]
+        text = macro_search_text(macro)
+        if text == old:
+            return
+        self._texts[slot] = text
+        self._post(slot, _search_keys(text), _search_keys(old))
+        self._unordered = True
+        self._last_tokens = None
+
+    def remove(self, macro):
+        slot = self._slots.pop(id(macro), None)
+        if slot is None:
+            return
+        self._macros[slot] = None
+        self._texts[slot] = None
+        self._dead += 1
+        self._last_tokens = None
+        if self._dead > 1024 and self._dead * 2 > len(self._macros):
+            live = [m for m in self._macros if m is not None]
+            self.clear()
+            self.extend(live)
+
+    def _postings(self, token: str):
+        if len(token) < SEARCH_GRAM:
+            return self._prefixes.get(token, ())
+        best = None
+        for i in range(len(token) - SEARCH_GRAM + 1):
+            postings = self._grams.get(token[i:i + SEARCH_GRAM])
+            if postings is None:
+                return ()
+            if best is None or len(postings) < len(best):
+                best = postings
+        return best
+
+    def _narrows(self, tokens) -> bool:
+        last = self._last_tokens
+        if last is None or len(tokens) < len(last):
+            return False
+        for i, old in enumerate(last):
+            new = tokens[i]
+            if not new.startswith(old) or (new != old and i < len(last) - 1):
+                return False
+            if len(old) < SEARCH_GRAM <= len(new):
+                return False
+        return True
+
+    def search(self, query: str) -> list:
+        tokens = query.lower().split()
+        macros = self._macros
+        if not tokens:
+            return [m for m in macros if m is not None]
+        if self._narrows(tokens):
+            candidates = self._last_slots
+        else:
+            candidates = min((self._postings(t) for t in tokens), key=len)
+            if self._unordered:
+                candidates = sorted(set(candidates))
+        needles = [f" {t}" if len(t) < SEARCH_GRAM else t for t in tokens]
+        texts = self._texts
+        slots = []
+        for slot in candidates:
+            text = texts[slot]
+            if text is not None and all(needle in text for needle in needles):
+                slots.append(slot)
+        self._last_tokens = tokens
+        self._last_slots = slots
+        return [macros[slot] for slot in slots]
+
+class InputBackend:
+    name = ""
+
+    def click(self, button: str, x=None, y=None, count: int = 1):
+        raise NotImplementedError
+
+    def press(self, key: str, count: int = 1):
+        raise NotImplementedError
+
+    def move(self, x: int, y: int):
+        raise NotImplementedError
+
+    def mouse_down(self, button: str, x=None, y=None):
+        raise NotImplementedError
+
+    def mouse_up(self, button: str, x=None, y=None):
+        raise NotImplementedError
+
+    def key_down(self, key: str):
+        raise NotImplementedError
+
+    def key_up(self, key: str):
+        raise NotImplementedError
+
+    def type_text(self, text: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class PyAutoGUIBackend(InputBackend):
+    name = "pyautogui"
+
+    def __init__(self):
+        import pyautogui
+        self._pyautogui = pyautogui
+
+    def click(self, button: str, x=None, y=None, count: int = 1):
+        if x is not None and y is not None:
+            self._pyautogui.click(x=x, y=y, clicks=count, interval=0.0, button=button)
+        else:
+            self._pyautogui.click(clicks=count, interval=0.0, button=button)
+
+    def press(self, key: str, count: int = 1):
+        self._pyautogui.press(key_name(key), presses=count, interval=0.0)
+
+    def move(self, x: int, y: int):
+        self._pyautogui.moveTo(x, y)
+
+    def mouse_down(self, button: str, x=None, y=None):
+        self._pyautogui.mouseDown(x=x, y=y, button=button)
+
+    def mouse_up(self, button: str, x=None, y=None):
+        self._pyautogui.mouseUp(x=x, y=y, button=button)
+
+    def key_down(self, key: str):
+        self._pyautogui.keyDown(key_name(key))
+
+    def key_up(self, key: str):
+        self._pyautogui.keyUp(key_name(key))
+
+    def type_text(self, text: str):
+        self._pyautogui.write(text)
+
+class PynputBackend(InputBackend):
+    name = "pynput"
+
+    def __init__(self):
+        from pynput import mouse
+        self._mouse = mouse.Controller()
+        self._keyboard = keyboard.Controller()
+        self._buttons = {b: getattr(mouse.Button, b) for b in MOUSE_BUTTONS}
+        self._keys = {}
+
+    def _resolve_key(self, key: str):
+        k = self._keys.get(key)
+        if k is None:
+            name = key_name(key)
+            if len(name) == 1:
+                k = keyboard.KeyCode.from_char(name)
+            else:
+                k = getattr(keyboard.Key, PYNPUT_KEY_NAMES.get(name, name), None)
+                if k is None:
+                    raise ValueError(f"the pynput backend cannot send {key!r}")
+            self._keys[key] = k
+        return k
+
+    def click(self, button: str, x=None, y=None, count: int = 1):
+        if x is not None and y is not None:
+            self._mouse.position = (x, y)
+        self._mouse.click(self._buttons[button], count)
+
+    def press(self, key: str, count: int = 1):
+        k = self._resolve_key(key)
+        for _ in range(count):
+            self._keyboard.press(k)
+            self._keyboard.release(k)
+
+    def move(self, x: int, y: int):
+        self._mouse.position = (x, y)
+
+    def mouse_down(self, button: str, x=None, y=None):
+        if x is not None and y is not None:
+            self._mouse.position = (x, y)
+        self._mouse.press(self._buttons[button])
+
+    def mouse_up(self, button: str, x=None, y=None):
+        if x is not None and y is not None:
+            self._mouse.position = (x, y)
+        self._mouse.release(self._buttons[button])
+
+    def key_down(self, key: str):
+        self._keyboard.press(self._resolve_key(key))
+
+    def key_up(self, key: str):
+        self._keyboard.release(self._resolve_key(key))
+
+    def type_text(self, text: str):
+        self._keyboard.type(text)
+
+class RecordingBackend(InputBackend):
+    name = "dry-run"
+
+    def __init__(self, max_events: int = 100000, clock=time.perf_counter):
+        self.events = deque(maxlen=max_events) if max_events else None
+        self.count = 0
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    def click(self, button: str, x=None, y=None, count: int = 1):
+        with self._lock:
+            self.count += count
+            if self.events is not None:
+                self.events.append((self.clock(), "click", button, x, y, count))
+
+    def press(self, key: str, count: int = 1):
+        key = key_name(key)
+        with self._lock:
+            self.count += count
+            if self.events is not None:
+                self.events.append((self.clock(), "press", key, None, None, count))
+
+    def _record(self, kind: str, target, x=None, y=None):
+        if self.events is not None:
+            with self._lock:
+                self.events.append((self.clock(), kind, target, x, y, 1))
+
+    def move(self, x: int, y: int):
+        self._record("move", None, x, y)
+
+    def mouse_down(self, button: str, x=None, y=None):
+        self._record("mouse_down", button, x, y)
+
+    def mouse_up(self, button: str, x=None, y=None):
+        self._record("mouse_up", button, x, y)
+
+    def key_down(self, key: str):
+        self._record("key_down", key_name(key))
+
+    def key_up(self, key: str):
+        self._record("key_up", key_name(key))
+
+    def type_text(self, text: str):
+        self._record("type", text)
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            if self.events is not None:
+                self.events.clear()
+
+INPUT_BACKENDS = {
+    PyAutoGUIBackend.name: PyAutoGUIBackend,
+    PynputBackend.name: PynputBackend,
+    RecordingBackend.name: RecordingBackend,
+}
+
+def make_backend(name: str) -> InputBackend:
+    try:
+        cls = INPUT_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown input backend '{name}'") from None
+    return cls()
+
+MAX_TICK_RATE = 250.0
+
+def burst_plan(cps: float, max_tick_rate: float = MAX_TICK_RATE):
+    cps = max(cps, 0.01)
+    per_tick = max(1, math.ceil(cps / max_tick_rate))
+    return cps / per_tick, per_tick
+
+REC_KEY_DOWN = 1
+REC_KEY_UP = 2
+REC_MOVE = 3
+REC_BUTTON_DOWN = 4
+REC_BUTTON_UP = 5
+REPLAY_TOLERANCE_MS = 2.0
+
+class InputRecorder:
+    def __init__(self, capacity: int = 65536):
+        capacity = 1 << max(4, (capacity - 1).bit_length())
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self._t = array("q", bytes(8 * capacity))
+        self._kind = bytearray(capacity)
+        self._x = array("i", bytes(4 * capacity))
+        self._y = array("i", bytes(4 * capacity))
+        self._obj = [None] * capacity
+        self._n = 0
+        self._lock = threading.Lock()
+        self.active = False
+
+    def start(self):
+        with self._lock:
+            self._n = 0
+            self.active = True
+
+    def stop(self):
+        self.active = False
+
+    @property
+    def dropped(self) -> int:
+        return max(0, self._n - self.capacity)
+
+    def _put(self, kind: int, obj, x: int, y: int):
+        with self._lock:
+            i = self._n & self._mask
+            self._t[i] = time.perf_counter_ns()
+            self._kind[i] = kind
+            self._obj[i] = obj
+            self._x[i] = x
+            self._y[i] = y
+            self._n += 1
+
+    def on_key_down(self, key):
+        if self.active:
+            self._put(REC_KEY_DOWN, key, 0, 0)
+
+    def on_key_up(self, key):
+        if self.active:
+            self._put(REC_KEY_UP, key, 0, 0)
+
+    def on_move(self, x, y):
+        if self.active:
+            self._put(REC_MOVE, None, int(x), int(y))
+
+    def on_click(self, x, y, button, pressed):
+        if self.active:
+            self._put(REC_BUTTON_DOWN if pressed else REC_BUTTON_UP, button, int(x), int(y))
+
+    def events(self):
+        with self._lock:
+            n = self._n
+            first = max(0, n - self.capacity)
+            out = []
+            for j in range(first, n):
+                i = j & self._mask
+                out.append((self._t[i], self._kind[i], self._obj[i], self._x[i], self._y[i]))
+        return out
+
+def _recorded_name(kind: int, obj) -> str:
+    if kind in (REC_BUTTON_DOWN, REC_BUTTON_UP):
+        name = getattr(obj, "name", "")
+        return name if name in MOUSE_BUTTONS else ""
+    name = hotkey_to_string(obj)
+    if len(name) == 1 and ord(name) < 32:
+        name = chr(ord(name) + 96)
+    try:
+        return key_name(name) if name else ""
+    except ValueError:
+        return ""
+
+def compress_recording(events, move_interval: float = 0.0, tap_max_hold: float = 0.25,
+                       wait_resolution: float = 0.001, with_times: bool = False):
+    actions = []
+    held = set()
+    pending_move = None
+    skip = set()
+
+    def flush_move(next_xy=None):
+        nonlocal pending_move
+        if pending_move is not None and pending_move[2:] != next_xy:
+            actions.append((pending_move[1], {"type": "move", "x": pending_move[2], "y": pending_move[3]}))
+        pending_move = None
+
+    for idx, (t_ns, kind, obj, x, y) in enumerate(events):
+        t = t_ns / 1e9
+        if idx in skip:
+            continue
+        if kind == REC_MOVE:
+            if pending_move is not None and move_interval > 0 and t - pending_move[0] >= move_interval:
+                flush_move()
+            first = t if pending_move is None else pending_move[0]
+            pending_move = (first, t, x, y)
+            continue
+        name = _recorded_name(kind, obj)
+        if not name:
+            continue
+        ident = (kind in (REC_BUTTON_DOWN, REC_BUTTON_UP), name)
+        if kind in (REC_KEY_UP, REC_BUTTON_UP):
+            if ident not in held:
+                continue
+            held.discard(ident)
+        if kind in (REC_BUTTON_DOWN, REC_BUTTON_UP):
+            flush_move((x, y))
+        else:
+            flush_move()
+        if kind in (REC_KEY_DOWN, REC_BUTTON_DOWN):
+            if ident in held:
+                continue
+            release = REC_KEY_UP if kind == REC_KEY_DOWN else REC_BUTTON_UP
+            tap = None
+            for j in range(idx + 1, len(events)):
+                nt, nkind, nobj, nx, ny = events[j]
+                if nkind == REC_MOVE and kind == REC_KEY_DOWN:
+                    continue
+                if nkind == release and _recorded_name(nkind, nobj) == name and (nt / 1e9 - t) <= tap_max_hold \
+                        and (kind == REC_KEY_DOWN or (nx, ny) == (x, y)):
+                    tap = j
+                break
+            if tap is not None:
+                skip.add(tap)
+                if kind == REC_KEY_DOWN:
+                    actions.append((t, {"type": "press", "key": name}))
+                else:
+                    actions.append((t, {"type": "click", "button": name, "x": x, "y": y}))
+                continue
+            held.add(ident)
+            if kind == REC_KEY_DOWN:
+                actions.append((t, {"type": "key_down", "key": name}))
+            else:
+                actions.append((t, {"type": "mouse_down", "button": name, "x": x, "y": y}))
+        elif kind == REC_KEY_UP:
+            actions.append((t, {"type": "key_up", "key": name}))
+        else:
+            actions.append((t, {"type": "mouse_up", "button": name, "x": x, "y": y}))
+    flush_move()
+    actions.sort(key=lambda a: a[0])
+    steps = []
+    times = []
+    if actions:
+        origin = actions[0][0]
+        emitted = 0.0
+        for t, step in actions:
+            gap = round((t - origin - emitted) / wait_resolution) * wait_resolution
+            if gap > 0:
+                steps.append({"type": "wait", "seconds": round(gap, 6)})
+                emitted += gap
+            steps.append(step)
+            times.append(t - origin)
+    return (steps, times) if with_times else steps
+
+SPIN_WINDOW = 0.001
+
+def wait_until(deadline: float, cancel: threading.Event = None, spin_window: float = SPIN_WINDOW) -> bool:
+    remaining = deadline - time.perf_counter()
+    if remaining > spin_window:
+        if cancel is None:
+            time.sleep(remaining - spin_window)
+        elif cancel.wait(remaining - spin_window):
+            return False
+    while time.perf_counter() < deadline:
+        pass
+    return cancel is None or not cancel.is_set()
+
+class DeadlineScheduler:
+    def __init__(self, rate: float, catch_up: bool = False, spin_window: float = SPIN_WINDOW,
+                 max_catch_up: int = 1000, per_tick: int = 1, clock=time.perf_counter):
+        self.clock = clock
+        self.period = 1.0 / max(rate, 0.01)
+        self.per_tick = max(1, per_tick)
+        self.catch_up = catch_up
+        self.spin_window = max(0.0, spin_window)
+        self.max_catch_up = max(1, max_catch_up)
+        self.ticks = 0
+        self.missed = 0
+        self._behind = 0
+        self._start = None
+        self._next = None
+        self._last = None
+        self.deadline = None
+        self._late_n = 0
+        self._late_mean = 0.0
+        self._late_m2 = 0.0
+        self._late_max = 0.0
+
+    def start(self):
+        self._start = self.clock()
+        self._next = self._start
+        self._last = self._start
+
+    def wait(self) -> int:
+        if self._next is None:
+            self.start()
+        deadline = self._next
+        clock = self.clock
+        remaining = deadline - clock()
+        if remaining > self.spin_window:
+            time.sleep(remaining - self.spin_window)
+        now = clock()
+        while now < deadline:
+            now = clock()
+        return self.tick(now)
+
+    @property
+    def next_deadline(self) -> float:
+        return self._next
+
+    def tick(self, now: float) -> int:
+        deadline = self._next
+        late = now - deadline
+        self._record_lateness(late)
+        behind = int(late / self.period)
+        if self.catch_up:
+            due = min(behind + 1, self.max_catch_up)
+            self.missed += behind + 1 - due
+        else:
+            due = 1
+            self.missed += behind
+        self._next = deadline + (behind + 1) * self.period
+        self._behind = behind
+        self.deadline = deadline
+        self._last = now
+        self.ticks += due
+        return due
+
+    def skip(self, ticks: int):
+        n = self._late_n
+        total = n + ticks
+        delta = -self._late_mean
+        self._late_mean += delta * ticks / total
+        self._late_m2 += delta * delta * n * ticks / total
+        self._late_n = total
+        period = self.period
+        deadline = self._next
+        for _ in range(ticks - 1):
+            deadline += period
+        self.deadline = deadline
+        self._next = deadline + period
+        self._last = self.deadline
+        self.ticks += ticks
+
+    def reschedule(self, interval: float, counted: bool = True):
+        deadline = self.deadline
+        late = self._last - deadline
+        behind = int(late / interval) if interval > 0 and late > 0 else 0
+        self.missed += behind - self._behind
+        self._behind = 0
+        self._next = max(deadline + (behind + 1) * interval, self._last)
+        if not counted:
+            self.ticks -= 1
+
+    def _record_lateness(self, late: float):
+        self._late_n += 1
+        delta = late - self._late_mean
+        self._late_mean += delta / self._late_n
+        self._late_m2 += delta * (late - self._late_mean)
+        if late > self._late_max:
+            self._late_max = late
+
+    @property
+    def achieved_rate(self):
+        if self._start is None or self.ticks < 2 or self._last <= self._start:
+            return 0.0
+        return (self.ticks - 1) * self.per_tick / (self._last - self._start)
+
+    @property
+    def jitter(self):
+        if self._late_n < 2:
+            return 0.0
+        return (self._late_m2 / (self._late_n - 1)) ** 0.5
+
+    def stats(self):
+        return {
+            "target_cps": self.per_tick / self.period,
+            "achieved_cps": self.achieved_rate,
+            "ticks": self.ticks,
+            "missed": self.missed,
+            "mean_late_ms": self._late_mean * 1000.0,
+            "max_late_ms": self._late_max * 1000.0,
+            "jitter_ms": self.jitter * 1000.0,
+        }
+
+CHANNEL_MODES = ("press", "toggle")
+CHANNEL_BUTTONS = ("left", "middle", "right", "key")
+
+class ClickerChannel:
+    def __init__(self, name: str, clicks_per_second: float = 1.0, trigger_key=None, mode: str = "press",
+                 button: str = "left", key_to_send: str = "", x=None, y=None, catch_up: bool = False,
+                 burst: bool = False, pattern=None):
+        self.name = name
+        self.clicks_per_second = max(0.01, clicks_per_second)
+        self.trigger_key = trigger_key
+        self.mode = mode if mode in CHANNEL_MODES else "press"
+        self.button = button if button in CHANNEL_BUTTONS else "left"
+        self.key_to_send = key_to_send.strip().lower()
+        self.x = x
+        self.y = y
+        self.catch_up = bool(catch_up)
+        self.burst = bool(burst)
+        self.pattern = pattern or None
+        self.stream = None
+        self.active = False
+        self.generation = 0
+        self.timer = None
+        self.per_tick = 1
+        self.prev_sent = 0
+        self.prev_deadline = 0.0
+
+    def display_name(self):
+        if self.button == "key":
+            action = f"key '{self.key_to_send}'"
+        else:
+            action = f"{self.button} click"
+        where = f" @ ({self.x},{self.y})" if self.x is not None and self.y is not None else ""
+        if self.pattern:
+            where += " humanized"
+        hk = hotkey_to_string(self.trigger_key) or "?"
+        return f"{self.name} — {self.clicks_per_second:g} cps {action}{where} [{hk}, {self.mode}]"
+
+    def stats(self):
+        timer = self.timer
+        return timer.stats() if timer is not None else None
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "clicks_per_second": self.clicks_per_second,
+            "trigger_key": hotkey_to_string(self.trigger_key),
+            "mode": self.mode,
+            "button": self.button,
+            "key_to_send": self.key_to_send,
+            "x": self.x,
+            "y": self.y,
+            "catch_up": self.catch_up,
+            "burst": self.burst,
+            "pattern": self.pattern,
+        }
+
+    @staticmethod
+    def from_dict(d):
+        return ClickerChannel(
+            name=d.get("name", "clicker"),
+            clicks_per_second=float(d.get("clicks_per_second", 1.0)),
+            trigger_key=parse_hotkey_string(d.get("trigger_key", "")),
+            mode=d.get("mode", "press"),
+            button=d.get("button", "left"),
+            key_to_send=d.get("key_to_send", ""),
+            x=_opt_int(d.get("x")),
+            y=_opt_int(d.get("y")),
+            catch_up=d.get("catch_up", False),
+            burst=d.get("burst", False),
+            pattern=d.get("pattern") or None,
+        )
+
+class ChannelScheduler:
+    def __init__(self, fire, spin_window: float = SPIN_WINDOW, on_error=None):
+        self._fire = fire
+        self.on_error = on_error
+        self.spin_window = max(0.0, spin_window)
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._firing = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+
+    def add(self, channel: ClickerChannel):
+        with self._lock:
+            if self._closed:
+                return
+            heapq.heappush(self._heap, (channel.timer.next_deadline, next(self._seq), channel, channel.generation))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="channel-scheduler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        try:
+            self._loop()
+        finally:
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _loop(self):
+        heap = self._heap
+        lock = self._lock
+        wake = self._wake
+        while True:
+            if wake.is_set():
+                wake.clear()
+            with lock:
+                if self._closed:
+                    return
+                top = heap[0] if heap else None
+            if top is None:
+                wake.wait()
+                continue
+            deadline, _, channel, generation = top
+            remaining = deadline - time.perf_counter()
+            if remaining > self.spin_window and wake.wait(remaining - self.spin_window):
+                continue
+            now = time.perf_counter()
+            while now < deadline:
+                now = time.perf_counter()
+            entry = None
+            if generation == channel.generation and channel.active:
+                with self._firing:
+                    try:
+                        if self._fire(channel, channel.timer.tick(now)) and generation == channel.generation:
+                            entry = (channel.timer.next_deadline, next(self._seq), channel, generation)
+                    except Exception as e:
+                        if self.on_error is not None:
+                            self.on_error(channel, e)
+            with lock:
+                if heap[0] is top:
+                    if entry is None:
+                        heapq.heappop(heap)
+                    else:
+                        heapq.heapreplace(heap, entry)
+                else:
+                    heap.remove(top)
+                    heapq.heapify(heap)
+                    if entry is not None:
+                        heapq.heappush(heap, entry)
+
+    def quiesce(self):
+        with self._firing:
+            pass
+
+    def close(self, timeout: float = 2.0):
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wake.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+class StatusBus:
+    def __init__(self, **initial):
+        self._fields = dict(initial)
+        self._versions = itertools.count(1)
+        self._version = 0
+        self._seen = 0
+
+    def publish(self, **fields):
+        self._fields.update(fields)
+        self._version = next(self._versions)
+
+    def get(self, name: str, default=None):
+        return self._fields.get(name, default)
+
+    def take(self):
+        version = self._version
+        if version == self._seen:
+            return None
+        self._seen = version
+        return dict(self._fields)
+
+class ClickCounter:
+    def __init__(self):
+        self.limit = 0
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._quota_lock = threading.Lock()
+        self._base = 0
+        self._in_flight = 0
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = [0, 0]
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def _raw_total(self) -> int:
+        return sum(shard[0] for shard in list(self._shards))
+
+    @property
+    def value(self) -> int:
+        return self._raw_total() - self._base
+
+    def reserve(self, wanted: int) -> int:
+        if self.limit <= 0:
+            return wanted
+        shard = self._shard()
+        with self._quota_lock:
+            granted = max(0, min(wanted, self.limit - self.value - self._in_flight))
+            self._in_flight += granted
+        shard[1] += granted
+        return granted
+
+    def add(self, n: int = 1):
+        shard = self._shard()
+        shard[0] += n
+        held = shard[1]
+        if held:
+            shard[1] = 0
+            with self._quota_lock:
+                self._in_flight = max(0, self._in_flight - held)
+
+    def release(self):
+        shard = self._shard()
+        held = shard[1]
+        if held:
+            shard[1] = 0
+            with self._quota_lock:
+                self._in_flight = max(0, self._in_flight - held)
+
+    def reset(self):
+        with self._quota_lock:
+            self._base = self._raw_total()
+            self._in_flight = 0
+            for shard in list(self._shards):
+                shard[1] = 0
+
+HIST_SUB_BITS = 5
+HIST_MAX_SHIFT = 40
+
+class LatencyHistogram:
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts = [0] * ((HIST_MAX_SHIFT + 2) << HIST_SUB_BITS)
+
+    def record(self, value: int):
+        if value < 0:
+            value = -value
+        shift = value.bit_length() - HIST_SUB_BITS - 1
+        if shift <= 0:
+            self.counts[value] += 1
+        elif shift <= HIST_MAX_SHIFT:
+            self.counts[(shift << HIST_SUB_BITS) + (value >> shift)] += 1
+        else:
+            self.counts[-1] += 1
+
+    @staticmethod
+    def bucket_range(index: int):
+        if index < 2 << HIST_SUB_BITS:
+            return index, index
+        shift = (index >> HIST_SUB_BITS) - 1
+        low = (index - (shift << HIST_SUB_BITS)) << shift
+        return low, low + (1 << shift) - 1
+
+    def summary(self, percentiles=(50.0, 90.0, 99.0, 99.9)) -> dict:
+        counts = list(self.counts)
+        count = sum(counts)
+        total = 0
+        top = 0
+        for index, n in enumerate(counts):
+            if n:
+                low, high = self.bucket_range(index)
+                total += n * (low + high) // 2
+                top = high
+        out = {"count": count, "sum": total, "max": top, "mean": total / count if count else 0.0}
+        targets = sorted((max(1, math.ceil(count * p / 100.0)), f"p{p:g}") for p in percentiles)
+        seen = 0
+        pending = iter(targets)
+        target, key = next(pending, (None, None))
+        for index, n in enumerate(counts):
+            if not n:
+                continue
+            seen += n
+            while target is not None and seen >= target:
+                out[key] = self.bucket_range(index)[1]
+                target, key = next(pending, (None, None))
+        for _, key in targets:
+            out.setdefault(key, 0)
+        return out
+
+    def sparse(self) -> dict:
+        return {index: n for index, n in enumerate(self.counts) if n}
+
+    def merge(self, sparse: dict):
+        counts = self.counts
+        for index, n in sparse.items():
+            counts[index] += n
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+
+METRICS_PENDING = 65536
+
+class SourceMetrics:
+    __slots__ = ("deadlines", "pending", "queued", "send", "interval_error", "queue_delay")
+
+    def __init__(self, deadlines: bool = False):
+        self.deadlines = deadlines
+        self.pending = deque(maxlen=METRICS_PENDING)
+        self.queued = deque(maxlen=METRICS_PENDING)
+        self.send = LatencyHistogram()
+        self.interval_error = LatencyHistogram()
+        self.queue_delay = LatencyHistogram()
+
+    def drain(self):
+        pending = self.pending
+        send = self.send.record
+        interval_error = self.interval_error.record
+        queue_delay = self.queue_delay.record
+        deadlines = self.deadlines
+        while pending:
+            t0, t1, prev_sent, prev_due, due = pending.popleft()
+            send(t1 - t0)
+            if prev_sent:
+                interval_error((t0 - prev_sent) - int((due - prev_due) * 1e9))
+            if deadlines:
+                queue_delay(t0 - int(due * 1e9))
+        queued = self.queued
+        while queued:
+            queue_delay(queued.popleft())
+
+    def reset(self):
+        self.pending.clear()
+        self.queued.clear()
+        self.send.reset()
+        self.interval_error.reset()
+        self.queue_delay.reset()
+
+METRIC_NAMES = {
+    "send": "time spent in the backend send call",
+    "interval_error": "difference between the actual and the scheduled gap between sends",
+    "queue_delay": "time from trigger (or due tick) to start of the send",
+}
+
+class EngineMetrics:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.dispatch_pending = deque(maxlen=METRICS_PENDING)
+        self.dispatch = LatencyHistogram()
+        self._sources = {}
+        self._lock = threading.Lock()
+
+    def source(self, name: str, deadlines: bool = False) -> SourceMetrics:
+        metrics = self._sources.get(name)
+        if metrics is None:
+            with self._lock:
+                metrics = self._sources.setdefault(name, SourceMetrics(deadlines))
+        return metrics
+
+    def drain(self):
+        with self._lock:
+            pending = self.dispatch_pending
+            record = self.dispatch.record
+            while pending:
+                record(pending.popleft())
+            for metrics in self._sources.values():
+                metrics.drain()
+
+    def reset(self):
+        with self._lock:
+            self.dispatch_pending.clear()
+            self.dispatch.reset()
+            for metrics in self._sources.values():
+                metrics.reset()
+
+    def snapshot(self) -> dict:
+        self.drain()
+        with self._lock:
+            sources = sorted(self._sources.items())
+        return {
+            "dispatch": self.dispatch.summary(),
+            "sources": {name: {metric: getattr(m, metric).summary() for metric in METRIC_NAMES}
+                        for name, m in sources},
+        }
+
+    def histograms(self) -> dict:
+        self.drain()
+        with self._lock:
+            sources = sorted(self._sources.items())
+            return {
+                "dispatch": self.dispatch.sparse(),
+                "sources": {name: {metric: getattr(m, metric).sparse() for metric in METRIC_NAMES}
+                            for name, m in sources},
+            }
+
+def merge_histograms(reports) -> dict:
+    dispatch = LatencyHistogram()
+    sources = {}
+    for report in reports:
+        dispatch.merge(report["dispatch"])
+        for name, metrics in report["sources"].items():
+            merged = sources.get(name)
+            if merged is None:
+                merged = sources[name] = {metric: LatencyHistogram() for metric in METRIC_NAMES}
+            for metric, sparse in metrics.items():
+                merged[metric].merge(sparse)
+    return {
+        "dispatch": dispatch.summary(),
+        "sources": {name: {metric: h.summary() for metric, h in merged.items()}
+                    for name, merged in sorted(sources.items())},
+    }
+
+def _prom_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def _prom_summary(lines: list, name: str, labels: str, summary: dict):
+    sep = "," if labels else ""
+    for q in (50.0, 90.0, 99.0, 99.9):
+        lines.append(f'{name}{{{labels}{sep}quantile="{q / 100.0:g}"}} {summary[f"p{q:g}"] / 1e9:.9f}')
+    labels = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{labels} {summary['sum'] / 1e9:.9f}")
+    lines.append(f"{name}_count{labels} {summary['count']}")
+    lines.append(f"{name}_max{labels} {summary['max'] / 1e9:.9f}")
+
+def prometheus_text(snapshot: dict, counters: dict = None) -> str:
+    lines = []
+    for name, value in (counters or {}).items():
+        lines.append(f"# TYPE autoclicker_{name} counter")
+        lines.append(f"autoclicker_{name} {value}")
+    lines.append("# HELP autoclicker_dispatch_seconds hotkey callback time in the listener thread")
+    lines.append("# TYPE autoclicker_dispatch_seconds summary")
+    _prom_summary(lines, "autoclicker_dispatch_seconds", "", snapshot["dispatch"])
+    for metric, help_text in METRIC_NAMES.items():
+        name = f"autoclicker_{metric}_seconds"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} summary")
+        for source, metrics in snapshot["sources"].items():
+            _prom_summary(lines, name, f'source="{_prom_label(source)}"', metrics[metric])
+    return "\n".join(lines) + "\n"
+
+class _MacroSlot:
+    def __init__(self):
+        self.running = 0
+        self.backlog = deque()
+        self.cancels = set()
+
+class MacroExecutor:
+    def __init__(self, run_macro, workers: int = 4, max_queue: int = 64, max_backlog: int = 16, on_start=None,
+                 on_error=None):
+        self._run_macro = run_macro
+        self.on_start = on_start
+        self.on_error = on_error
+        self._ready = queue.Queue(maxsize=max_queue)
+        self._max_backlog = max(1, max_backlog)
+        self._slots = {}
+        self._lock = threading.Lock()
+        self.counters = {"submitted": 0, "started": 0, "ignored": 0, "restarted": 0, "failed": 0,
+                         "dropped_queue_full": 0, "dropped_backlog_full": 0}
+        self.drops_by_macro = {}
+        self._workers = []
+        for i in range(max(0, workers)):
+            t = threading.Thread(target=self._worker, name=f"macro-worker-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+
+    def _slot(self, macro):
+        slot = self._slots.get(macro)
+        if slot is None:
+            slot = self._slots[macro] = _MacroSlot()
+        return slot
+
+    def _drop(self, macro, reason: str):
+        self.counters[reason] += 1
+        self.drops_by_macro[macro.name] = self.drops_by_macro.get(macro.name, 0) + 1
+        return False
+
+    def _dispatch(self, macro, slot: _MacroSlot, cancel: threading.Event, submitted: int) -> bool:
+        try:
+            self._ready.put_nowait((macro, cancel, submitted))
+        except queue.Full:
+            return self._drop(macro, "dropped_queue_full")
+        slot.running += 1
+        slot.cancels.add(cancel)
+        return True
+
+    def submit(self, macro) -> bool:
+        submitted = time.perf_counter_ns()
+        with self._lock:
+            self.counters["submitted"] += 1
+            slot = self._slot(macro)
+            limit = macro.max_concurrent if macro.policy == "concurrent" else 1
+            if macro.policy == "restart" and slot.running:
+                for cancel in slot.cancels:
+                    cancel.set()
+                self.counters["restarted"] += 1
+                slot.backlog.clear()
+                slot.backlog.append((threading.Event(), submitted))
+                return True
+            if slot.running < limit:
+                return self._dispatch(macro, slot, threading.Event(), submitted)
+            if macro.policy == "queue":
+                if len(slot.backlog) >= self._max_backlog:
+                    return self._drop(macro, "dropped_backlog_full")
+                slot.backlog.append((threading.Event(), submitted))
+                return True
+            return self._drop(macro, "ignored")
+
+    def _finished(self, macro, cancel: threading.Event):
+        with self._lock:
+            slot = self._slot(macro)
+            slot.running -= 1
+            slot.cancels.discard(cancel)
+            while slot.backlog and slot.running < (macro.max_concurrent if macro.policy == "concurrent" else 1):
+                if not self._dispatch(macro, slot, *slot.backlog.popleft()):
+                    break
+
+    def _worker(self):
+        while True:
+            job = self._ready.get()
+            if job is None:
+                return
+            macro, cancel, submitted = job
+            with self._lock:
+                self.counters["started"] += 1
+            try:
+                if self.on_start is not None:
+                    self.on_start(macro, time.perf_counter_ns() - submitted)
+                if not cancel.is_set():
+                    self._run_macro(macro, cancel)
+            except Exception as e:
+                with self._lock:
+                    self.counters["failed"] += 1
+                if self.on_error is not None:
+                    self.on_error(macro, e)
+            finally:
+                self._finished(macro, cancel)
+
+    def is_running(self, macro) -> bool:
+        with self._lock:
+            slot = self._slots.get(macro)
+            return bool(slot and slot.running)
+
+    def cancel_all(self):
+        with self._lock:
+            for slot in self._slots.values():
+                slot.backlog.clear()
+                for cancel in slot.cancels:
+                    cancel.set()
+
+    def stats(self):
+        with self._lock:
+            return {"queued": self._ready.qsize(), **self.counters, "drops_by_macro": dict(self.drops_by_macro)}
+
+    def shutdown(self):
+        self.cancel_all()
+        for _ in self._workers:
+            try:
+                self._ready.put_nowait(None)
+            except queue.Full:
+                break
+
+def _apply_journal_op(docs: list, op: dict):
+    kind = op["op"]
+    if kind == "add":
+        docs.append(op["macro"])
+    elif kind == "update":
+        docs[op["index"]] = op["macro"]
+    elif kind == "remove":
+        del docs[op["index"]]
+    elif kind == "reset":
+        docs[:] = op["macros"]
+
+_JSON_WS = re.compile(r"[ \t\n\r]*")
+
+def _iter_json_list(text: str, chunk_size: int):
+    decoder = json.JSONDecoder()
+    idx = _JSON_WS.match(text, 0).end()
+    if idx == len(text):
+        return
+    if text[idx] != "[":
+        raise ValueError("expected a JSON list of macros")
+    idx = _JSON_WS.match(text, idx + 1).end()
+    if text.startswith("]", idx):
+        return
+    chunk = []
+    while True:
+        doc, idx = decoder.raw_decode(text, idx)
+        chunk.append(doc)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+        idx = _JSON_WS.match(text, idx).end()
+        if text.startswith(",", idx):
+            idx = _JSON_WS.match(text, idx + 1).end()
+        elif text.startswith("]", idx):
+            break
+        else:
+            raise ValueError(f"malformed macro list at offset {idx}")
+    if chunk:
+        yield chunk
+
+def _fsync_dir(path: str):
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def atomic_write(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_dir(path)
+
+class MacroStorage:
+    def __init__(self, path: str, debounce: float = 0.25, compact_every: int = 500, on_error=None):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self.debounce = debounce
+        self.compact_every = max(1, compact_every)
+        self.on_error = on_error
+        self.last_error = None
+        self._base_sha = hashlib.sha1(b"").hexdigest()
+        self._journal_len = 0
+        self._journal_ready = False
+        self._dirty = False
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def _read_snapshot(self) -> bytes:
+        if os.path.isfile(self.path):
+            with open(self.path, "rb") as f:
+                return f.read()
+        return b""
+
+    def _read_journal(self, base_sha: str):
+        ops = []
+        ready = False
+        if os.path.isfile(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                try:
+                    base = json.loads(f.readline())
+                except ValueError:
+                    base = {}
+                if base.get("op") == "base" and base.get("sha1") == base_sha:
+                    ready = True
+                    for line in f:
+                        try:
+                            ops.append(json.loads(line))
+                        except ValueError:
+                            break
+        return ops, ready
+
+    def _open(self):
+        raw = self._read_snapshot()
+        base_sha = hashlib.sha1(raw).hexdigest()
+        ops, ready = self._read_journal(base_sha)
+        return raw, base_sha, ops, ready
+
+    def iter_load(self, chunk_size: int = 1000):
+        raw, base_sha, ops, ready = self._open()
+        self._base_sha = base_sha
+        self._journal_ready = ready
+        self._journal_len = len(ops)
+        self._dirty = bool(ops)
+        text = raw.decode("utf-8")
+        if not ops:
+            yield from _iter_json_list(text, chunk_size)
+            return
+        docs = json.loads(text) if text.strip() else []
+        for op in ops:
+            _apply_journal_op(docs, op)
+        for i in range(0, len(docs), chunk_size):
+            yield docs[i:i + chunk_size]
+
+    def load(self) -> list:
+        return [doc for chunk in self.iter_load() for doc in chunk]
+
+    def record(self, op: dict):
+        self._ensure_writer()
+        self._queue.put(op)
+
+    def _ensure_writer(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._writer, name="macro-storage", daemon=True)
+                self._thread.start()
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.debounce
+            while batch[-1] is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            closing = batch[-1] is None
+            ops = [op for op in batch if op is not None]
+            try:
+                if ops:
+                    self._append(ops)
+                if closing or self._journal_len >= self.compact_every:
+                    self._compact()
+            except Exception as e:
+                self.last_error = e
+                if self.on_error is not None:
+                    self.on_error(e)
+            if closing:
+                return
+
+    def _append(self, ops: list):
+        self._dirty = True
+        lines = "".join(json.dumps(op, separators=(",", ":")) + "\n" for op in ops)
+        if not self._journal_ready:
+            header = json.dumps({"op": "base", "sha1": self._base_sha}) + "\n"
+            atomic_write(self.journal_path, (header + lines).encode("utf-8"))
+            self._journal_ready = True
+        else:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+        self._journal_len += len(ops)
+
+    def _compact(self):
+        if not self._dirty:
+            return
+        raw, _, ops, _ = self._open()
+        text = raw.decode("utf-8")
+        docs = json.loads(text) if text.strip() else []
+        for op in ops:
+            _apply_journal_op(docs, op)
+        raw = json.dumps(docs, indent=2).encode("utf-8")
+        atomic_write(self.path, raw)
+        self._base_sha = hashlib.sha1(raw).hexdigest()
+        header = json.dumps({"op": "base", "sha1": self._base_sha}) + "\n"
+        atomic_write(self.journal_path, header.encode("utf-8"))
+        self._journal_ready = True
+        self._journal_len = 0
+        self._dirty = False
+
+    def close(self, timeout: float = 5.0):
+        with self._thread_lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            if self._dirty:
+                self._compact()
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+
+DEFAULT_PROFILE = "default"
+PROFILE_CACHE = 4
+_PROFILE_NAME = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+def check_profile_name(name: str) -> str:
+    name = str(name).strip()
+    if not _PROFILE_NAME.fullmatch(name):
+        raise ValueError(f"invalid profile name '{name}' (use letters, digits, '-' and '_')")
+    return name
+
+def profile_path(macros_path: str, name: str) -> str:
+    if name == DEFAULT_PROFILE:
+        return macros_path
+    root, ext = os.path.splitext(macros_path)
+    return f"{root}.{name}{ext or '.json'}"
+
+def list_profiles(macros_path: str) -> list:
+    root, ext = os.path.splitext(macros_path)
+    ext = ext or ".json"
+    prefix = os.path.basename(root) + "."
+    names = {DEFAULT_PROFILE}
+    try:
+        entries = os.listdir(os.path.dirname(os.path.abspath(macros_path)))
+    except OSError:
+        entries = []
+    for entry in entries:
+        if entry.startswith(prefix) and entry.endswith(ext):
+            name = entry[len(prefix):-len(ext)]
+            if _PROFILE_NAME.fullmatch(name):
+                names.add(name)
+    return sorted(names)
+
+class ProfileSwitch:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+class MacroProfile:
+    def __init__(self, name: str, path: str, on_error=None):
+        self.name = name
+        self.path = path
+        self.storage = MacroStorage(path, on_error=on_error)
+        self.macros = []
+        self.index = {}
+        self.loaded = False
+        self.compiled = None
+
+    def load(self, chunk_size: int = 1000):
+        macros = []
+        index = {}
+        for docs in self.storage.iter_load(chunk_size):
+            for item in docs:
+                macro = Macro.from_dict(item)
+                macros.append(macro)
+                if macro.trigger_key is not None:
+                    index.setdefault(hotkey_index_key(macro.trigger_key), macro)
+        self.macros, self.index, self.loaded = macros, index, True
+
+    def close(self):
+        if self.loaded:
+            self.storage.close()
+
+class MetricsExporter:
+    def __init__(self, render, path: str = None, port: int = None, host: str = "127.0.0.1",
+                 interval: float = 5.0, on_error=None):
+        self.render = render
+        self.path = path
+        self.port = port
+        self.host = host
+        self.interval = max(0.1, interval)
+        self.on_error = on_error
+        self._stop = threading.Event()
+        self._threads = []
+        self._server = None
+
+    def start(self):
+        if self.port is not None:
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+            render = self.render
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                        self.send_error(404)
+                        return
+                    body = render().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass
+
+            self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+            self._server.daemon_threads = True
+            self.port = self._server.server_address[1]
+            self._spawn(self._server.serve_forever, "metrics-http")
+        if self.path is not None:
+            self._spawn(self._write_loop, "metrics-file")
+        return self
+
+    def _spawn(self, target, name: str):
+        t = threading.Thread(target=target, name=name, daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def write_file(self):
+        try:
+            atomic_write(self.path, self.render().encode("utf-8"))
+        except OSError as e:
+            if self.on_error is not None:
+                self.on_error(e)
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            self.write_file()
+        self.write_file()
+
+    def close(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        for t in self._threads:
+            t.join(timeout)
+
+DEFAULT_SETTINGS = {
+    "clicks_per_second": "1",
+    "trigger_key": "f3",
+    "stop_at": "0",
+    "mode": "press",
+    "button": "left",
+    "key_to_send": "",
+    "use_fixed": False,
+    "master_x": "",
+    "master_y": "",
+    "catch_up": False,
+    "burst": False,
+    "pattern": "",
+    "backend": "pyautogui",
+}
+
+def print_error(title: str, message: str, warning: bool = False):
+    print(f"{'warning' if warning else 'error'}: {title}: {message}", file=sys.stderr)
+
+class AutoClicker:
+    def __init__(self, macros_path: str = "macros.json", on_error=print_error, load_macros: bool = True,
+                 profile: str = DEFAULT_PROFILE, listen: bool = True):
+        self.macros_path = macros_path
+        self.on_error = on_error
+        self._clicks = ClickCounter()
+        self.status = StatusBus(status="idle", color="green")
+        self.stop_after_total = 0
+        self.master = ClickerChannel("master", trigger_key=keyboard.Key.f3)
+        self.channels = [self.master]
+        self._channel_index = {}
+        self._macro_index = {}
+        self._hotkeys = HotkeyMachine()
+        self._bindings_version = 0
+        self._profile_keys = {}
+        profile = check_profile_name(profile)
+        self.profile = MacroProfile(profile, profile_path(macros_path, profile), on_error=self._on_storage_error)
+        self._profiles = OrderedDict([(profile, self.profile)])
+        self._profile_lock = threading.Lock()
+        self._load_done = threading.Event()
+        self._load_done.set()
+        self._focus = None
+        self._profile_rules = []
+        self._rebuild_channel_index()
+        self._channel_scheduler = ChannelScheduler(self._fire_channel, on_error=self._on_channel_error)
+        self.backend = None
+        self.backend_name = PyAutoGUIBackend.name
+        self._backend_lock = threading.Lock()
+        self.macros = self.profile.macros
+        self._storage = self.profile.storage
+        self.metrics = EngineMetrics()
+        self._metrics_exporter = None
+        self._macro_executor = MacroExecutor(self._run_macro, on_start=self._on_macro_start,
+                                             on_error=self._on_macro_error)
+        self._watchers = None
+        self._recorder = None
+        self._record_stop_key = None
+        self._mouse_listener = None
+        if load_macros:
+            self._load_macros_from_disk()
+        self._listener = None
+        if listen:
+            self._listener = keyboard.Listener(
+                on_press=self._on_key_press,
+                on_release=self._on_key_release
+            )
+            self._listener.daemon = True
+            self._listener.start()
+
+    def _load_macros_from_disk(self):
+        for _ in self.iter_load_macros():
+            pass
+
+    def iter_load_macros(self, chunk_size: int = 1000):
+        self._load_done.clear()
+        try:
+            profile = self.profile
+            macros = self.macros = profile.macros = []
+            index = self._macro_index = {}
+            self._compile_hotkeys()
+            hotkeys = self._hotkeys
+            try:
+                for docs in profile.storage.iter_load(chunk_size):
+                    chunk = [Macro.from_dict(item) for item in docs]
+                    macros.extend(chunk)
+                    for macro in chunk:
+                        if macro.trigger_key is not None:
+                            key = hotkey_index_key(macro.trigger_key)
+                            if key not in index:
+                                index[key] = macro
+                                hotkeys.bind(key, macro)
+                    yield chunk
+            except Exception as e:
+                self.on_error("Load Error", f"Failed to load {profile.path}:\n{e}", True)
+                del macros[:]
+            profile.loaded = True
+            self._rebuild_macro_index()
+        finally:
+            self._load_done.set()
+
+    def _rebuild_macro_index(self):
+        index = {}
+        for macro in self.macros:
+            if macro.trigger_key is not None:
+                index.setdefault(hotkey_index_key(macro.trigger_key), macro)
+        self._macro_index = self.profile.index = index
+        self._compile_hotkeys()
+        self._sync_watchers()
+
+    def _compile_hotkeys(self):
+        profile = self.profile
+        compiled = profile.compiled
+        if compiled is not None and compiled[0] == self._bindings_version and compiled[1] is self._macro_index:
+            self._hotkeys.install(compiled[2])
+            return
+        channels = self._channel_index
+        switches = [(hotkey_index_key(key), ProfileSwitch(name)) for name, key in self._profile_keys.items()]
+        built = HotkeyMachine.build(
+            itertools.chain(self._macro_index.items(), channels.items(), switches),
+            [(key, channel) for key, channel in channels.items() if channel.mode == "press"])
+        profile.compiled = (self._bindings_version, self._macro_index, built)
+        self._hotkeys.install(built)
+
+    def activate_profile(self, name: str) -> bool:
+        name = check_profile_name(name)
+        self._load_done.wait()
+        with self._profile_lock:
+            if name == self.profile.name:
+                return True
+            profile = self._profiles.get(name)
+            if profile is None:
+                profile = MacroProfile(name, profile_path(self.macros_path, name), on_error=self._on_storage_error)
+                try:
+                    profile.load()
+                except Exception as e:
+                    self.status.publish(status=f"cannot load profile {name}: {e}", color="red")
+                    return False
+                self._profiles[name] = profile
+            self._profiles.move_to_end(name)
+            self.profile = profile
+            self.macros = profile.macros
+            self._storage = profile.storage
+            self._macro_index = profile.index
+            self._compile_hotkeys()
+            self._sync_watchers()
+            evicted = []
+            while len(self._profiles) > PROFILE_CACHE:
+                _, old = self._profiles.popitem(last=False)
+                evicted.append(old)
+        for old in evicted:
+            old.close()
+        self.status.publish(status=f"profile: {name}", color="green")
+        return True
+
+    def switch_profile(self, name: str):
+        threading.Thread(target=self.activate_profile, args=(name,), name="profile-switch", daemon=True).start()
+
+    @property
+    def profiles(self) -> list:
+        return sorted(set(list_profiles(self.macros_path)) | set(self._profiles))
+
+    def set_profile_keys(self, keys: dict):
+        parsed = {}
+        for name, text in (keys or {}).items():
+            key = parse_hotkey_string(str(text))
+            if key is not None and _PROFILE_NAME.fullmatch(str(name)):
+                parsed[str(name)] = key
+        current = self._profile_keys
+        if parsed.keys() == current.keys() and all(hotkey_index_key(key) == hotkey_index_key(current[name])
+                                                   for name, key in parsed.items()):
+            return
+        self._profile_keys = parsed
+        self._bindings_version += 1
+        self._compile_hotkeys()
+
+    def set_profile_rules(self, rules):
+        self._profile_rules = [(str(match).lower(), str(name)) for match, name in rules or ()
+                               if _PROFILE_NAME.fullmatch(str(name))]
+        if not self._profile_rules:
+            if self._focus is not None:
+                self._focus.close()
+                self._focus = None
+            return
+        if self._focus is None:
+            try:
+                from autoclicker_focus import FocusWatcher
+                self._focus = FocusWatcher(self._on_focus_change, on_error=self._on_focus_error)
+            except ImportError as e:
+                self.status.publish(status=f"focus switching unavailable: {e}", color="red")
+
+    def _on_focus_change(self, title: str):
+        title = title.lower()
+        for match, name in self._profile_rules:
+            if match in title:
+                self.activate_profile(name)
+                return
+
+    def _on_focus_error(self, error: Exception):
+        self.status.publish(status=f"focus switching failed, retrying: {error}", color="red")
+
+    def _sync_watchers(self):
+        if self._watchers is None:
+            if not any(m.watch for m in self.macros):
+                return
+            try:
+                from autoclicker_watchers import WatchManager
+            except ImportError as e:
+                self.status.publish(status=f"screen watchers unavailable: {e}", color="red")
+                return
+            self._watchers = WatchManager(self._macro_executor.submit, on_error=self._on_watch_error)
+        self._watchers.set_macros(self.macros)
+
+    def _on_watch_error(self, macro, error: Exception):
+        name = macro.name if macro is not None else "screen capture"
+        self.status.publish(status=f"watch {name}: {error}", color="red")
+
+    def _on_storage_error(self, error: Exception):
+        self.status.publish(status=f"save failed: {error}", color="red")
+
+    def add_macro(self, macro: Macro):
+        self.macros.append(macro)
+        self._rebuild_macro_index()
+        self._storage.record({"op": "add", "macro": macro.to_dict()})
+
+    def macro_changed(self, index: int):
+        self.macros[index].invalidate_timeline()
+        self._rebuild_macro_index()
+        self._storage.record({"op": "update", "index": index, "macro": self.macros[index].to_dict()})
+
+    def remove_macro(self, index: int):
+        del self.macros[index]
+        self._rebuild_macro_index()
+        self._storage.record({"op": "remove", "index": index})
+
+    def _on_key_press(self, key):
+        metrics = self.metrics
+        if metrics.enabled:
+            t0 = time.perf_counter_ns()
+            self._dispatch_key_press(key)
+            metrics.dispatch_pending.append(time.perf_counter_ns() - t0)
+        else:
+            self._dispatch_key_press(key)
+
+    def _dispatch_key_press(self, key):
+        recorder = self._recorder
+        if recorder is not None and recorder.active:
+            if key == self._record_stop_key:
+                self.stop_recording()
+            else:
+                recorder.on_key_down(key)
+            return
+        target = self._hotkeys.press(key)
+        if target is None:
+            return
+        if target.__class__ is Macro:
+            self._macro_executor.submit(target)
+        elif target.__class__ is ProfileSwitch:
+            self.switch_profile(target.name)
+        elif not target.active:
+            self.start_channel(target)
+        elif target.mode == "toggle":
+            self.stop_channel(target)
+
+    def _on_key_release(self, key):
+        recorder = self._recorder
+        if recorder is not None and recorder.active:
+            recorder.on_key_up(key)
+            self._hotkeys.release(key)
+            return
+        channel = self._hotkeys.release(key)
+        if channel is not None and channel.mode == "press":
+            self.stop_channel(channel)
+
+    def start_recording(self, stop_key=keyboard.Key.f9, capacity: int = 65536):
+        from pynput import mouse
+        if self._recorder is None or self._recorder.capacity < capacity:
+            self._recorder = InputRecorder(capacity)
+        self._record_stop_key = stop_key
+        self._recorder.start()
+        self._mouse_listener = mouse.Listener(on_move=self._recorder.on_move, on_click=self._recorder.on_click)
+        self._mouse_listener.daemon = True
+        self._mouse_listener.start()
+        self.status.publish(status=f"recording (press {hotkey_to_string(stop_key)} to stop)", color="red")
+
+    def stop_recording(self):
+        if self._recorder is None or not self._recorder.active:
+            return
+        self._recorder.stop()
+        if self._mouse_listener is not None:
+            self._mouse_listener.stop()
+            self._mouse_listener = None
+        self.status.publish(status="idle", color="green")
+
+    @property
+    def is_recording(self) -> bool:
+        return self._recorder is not None and self._recorder.active
+
+    def recorded_steps(self, exclude=None, **options):
+        if self._recorder is None:
+            return []
+        events = self._recorder.events()
+        if exclude is not None:
+            x0, y0, x1, y1 = exclude
+            events = [e for e in events if e[1] not in (REC_BUTTON_DOWN, REC_BUTTON_UP)
+                      or not (x0 <= e[3] < x1 and y0 <= e[4] < y1)]
+        return compress_recording(events, **options)
+
+    @property
+    def stop_after_total(self):
+        return self._clicks.limit
+
+    @stop_after_total.setter
+    def stop_after_total(self, value: int):
+        self._clicks.limit = value
+
+    @property
+    def is_clicking(self) -> bool:
+        return any(channel.active for channel in self.channels)
+
+    def _rebuild_channel_index(self):
+        index = {}
+        for channel in self.channels:
+            if channel.trigger_key is not None:
+                index.setdefault(hotkey_index_key(channel.trigger_key), channel)
+        self._channel_index = index
+        self._bindings_version += 1
+        self._compile_hotkeys()
+
+    def add_channel(self, channel: ClickerChannel):
+        self.channels.append(channel)
+        self._rebuild_channel_index()
+
+    def channel_changed(self, channel: ClickerChannel):
+        self.stop_channel(channel)
+        self._rebuild_channel_index()
+
+    def remove_channel(self, channel: ClickerChannel):
+        if channel is self.master:
+            raise ValueError("the master clicker cannot be removed")
+        self.stop_channel(channel)
+        self.channels.remove(channel)
+        self._rebuild_channel_index()
+
+    def start_channel(self, channel: ClickerChannel):
+        if not channel.active and self._prepare_channel(channel):
+            self.status.publish(status="clicking")
+            self._channel_scheduler.add(channel)
+
+    def _prepare_channel(self, channel: ClickerChannel, clock=time.perf_counter) -> bool:
+        if channel.active:
+            return False
+        if channel.button not in MOUSE_BUTTONS:
+            try:
+                key_name(channel.key_to_send)
+            except ValueError as e:
+                self.status.publish(status=f"{channel.name}: {e}", color="red")
+                return False
+        channel.stream = None
+        if channel.pattern:
+            try:
+                from autoclicker_patterns import PatternStream
+                channel.stream = PatternStream(normalize_pattern(channel.pattern), channel.clicks_per_second,
+                                               channel.x, channel.y)
+            except (ImportError, ValueError, KeyError, TypeError) as e:
+                self.status.publish(status=f"{channel.name} pattern: {e}", color="red")
+                return False
+            rate, per_tick = channel.clicks_per_second, 1
+        elif channel.burst:
+            rate, per_tick = burst_plan(channel.clicks_per_second)
+        else:
+            rate, per_tick = channel.clicks_per_second, 1
+        timer = DeadlineScheduler(rate, catch_up=channel.catch_up and channel.stream is None, per_tick=per_tick,
+                                  clock=clock)
+        timer.start()
+        channel.timer = timer
+        channel.per_tick = per_tick
+        channel.prev_sent = 0
+        channel.generation += 1
+        channel.active = True
+        return True
+
+    def stop_channel(self, channel: ClickerChannel):
+        if not channel.active:
+            return
+        channel.active = False
+        channel.generation += 1
+        if not self.is_clicking:
+            self.status.publish(status="idle")
+
+    def _fire_channel(self, channel: ClickerChannel, due: int) -> bool:
+        if not channel.active:
+            return False
+        if self.backend is None and not self._backend_ready():
+            self.stop_channel(channel)
+            return False
+        x, y = channel.x, channel.y
+        stream = channel.stream
+        if stream is not None:
+            click, x, y, interval = stream.next()
+            channel.timer.reschedule(interval, click)
+            if not click:
+                self.backend.move(x, y)
+                return True
+            due = 1
+        n = self._clicks.reserve(due * channel.per_tick)
+        if n <= 0:
+            self.stop_channel(channel)
+            return False
+        metrics = self.metrics
+        try:
+            if metrics.enabled:
+                t0 = time.perf_counter_ns()
+                self._send_channel(channel, n, x, y)
+                deadline = channel.timer.deadline
+                metrics.source(channel.name, deadlines=True).pending.append(
+                    (t0, time.perf_counter_ns(), channel.prev_sent, channel.prev_deadline, deadline))
+                channel.prev_sent, channel.prev_deadline = t0, deadline
+            else:
+                self._send_channel(channel, n, x, y)
+            self._clicks.add(n)
+        finally:
+            self._clicks.release()
+        return True
+
+    def set_backend(self, name: str):
+        with self._backend_lock:
+            if name == self.backend_name:
+                return
+            new_backend = make_backend(name)
+            old_backend = self.backend
+            self.backend = new_backend
+            self.backend_name = name
+        if old_backend is not None:
+            old_backend.close()
+
+    def _ensure_backend(self) -> InputBackend:
+        backend = self.backend
+        if backend is None:
+            with self._backend_lock:
+                if self.backend is None:
+                    self.backend = make_backend(self.backend_name)
+                backend = self.backend
+        return backend
+
+    def _on_macro_start(self, macro: Macro, queued_ns: int):
+        if self.metrics.enabled:
+            self.metrics.source(f"macro:{macro.name}").queued.append(queued_ns)
+
+    def _on_macro_error(self, macro: Macro, error: Exception):
+        self.status.publish(status=f"macro {macro.name} failed: {error}", color="red")
+
+    def _on_channel_error(self, channel: ClickerChannel, error: Exception):
+        self.stop_channel(channel)
+        self.status.publish(status=f"{channel.name} failed: {error}", color="red")
+
+    def metrics_text(self) -> str:
+        counters = {"clicks_total": self.total_clicks_sent}
+        for name, value in self._macro_executor.stats().items():
+            if isinstance(value, int) and name != "queued":
+                counters[f"macro_{name}_total"] = value
+        return prometheus_text(self.metrics.snapshot(), counters)
+
+    def start_metrics_export(self, path: str = None, port: int = None, interval: float = 5.0):
+        self.stop_metrics_export()
+        self.metrics.enabled = True
+        self._metrics_exporter = MetricsExporter(self.metrics_text, path=path, port=port, interval=interval,
+                                                 on_error=self._on_metrics_error).start()
+        return self._metrics_exporter
+
+    def _on_metrics_error(self, error: Exception):
+        self.status.publish(status=f"metrics export failed: {error}", color="red")
+
+    def stop_metrics_export(self):
+        exporter = self._metrics_exporter
+        self._metrics_exporter = None
+        if exporter is not None:
+            exporter.close()
+
+    def _backend_ready(self) -> bool:
+        try:
+            self._ensure_backend()
+        except Exception as e:
+            self.status.publish(status=f"backend error: {e}", color="red")
+            return False
+        return True
+
+    def _send_channel(self, channel: ClickerChannel, count: int = 1, x=None, y=None):
+        if channel.button in MOUSE_BUTTONS:
+            if x is not None and y is not None:
+                self.backend.click(channel.button, x, y, count)
+            else:
+                self.backend.click(channel.button, count=count)
+        elif channel.key_to_send:
+            self.backend.press(channel.key_to_send, count)
+
+    def _run_macro(self, macro: Macro, cancel: threading.Event = None):
+        if not self._backend_ready():
+            return
+        if cancel is None:
+            cancel = threading.Event()
+        try:
+            timeline = macro.timeline()
+        except (TypeError, ValueError, KeyError) as e:
+            self.status.publish(status=f"macro {macro.name}: {e}", color="red")
+            return
+        if macro.start_delay > 0:
+            self.status.publish(status=f"delaying {macro.name}", color="orange")
+            if cancel.wait(macro.start_delay):
+                return
+        self.status.publish(status=f"macro: {macro.name}", color="orange")
+        metrics = self.metrics.source(f"macro:{macro.name}") if self.metrics.enabled else None
+        self._play_timeline(timeline, cancel, metrics)
+        if self.is_clicking:
+            self.status.publish(status="clicking", color="red")
+        else:
+            self.status.publish(status="idle", color="green")
+
+    def _play_timeline(self, timeline, cancel: threading.Event, metrics: SourceMetrics = None):
+        backend = self.backend
+        held = []
+        held_buttons = []
+        start = time.perf_counter()
+        pending = metrics.pending if metrics is not None else None
+        prev_sent = prev_offset = 0
+        try:
+            for offset, kind, target, x, y, count in timeline:
+                if not wait_until(start + offset, cancel):
+                    break
+                if kind == "click" or kind == "press":
+                    n = self._clicks.reserve(count)
+                    if n <= 0:
+                        break
+                    if pending is not None:
+                        t0 = time.perf_counter_ns()
+                    if kind == "click":
+                        backend.click(target, x, y, n)
+                    else:
+                        backend.press(target, n)
+                    if pending is not None:
+                        pending.append((t0, time.perf_counter_ns(), prev_sent, prev_offset, offset))
+                        prev_sent, prev_offset = t0, offset
+                    self._clicks.add(n)
+                else:
+                    self._apply_step(backend, kind, target, x, y, held, held_buttons)
+        finally:
+            self._clicks.release()
+            self._release_held(backend, held, held_buttons)
+
+    @staticmethod
+    def _apply_step(backend: InputBackend, kind: str, target, x, y, held: list, held_buttons: list):
+        if kind == "move":
+            backend.move(x, y)
+        elif kind == "mouse_down":
+            backend.mouse_down(target, x, y)
+            held_buttons.append(target)
+        elif kind == "mouse_up":
+            backend.mouse_up(target, x, y)
+            if target in held_buttons:
+                held_buttons.remove(target)
+        elif kind == "key_down":
+            backend.key_down(target)
+            held.append(target)
+        elif kind == "key_up":
+            backend.key_up(target)
+            if target in held:
+                held.remove(target)
+        elif kind == "type":
+            backend.type_text(target)
+
+    @staticmethod
+    def _release_held(backend: InputBackend, held: list, held_buttons: list):
+        for key in reversed(held):
+            backend.key_up(key)
+        for button in reversed(held_buttons):
+            backend.mouse_up(button)
+
+    def apply_settings(self, settings: dict):
+        master = self.master
+        bindings = (hotkey_index_key(master.trigger_key), master.mode)
+        try:
+            cps = float(settings["clicks_per_second"])
+            if cps <= 0:
+                cps = 0.01
+        except (TypeError, ValueError):
+            cps = 0.01
+        master.clicks_per_second = cps
+        desired = str(settings["trigger_key"]).strip()
+        pk = parse_hotkey_string(desired)
+        if pk:
+            master.trigger_key = pk
+        try:
+            sa = int(settings["stop_at"])
+            if sa < 0:
+                sa = 0
+        except (TypeError, ValueError):
+            sa = 0
+        self.stop_after_total = sa
+        master.mode = settings["mode"] if settings["mode"] in CHANNEL_MODES else "press"
+        sel = settings["button"]
+        if sel in CHANNEL_BUTTONS:
+            master.button = sel
+        else:
+            master.button = "left"
+        master.key_to_send = str(settings["key_to_send"]).strip().lower()
+        master.x = master.y = None
+        if bool(settings["use_fixed"]):
+            try:
+                master.x = int(settings["master_x"])
+                master.y = int(settings["master_y"])
+            except (TypeError, ValueError):
+                master.x = master.y = None
+        master.catch_up = bool(settings["catch_up"])
+        master.burst = bool(settings["burst"])
+        pattern = settings.get("pattern") or None
+        try:
+            master.pattern = parse_pattern_text(pattern) if isinstance(pattern, str) else pattern
+        except ValueError:
+            master.pattern = None
+        if "channels" in settings:
+            for channel in self.channels[1:]:
+                self.stop_channel(channel)
+            self.channels = [master] + [ClickerChannel.from_dict(d) for d in settings["channels"]]
+        if "profile_keys" in settings:
+            self.set_profile_keys(settings["profile_keys"])
+        if "channels" in settings or bindings != (hotkey_index_key(master.trigger_key), master.mode):
+            self._rebuild_channel_index()
+        if "profile_rules" in settings:
+            self.set_profile_rules(settings["profile_rules"])
+        self.set_backend(settings["backend"])
+
+    def stop_all_channels(self):
+        for channel in self.channels:
+            self.stop_channel(channel)
+
+    def stop_immediately(self):
+        self._hotkeys.reset()
+        self.stop_all_channels()
+        self._clicks.reset()
+        self.status.publish(status="idle", color="green")
+
+    def shutdown(self):
+        self.stop_all_channels()
+        self._channel_scheduler.close()
+        self.stop_metrics_export()
+        if self._watchers is not None:
+            self._watchers.close()
+        if self._focus is not None:
+            self._focus.close()
+        self._clicks.reset()
+        self.stop_recording()
+        if self._listener:
+            self._listener.stop()
+        self._macro_executor.shutdown()
+        if self.backend is not None:
+            self.backend.close()
+        with self._profile_lock:
+            profiles = list(self._profiles.values())
+        for profile in profiles:
+            profile.close()
+
+    @property
+    def total_clicks_sent(self):
+        return self._clicks.value
+
+    @property
+    def master_stats(self):
+        return self.master.stats()
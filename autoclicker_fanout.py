@@ -0,0 +1,357 @@
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import time
+
+REPORT_INTERVAL = 1.0
+WORKER_POLL = 0.05
+JOIN_TIMEOUT = 5.0
+FLAG_SETTINGS = {"cps": "clicks_per_second", "stop_at": "stop_at", "backend": "backend"}
+
+def _report(clicker, started: float, status) -> dict:
+    return {
+        "clicks": clicker.total_clicks_sent,
+        "elapsed": time.perf_counter() - started,
+        "status": status,
+        "executor": clicker._macro_executor.stats(),
+        "master": clicker.master_stats,
+        "histograms": clicker.metrics.histograms(),
+    }
+
+def _idle(clicker, macros) -> bool:
+    executor = clicker._macro_executor
+    return not any(executor.is_running(m) for m in macros) and not any(c.active for c in clicker.channels)
+
+def run_worker(index: int, display: str, macros_path: str, profile: str, settings: dict, macro_names,
+               start_master: bool, listen: bool, until_idle: bool, duration, interval: float, results, stop):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ["DISPLAY"] = display
+
+    def on_error(title: str, message: str, warning: bool = False):
+        results.put(("warning" if warning else "error", index, f"{title}: {message}"))
+
+    try:
+        from autoclicker_core import DEFAULT_SETTINGS, AutoClicker
+        clicker = AutoClicker(macros_path=macros_path, on_error=on_error, profile=profile, listen=listen)
+    except Exception as e:
+        results.put(("failed", index, f"cannot start on display {display}: {e}"))
+        return
+    report = None
+    try:
+        clicker.metrics.enabled = True
+        try:
+            clicker.apply_settings(dict(DEFAULT_SETTINGS, **settings))
+        except Exception as e:
+            results.put(("failed", index, f"cannot use input backend '{settings.get('backend')}': {e}"))
+            return
+        by_name = {m.name: m for m in clicker.macros}
+        macros = [by_name[name] for name in macro_names if name in by_name]
+        results.put(("ready", index, {"macros": len(clicker.macros), "backend": clicker.backend_name,
+                                      "profile": clicker.profile.name}))
+        started = time.perf_counter()
+        for macro in macros:
+            clicker._macro_executor.submit(macro)
+        if start_master:
+            clicker.start_channel(clicker.master)
+        status = None
+        next_report = started + interval
+        end = None if duration is None else started + duration
+        while not stop.wait(WORKER_POLL):
+            fields = clicker.status.take()
+            if fields is not None:
+                status = fields["status"]
+            if until_idle and _idle(clicker, macros):
+                break
+            now = time.perf_counter()
+            if end is not None and now >= end:
+                break
+            if now >= next_report:
+                results.put(("report", index, _report(clicker, started, status)))
+                next_report = now + interval
+        clicker.stop_all_channels()
+        clicker._macro_executor.cancel_all()
+        report = _report(clicker, started, status)
+    except Exception as e:
+        results.put(("failed", index, f"{type(e).__name__}: {e}"))
+    finally:
+        clicker.shutdown()
+    if report is not None:
+        results.put(("done", index, report))
+
+class WorkerState:
+    def __init__(self, display: str, macros, settings: dict = None):
+        self.display = display
+        self.macros = list(macros)
+        self.settings = dict(settings or {})
+        self.state = "starting"
+        self.error = None
+        self.info = {}
+        self.report = None
+        self.process = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed")
+
+    def to_dict(self) -> dict:
+        report = self.report or {}
+        clicks = report.get("clicks", 0)
+        elapsed = report.get("elapsed", 0.0)
+        return {
+            "display": self.display,
+            "state": self.state,
+            "error": self.error,
+            "macros": self.macros,
+            "clicks": clicks,
+            "elapsed": elapsed,
+            "rate": clicks / elapsed if elapsed > 0 else 0.0,
+            "status": report.get("status"),
+            "master": report.get("master"),
+            "executor": report.get("executor"),
+        }
+
+class FanoutController:
+    def __init__(self, targets, macros_path: str = "macros.json", profile: str = "default", settings: dict = None,
+                 start_master: bool = False, listen: bool = False, duration: float = None,
+                 interval: float = REPORT_INTERVAL, on_event=None):
+        self.workers = [WorkerState(*target) for target in targets]
+        if not self.workers:
+            raise ValueError("give at least one display")
+        self.macros_path = macros_path
+        self.profile = profile
+        self.settings = dict(settings or {})
+        self.start_master = start_master
+        self.listen = listen
+        self.duration = duration
+        self.interval = max(WORKER_POLL, interval)
+        self.on_event = on_event
+        self.started = None
+        self._results = None
+        self._stop = None
+
+    def _check_macros(self):
+        from autoclicker_core import MacroProfile, check_profile_name, profile_path
+        name = check_profile_name(self.profile)
+        profile = MacroProfile(name, profile_path(self.macros_path, name))
+        profile.load()
+        profile.close()
+        names = {m.name for m in profile.macros}
+        for worker in self.workers:
+            for macro in worker.macros:
+                if macro not in names:
+                    raise ValueError(f"no macro named '{macro}' in {profile.path}")
+
+    def start(self):
+        self._check_macros()
+        ctx = multiprocessing.get_context("spawn")
+        self._results = ctx.Queue()
+        self._stop = ctx.Event()
+        until_idle = not self.listen
+        for index, worker in enumerate(self.workers):
+            settings = dict(self.settings, **worker.settings)
+            worker.process = ctx.Process(
+                target=run_worker, name=f"autoclicker-{index} {worker.display}", daemon=True,
+                args=(index, worker.display, self.macros_path, self.profile, settings, worker.macros, self.start_master,
+                      self.listen, until_idle, self.duration, self.interval, self._results, self._stop))
+            worker.process.start()
+        self.started = time.perf_counter()
+        return self
+
+    @property
+    def running(self) -> bool:
+        return any(not w.finished for w in self.workers)
+
+    def poll(self, timeout: float = WORKER_POLL) -> bool:
+        try:
+            kind, index, payload = self._results.get(timeout=timeout)
+        except queue.Empty:
+            for worker in self.workers:
+                if not worker.finished and worker.process is not None and not worker.process.is_alive():
+                    self._handle("failed", worker, f"worker exited with code {worker.process.exitcode}")
+            return False
+        self._handle(kind, self.workers[index], payload)
+        return True
+
+    def _handle(self, kind: str, worker: WorkerState, payload):
+        if kind == "ready":
+            worker.state = "running"
+            worker.info = payload
+        elif kind in ("report", "done"):
+            worker.report = payload
+            if kind == "done":
+                worker.state = "done"
+        elif kind == "failed":
+            worker.state = "failed"
+            worker.error = payload
+        if self.on_event is not None:
+            self.on_event(kind, worker, payload)
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+
+    def join(self, timeout: float = JOIN_TIMEOUT):
+        deadline = time.perf_counter() + timeout
+        while self.running and time.perf_counter() < deadline:
+            self.poll()
+        for worker in self.workers:
+            process = worker.process
+            if process is None:
+                continue
+            process.join(max(0.0, deadline - time.perf_counter()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            if not worker.finished:
+                self._handle("failed", worker, f"worker did not stop (exit code {process.exitcode})")
+
+    def snapshot(self) -> dict:
+        from autoclicker_core import merge_histograms
+        workers = [w.to_dict() for w in self.workers]
+        clicks = sum(w["clicks"] for w in workers)
+        elapsed = max((w["elapsed"] for w in workers), default=0.0)
+        reports = [w.report["histograms"] for w in self.workers if w.report is not None]
+        return {
+            "displays": workers,
+            "running": sum(1 for w in self.workers if w.state == "running"),
+            "failed": sum(1 for w in self.workers if w.state == "failed"),
+            "clicks": clicks,
+            "elapsed": elapsed,
+            "rate": clicks / elapsed if elapsed > 0 else 0.0,
+            "metrics": merge_histograms(reports),
+        }
+
+    def metrics_text(self) -> str:
+        from autoclicker_core import prometheus_text
+        snap = self.snapshot()
+        counters = {"clicks_total": snap["clicks"], "workers_failed_total": snap["failed"]}
+        return prometheus_text(snap["metrics"], counters)
+
+def parse_target(text: str):
+    display, _, macros = text.partition("=")
+    display = display.strip()
+    if not display:
+        raise ValueError(f"missing display in '{text}'")
+    return display, [name.strip() for name in macros.split(",") if name.strip()]
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Run one autoclicker worker process per X display and add up what they send.")
+    parser.add_argument("--display", action="append", default=[], metavar="DISPLAY[=MACRO,...]",
+                        help="X display to drive, e.g. :1 or :2=farm,fish to also run those macros there "
+                             "(repeatable)")
+    parser.add_argument("--run", action="append", default=[], metavar="MACRO",
+                        help="run this macro on every display (repeatable)")
+    parser.add_argument("--macros", default="macros.json", help="shared macro file (default: macros.json)")
+    parser.add_argument("--profile", default="default", help="macro profile every worker loads")
+    parser.add_argument("--config", help="JSON file with master clicker settings, as for autoclicker_headless; "
+                             "an optional \"displays\" object maps a display to its own settings and "
+                             "\"macros\" list")
+    parser.add_argument("--cps", help="master clicks per second")
+    parser.add_argument("--stop-at", help="total-click cap per display (0 = no automatic stop)")
+    parser.add_argument("--backend", help="input backend each worker opens on its display")
+    parser.add_argument("--start", action="store_true", help="start the master clicker on every display")
+    parser.add_argument("--listen", action="store_true", help="also listen for hotkeys on every display")
+    parser.add_argument("--duration", type=float, help="stop each worker this many seconds after it is ready")
+    parser.add_argument("--interval", type=float, default=REPORT_INTERVAL, help="seconds between worker reports")
+    parser.add_argument("--quiet", action="store_true", help="only print the final summary")
+    parser.add_argument("--json", action="store_true", help="print the final summary as JSON")
+    parser.add_argument("--metrics-port", type=int, help="serve combined Prometheus metrics on 127.0.0.1:PORT")
+    parser.add_argument("--metrics-file", help="write combined Prometheus metrics to this file")
+    return parser
+
+def load_targets(args):
+    settings = {}
+    displays = {}
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            settings.update(json.load(f))
+        displays = settings.pop("displays", None) or {}
+    for flag, name in FLAG_SETTINGS.items():
+        value = getattr(args, flag)
+        if value is not None:
+            settings[name] = value
+    targets = [parse_target(text) for text in args.display]
+    if not targets:
+        targets = [(display, []) for display in displays]
+    result = []
+    for display, macros in targets:
+        extra = dict(displays.get(display) or {})
+        macros = list(args.run) + list(extra.pop("macros", [])) + macros
+        result.append((display, list(dict.fromkeys(macros)), dict(settings, **extra)))
+    return result
+
+def print_event(kind: str, worker: WorkerState, payload):
+    if kind == "ready":
+        print(f"{worker.display}: {payload['macros']} macros (profile {payload['profile']}), "
+              f"backend {payload['backend']}")
+    elif kind == "done":
+        print(f"{worker.display}: done, {payload['clicks']} clicks in {payload['elapsed']:.2f} s")
+    elif kind in ("failed", "error", "warning"):
+        print(f"{worker.display}: {kind}: {payload}", file=sys.stderr)
+
+def print_summary(snap: dict):
+    print(f"{'display':>12} {'state':>8} {'clicks':>10} {'seconds':>9} {'clicks/s':>10} {'master cps':>11} "
+          f"{'max late ms':>12}")
+    for w in snap["displays"]:
+        master = w["master"] or {}
+        print(f"{w['display']:>12} {w['state']:>8} {w['clicks']:>10} {w['elapsed']:>9.2f} {w['rate']:>10.1f} "
+              f"{master.get('achieved_cps', 0.0):>11.1f} {master.get('max_late_ms', 0.0):>12.2f}")
+    print(f"{'total':>12} {len(snap['displays']) - snap['failed']:>8} {snap['clicks']:>10} "
+          f"{snap['elapsed']:>9.2f} {snap['rate']:>10.1f}")
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        targets = load_targets(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if not targets:
+        print("error: give at least one --display (or a \"displays\" object in --config)", file=sys.stderr)
+        return 2
+    os.environ.setdefault("DISPLAY", targets[0][0])
+    quiet = args.quiet or args.json
+    try:
+        fanout = FanoutController(targets, macros_path=args.macros, profile=args.profile, start_master=args.start,
+                                  listen=args.listen, duration=args.duration, interval=args.interval,
+                                  on_event=None if quiet else print_event).start()
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    exporter = None
+    if args.metrics_port is not None or args.metrics_file:
+        from autoclicker_core import MetricsExporter
+        try:
+            exporter = MetricsExporter(fanout.metrics_text, path=args.metrics_file, port=args.metrics_port,
+                                       interval=args.interval).start()
+        except OSError as e:
+            print(f"error: cannot start metrics export: {e}", file=sys.stderr)
+    stopping = []
+    signal.signal(signal.SIGINT, lambda *_: stopping.append(True))
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    next_line = fanout.started + args.interval
+    while fanout.running and not stopping:
+        fanout.poll()
+        if not quiet and time.perf_counter() >= next_line:
+            snap = fanout.snapshot()
+            print(f"{snap['running']}/{len(snap['displays'])} displays running, {snap['clicks']} clicks, "
+                  f"{snap['rate']:.0f} clicks/s")
+            next_line = time.perf_counter() + args.interval
+    fanout.stop()
+    fanout.join()
+    if exporter is not None:
+        exporter.close()
+    snap = fanout.snapshot()
+    if args.json:
+        print(json.dumps(snap, indent=2))
+    else:
+        print_summary(snap)
+    return 1 if snap["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+import shutil
+import subprocess
+import sys
+import threading
+
+FOCUS_INTERVAL = 0.5
+COMMAND_TIMEOUT = 2.0
+ERROR_BACKOFF = 5.0
+
+def _windows_title():
+    import ctypes
+    user32 = ctypes.windll.user32
+    hwnd = user32.GetForegroundWindow()
+    length = user32.GetWindowTextLengthW(hwnd)
+    buf = ctypes.create_unicode_buffer(length + 1)
+    user32.GetWindowTextW(hwnd, buf, length + 1)
+    return buf.value
+
+def _command_title(command):
+    out = subprocess.run(command, capture_output=True, text=True, timeout=COMMAND_TIMEOUT)
+    if out.returncode != 0:
+        return ""
+    return out.stdout.strip()
+
+def focus_reader():
+    if sys.platform == "win32":
+        return _windows_title
+    if sys.platform == "darwin":
+        command = ["osascript", "-e", "tell application \"System Events\" to get name of first application "
+                                      "process whose frontmost is true"]
+    else:
+        if shutil.which("xdotool") is None:
+            raise ImportError("xdotool is needed to read the focused window")
+        command = ["xdotool", "getactivewindow", "getwindowname"]
+    return lambda: _command_title(command)
+
+class FocusWatcher:
+    def __init__(self, on_change, interval: float = FOCUS_INTERVAL, reader=None, on_error=None):
+        self._read = reader or focus_reader()
+        self._on_change = on_change
+        self._on_error = on_error
+        self.interval = interval
+        self.title = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="focus-watcher", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        failing = False
+        while not self._stop.is_set():
+            try:
+                title = self._read()
+            except Exception as e:
+                if not failing and self._on_error is not None:
+                    self._on_error(e)
+                failing = True
+                self._stop.wait(ERROR_BACKOFF)
+                continue
+            failing = False
+            if title != self.title:
+                self.title = title
+                self._on_change(title)
+            self._stop.wait(self.interval)
+
+    def close(self, timeout: float = 2.0):
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
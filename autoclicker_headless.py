@@ -0,0 +1,133 @@
+import argparse
+import json
+import signal
+import sys
+import threading
+
+from autoclicker_core import (
+    AutoClicker, DEFAULT_PROFILE, DEFAULT_SETTINGS, INPUT_BACKENDS, check_profile_name, parse_pattern_text,
+)
+
+FLAG_SETTINGS = {
+    "cps": "clicks_per_second",
+    "trigger": "trigger_key",
+    "stop_at": "stop_at",
+    "mode": "mode",
+    "button": "button",
+    "key": "key_to_send",
+    "x": "master_x",
+    "y": "master_y",
+    "pattern": "pattern",
+    "backend": "backend",
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Run the autoclicker without a GUI: load macros, register hotkeys and click.")
+    parser.add_argument("--macros", default="macros.json", help="macro file to load (default: macros.json)")
+    parser.add_argument("--config", help="JSON file with master clicker settings (same keys as DEFAULT_SETTINGS), "
+                             "plus an optional \"channels\" list of extra clickers, \"profile_keys\" "
+                             "({\"work\": \"ctrl+alt+1\"}) and \"profile_rules\" ([[\"window title\", \"work\"]])")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE,
+                        help="macro profile to start with; other profiles are loaded when switched to")
+    parser.add_argument("--cps", help="master clicks per second")
+    parser.add_argument("--trigger", help="master trigger key, e.g. f3")
+    parser.add_argument("--stop-at", help="total-click cap (0 = no automatic stop)")
+    parser.add_argument("--mode", choices=("press", "toggle"))
+    parser.add_argument("--button", choices=("left", "middle", "right", "key"))
+    parser.add_argument("--key", help="key to send when --button key")
+    parser.add_argument("--x", help="fixed X coordinate for the master clicker")
+    parser.add_argument("--y", help="fixed Y coordinate for the master clicker")
+    parser.add_argument("--pattern", help="humanized pattern for the master, e.g. 'timing normal 0.15 jitter 3'")
+    parser.add_argument("--backend", choices=list(INPUT_BACKENDS))
+    parser.add_argument("--catch-up", action="store_true", default=None, help="send missed clicks back to back")
+    parser.add_argument("--burst", action="store_true", default=None, help="group clicks per scheduler tick")
+    parser.add_argument("--start", action="store_true", help="start the master clicker immediately")
+    parser.add_argument("--quiet", action="store_true", help="do not print status changes")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on 127.0.0.1:PORT/metrics")
+    parser.add_argument("--metrics-file", help="write Prometheus metrics to this file (textfile collector)")
+    parser.add_argument("--metrics-interval", type=float, default=5.0, help="seconds between metrics file writes")
+    return parser
+
+def load_settings(args):
+    settings = dict(DEFAULT_SETTINGS)
+    if args.config:
+        with open(args.config, "r", encoding="utf-8") as f:
+            config = json.load(f)
+        if not isinstance(config, dict):
+            raise ValueError("expected a JSON object of settings at the top level")
+        settings.update(config)
+    for flag, name in FLAG_SETTINGS.items():
+        value = getattr(args, flag)
+        if value is not None:
+            settings[name] = value
+    if args.x is not None and args.y is not None:
+        settings["use_fixed"] = True
+    if args.catch_up is not None:
+        settings["catch_up"] = True
+    if args.burst is not None:
+        settings["burst"] = True
+    return settings
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        settings = load_settings(args)
+    except (OSError, ValueError) as e:
+        print(f"error: cannot read config {args.config}: {e}", file=sys.stderr)
+        return 2
+    if isinstance(settings.get("pattern"), str):
+        try:
+            parse_pattern_text(settings["pattern"])
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+    try:
+        check_profile_name(args.profile)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    clicker = AutoClicker(macros_path=args.macros, profile=args.profile)
+    try:
+        clicker.apply_settings(dict(settings, backend=clicker.backend_name))
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        print(f"error: invalid settings: {e}", file=sys.stderr)
+        clicker.shutdown()
+        return 2
+    try:
+        clicker.set_backend(settings["backend"])
+    except Exception as e:
+        print(f"error: cannot use input backend '{settings['backend']}': {e}", file=sys.stderr)
+        clicker.shutdown()
+        return 2
+    if args.metrics_port is not None or args.metrics_file:
+        try:
+            exporter = clicker.start_metrics_export(path=args.metrics_file, port=args.metrics_port,
+                                                    interval=args.metrics_interval)
+        except OSError as e:
+            print(f"error: cannot start metrics export: {e}", file=sys.stderr)
+            clicker.shutdown()
+            return 2
+        if not args.quiet and exporter.port is not None:
+            print(f"metrics on http://{exporter.host}:{exporter.port}/metrics")
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    if not args.quiet:
+        print(f"loaded {len(clicker.macros)} macros from {clicker.profile.path} (profile {clicker.profile.name}); "
+              f"master trigger {settings['trigger_key']} ({clicker.master.mode}), backend {clicker.backend_name}")
+        for channel in clicker.channels[1:]:
+            print(f"clicker {channel.display_name()}")
+    if args.start:
+        clicker.start_channel(clicker.master)
+    while not stop.wait(0.25):
+        fields = clicker.status.take()
+        if fields is not None and not args.quiet:
+            print(f"status: {fields['status']}  total sent: {clicker.total_clicks_sent}")
+    if not args.quiet:
+        print(f"stopping; total sent: {clicker.total_clicks_sent}")
+    clicker.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import numpy as np
+
+BATCH_EVENTS = 1024
+MIN_INTERVAL_SHARE = 0.05
+GLIDE_SHARE = 0.5
+
+class PatternStream:
+    def __init__(self, pattern: dict, clicks_per_second: float, x=None, y=None):
+        self.pattern = pattern
+        self.period = 1.0 / clicks_per_second
+        self.origin = None if x is None or y is None else np.array([x, y], float)
+        self.positional = pattern["path"] is not None or self.origin is not None
+        self.rng = np.random.default_rng(pattern["seed"])
+        self._events = []
+        self._i = 0
+        self._carry = self.targets(1)[0] if self.positional else None
+
+    def intervals(self, n: int):
+        rng = self.rng
+        timing = self.pattern["timing"]
+        spread = self.pattern["spread"]
+        if timing == "uniform":
+            share = rng.uniform(1.0 - spread, 1.0 + spread, n)
+        elif timing == "normal":
+            share = rng.normal(1.0, spread, n)
+        elif timing == "lognormal":
+            share = rng.lognormal(-spread * spread / 2.0, spread, n)
+        else:
+            share = np.ones(n)
+        return np.maximum(share, MIN_INTERVAL_SHARE) * self.period
+
+    def targets(self, n: int):
+        rng = self.rng
+        pattern = self.pattern
+        if pattern["path"] is not None:
+            points = np.array(pattern["path"], float)
+            segments = np.diff(points, axis=0)
+            lengths = np.hypot(segments[:, 0], segments[:, 1])
+            ends = np.concatenate(([0.0], np.cumsum(lengths)))
+            s = rng.uniform(0.0, ends[-1], n)
+            i = np.minimum(np.searchsorted(ends, s, side="right") - 1, len(segments) - 1)
+            t = (s - ends[i]) / np.where(lengths[i] > 0.0, lengths[i], 1.0)
+            xy = points[i] + segments[i] * t[:, None]
+        else:
+            xy = np.repeat(self.origin[None, :], n, axis=0)
+            if pattern["area"] is not None:
+                xy += rng.uniform(-0.5, 0.5, (n, 2)) * pattern["area"]
+        if pattern["jitter"]:
+            xy += rng.normal(0.0, pattern["jitter"], (n, 2))
+        return np.rint(xy)
+
+    def _refill(self):
+        steps = self.pattern["glide"] if self.positional else 0
+        n = max(16, BATCH_EVENTS // (steps + 1))
+        intervals = self.intervals(n)
+        if not self.positional:
+            self._events = [(True, None, None, dt) for dt in intervals.tolist()]
+            return
+        targets = self.targets(n)
+        start = np.vstack((self._carry[None, :], targets[:-1]))
+        self._carry = targets[-1]
+        clicks = np.zeros((n, steps + 1), bool)
+        clicks[:, 0] = True
+        xy = np.empty((n, steps + 1, 2))
+        xy[:, 0] = start
+        dts = np.empty((n, steps + 1))
+        if steps:
+            t = np.arange(1, steps + 1) / steps
+            t = (t * t * (3.0 - 2.0 * t))[None, :, None]
+            delta = targets - start
+            bend = self.rng.normal(0.0, self.pattern["curve"], n)[:, None]
+            control = (start + targets) / 2.0 + np.stack((-delta[:, 1], delta[:, 0]), axis=1) * bend
+            xy[:, 1:] = np.rint((1.0 - t) ** 2 * start[:, None] + 2.0 * (1.0 - t) * t * control[:, None]
+                                + t * t * targets[:, None])
+            dts[:, 0] = intervals * (1.0 - GLIDE_SHARE)
+            dts[:, 1:] = (intervals * (GLIDE_SHARE / steps))[:, None]
+        else:
+            dts[:, 0] = intervals
+        xy = xy.astype(np.int64)
+        self._events = list(zip(clicks.ravel().tolist(), xy[..., 0].ravel().tolist(),
+                                xy[..., 1].ravel().tolist(), dts.ravel().tolist()))
+
+    def next(self):
+        i = self._i
+        if i >= len(self._events):
+            self._refill()
+            i = 0
+        self._i = i + 1
+        return self._events[i]
+
+    def take(self, n: int):
+        return [self.next() for _ in range(n)]
@@ -0,0 +1,499 @@
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+import queue
+import sys
+
+from autoclicker_core import (
+    DEFAULT_PROFILE, DEFAULT_SETTINGS, AutoClicker, MacroExecutor, MacroProfile, RecordingBackend, RepeatedAction,
+    check_profile_name, profile_path,
+)
+
+COUNTED_KINDS = ("click", "press")
+TRACE_LIMIT = 1000000
+
+class VirtualClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+class _MacroRun:
+    __slots__ = ("macro", "cancel", "timeline", "start", "rank", "index", "held", "held_buttons", "sent", "playing",
+                 "done")
+
+    def __init__(self, macro, cancel, timeline, start: float, rank: int):
+        self.macro = macro
+        self.cancel = cancel
+        self.timeline = timeline
+        self.start = start
+        self.rank = rank
+        self.index = 0
+        self.held = []
+        self.held_buttons = []
+        self.sent = 0
+        self.playing = False
+        self.done = False
+
+    def next_time(self) -> float:
+        timeline = self.timeline
+        if timeline.__class__ is RepeatedAction:
+            return self.start + self.index * timeline.spacing
+        return self.start + timeline[self.index][0]
+
+    def remaining(self) -> int:
+        return len(self.timeline) - self.index
+
+    def end_time(self) -> float:
+        timeline = self.timeline
+        if timeline.__class__ is RepeatedAction:
+            return self.start + (timeline.entries - 1) * timeline.spacing
+        return self.start + timeline[-1][0]
+
+class _ChannelRun:
+    __slots__ = ("channel", "generation", "rank")
+
+    def __init__(self, channel, generation: int, rank: int):
+        self.channel = channel
+        self.generation = generation
+        self.rank = rank
+
+class Simulation:
+    def __init__(self, settings: dict = None, macros=(), trace: bool = True, max_events: int = 0):
+        self.clock = VirtualClock()
+        self.clicker = AutoClicker(macros_path=os.devnull, load_macros=False, listen=False)
+        self.clicker._macro_executor.shutdown()
+        self.executor = self.clicker._macro_executor = MacroExecutor(None, workers=0)
+        if settings is not None:
+            settings = {**DEFAULT_SETTINGS, **settings, "backend": RecordingBackend.name}
+            settings.pop("profile_rules", None)
+            self.clicker.apply_settings(settings)
+        self.backend = self.clicker.backend = RecordingBackend(max_events=max_events, clock=self.clock)
+        self.clicker.backend_name = RecordingBackend.name
+        self.clicker.macros = list(macros)
+        self.trace = [] if trace else None
+        self.by_source = {}
+        self.cap_hits = []
+        self.overlaps = []
+        self._events = []
+        self._sources = []
+        self._ends = []
+        self._seq = itertools.count()
+        self._runs = []
+        self._unordered = False
+
+    @property
+    def now(self) -> float:
+        return self.clock.now
+
+    def _log(self, event: str, source: str, detail=None):
+        if event == "cap":
+            self.cap_hits.append((self.clock.now, event, source, detail))
+        trace = self.trace
+        if trace is not None and len(trace) < TRACE_LIMIT:
+            trace.append((self.clock.now, event, source, detail))
+
+    def _push(self, t: float, item):
+        if item.__class__ is _ChannelRun or (item.__class__ is _MacroRun and item.playing):
+            heapq.heappush(self._sources, (t, item.rank, item))
+        else:
+            heapq.heappush(self._events, (t, next(self._seq), item))
+
+    def _sent(self, source: str, n: int):
+        self.by_source[source] = self.by_source.get(source, 0) + n
+
+    def trigger(self, macro, at: float = 0.0):
+        self._push(at, lambda: self._submit(macro))
+
+    def hold(self, channel, start: float = 0.0, stop: float = None):
+        self._push(start, lambda: self._start_channel(channel))
+        if stop is not None:
+            self._push(stop, lambda: self._stop_channel(channel))
+
+    def _submit(self, macro):
+        self._log("trigger", macro.name)
+        if not self.executor.submit(macro):
+            self._log("dropped", macro.name)
+        for run in list(self._runs):
+            if run.cancel.is_set() and not run.done:
+                self._log("cancel", run.macro.name, run.sent)
+                self._finish(run)
+        self._drain()
+
+    def _drain(self):
+        ready = self.executor._ready
+        while True:
+            try:
+                macro, cancel, _ = ready.get_nowait()
+            except queue.Empty:
+                return
+            self.executor.counters["started"] += 1
+            try:
+                timeline = macro.timeline()
+            except (TypeError, ValueError, KeyError) as e:
+                self._log("error", macro.name, str(e))
+                self.executor._finished(macro, cancel)
+                continue
+            run = _MacroRun(macro, cancel, timeline, self.clock.now + macro.start_delay, next(self._seq))
+            self._runs.append(run)
+            self._push(run.start, run)
+
+    def _finish(self, run: _MacroRun):
+        run.done = True
+        self.clicker._release_held(self.backend, run.held, run.held_buttons)
+        self._runs.remove(run)
+        if run.playing:
+            self._log("end", run.macro.name, run.sent)
+        self.executor._finished(run.macro, run.cancel)
+        self._drain()
+
+    def _start_channel(self, channel):
+        if self.clicker._prepare_channel(channel, self.clock):
+            self._log("start", channel.name)
+            self._overlaps(channel.name, channel)
+            self._push(channel.timer.next_deadline, _ChannelRun(channel, channel.generation, next(self._seq)))
+
+    def _stop_channel(self, channel):
+        if channel.active:
+            self.clicker.stop_channel(channel)
+            self._log("end", channel.name)
+
+    def _overlaps(self, name: str, me):
+        others = [run.macro.name for run in self._runs if run.playing and run is not me]
+        others += [c.name for c in self.clicker.channels if c.active and c is not me]
+        if others:
+            self.overlaps.append((self.clock.now, "overlap", name, tuple(others)))
+            self._log("overlap", name, tuple(others))
+
+    def _step_macro(self, run: _MacroRun, limit: float):
+        if run.done:
+            return
+        if not run.playing:
+            run.playing = True
+            self._log("start", run.macro.name)
+            self._overlaps(run.macro.name, run)
+            if run.remaining() > 0:
+                heapq.heappush(self._ends, (run.end_time(), next(self._seq), run))
+                self._push(run.next_time(), run)
+            else:
+                self._finish(run)
+            return
+        timeline = run.timeline
+        if timeline.__class__ is RepeatedAction:
+            ok = self._step_repeated(run, timeline, limit)
+        else:
+            ok = self._step_entries(run, timeline, limit)
+        if ok and run.remaining() > 0:
+            self._push(run.next_time(), run)
+        else:
+            self._finish(run)
+
+    def _step_repeated(self, run: _MacroRun, timeline: RepeatedAction, limit: float) -> bool:
+        kind, target, x, y = timeline.action
+        spacing = timeline.spacing
+        i = run.index
+        left = timeline.entries - i
+        if left <= 0:
+            return True
+        if spacing <= 0.0 or run.start + (timeline.entries - 1) * spacing < limit:
+            k = left
+        else:
+            k = min(left, max(1, math.ceil((limit - run.start) / spacing) - i))
+            while k > 1 and run.start + (i + k - 1) * spacing >= limit:
+                k -= 1
+            while k < left and run.start + (i + k) * spacing < limit:
+                k += 1
+        wanted = k * timeline.count + (timeline.last_count - timeline.count if k == left else 0)
+        self.clock.now = run.start + i * spacing
+        clicks = self.clicker._clicks
+        n = clicks.reserve(wanted)
+        if n > 0:
+            if kind == "click":
+                self.backend.click(target, x, y, n)
+            else:
+                self.backend.press(target, n)
+            clicks.add(n)
+            run.sent += n
+            self._sent(run.macro.name, n)
+            if k == 1:
+                self._log(kind, run.macro.name, n)
+            else:
+                self._log("run", run.macro.name, (n, min(k, math.ceil(n / timeline.count)), spacing))
+        if n < wanted:
+            done = math.ceil(n / timeline.count) if n > 0 else 0
+            self.clock.now = run.start + (i + min(done, left - 1)) * spacing
+            self._log("cap", run.macro.name, n)
+            return False
+        run.index = i + k
+        self.clock.now = run.start + (i + k - 1) * spacing
+        return True
+
+    def _step_entries(self, run: _MacroRun, timeline: tuple, limit: float) -> bool:
+        backend = self.backend
+        clicks = self.clicker._clicks
+        name = run.macro.name
+        while True:
+            offset, kind, target, x, y, count = timeline[run.index]
+            self.clock.now = run.start + offset
+            if kind in COUNTED_KINDS:
+                n = clicks.reserve(count)
+                if n <= 0:
+                    self._log("cap", name, 0)
+                    return False
+                if kind == "click":
+                    backend.click(target, x, y, n)
+                else:
+                    backend.press(target, n)
+                clicks.add(n)
+                run.sent += n
+                self._sent(name, n)
+                self._log(kind, name, n)
+                if n < count:
+                    self._log("cap", name, n)
+            else:
+                self.clicker._apply_step(backend, kind, target, x, y, run.held, run.held_buttons)
+            run.index += 1
+            if run.index >= len(timeline) or run.start + timeline[run.index][0] >= limit:
+                return True
+
+    def _step_channel(self, entry: _ChannelRun, limit: float):
+        channel = entry.channel
+        if entry.generation != channel.generation or not channel.active:
+            return
+        timer = channel.timer
+        clicker = self.clicker
+        clicks = clicker._clicks
+        deadline = timer.next_deadline
+        k = 1
+        if channel.stream is None and deadline + timer.period < limit:
+            if math.isfinite(limit):
+                period = timer.period
+                t = deadline + period
+                k = 1
+                while t < limit:
+                    t += period
+                    k += 1
+            elif clicks.limit > 0:
+                k = max(1, math.ceil((clicks.limit - clicks.value) / channel.per_tick) + 1)
+            else:
+                k = 0
+        if k > 1:
+            wanted = k * channel.per_tick
+            n = clicks.reserve(wanted)
+            self.clock.now = deadline
+            if n > 0:
+                clicker._send_channel(channel, n, channel.x, channel.y)
+                clicks.add(n)
+                self._sent(channel.name, n)
+                done = math.ceil(n / channel.per_tick)
+                timer.skip(done)
+                self._log("run", channel.name, (n, done, timer.period))
+            if n < wanted:
+                self.clock.now = timer.next_deadline
+                clicker.stop_channel(channel)
+                self._log("cap", channel.name, n)
+                return
+            self.clock.now = timer.deadline
+        elif k == 1:
+            self.clock.now = deadline
+            before = clicks.value
+            fired = clicker._fire_channel(channel, timer.tick(deadline))
+            n = clicks.value - before
+            if n:
+                self._sent(channel.name, n)
+                self._log(channel.button if channel.button == "key" else "click", channel.name, n)
+            if not fired:
+                self._log("cap", channel.name, n)
+                return
+        else:
+            raise ValueError(f"{channel.name} never stops: give it a stop time or pass until")
+        self._push(timer.next_deadline, entry)
+
+    def _next_end(self) -> float:
+        ends = self._ends
+        while ends and ends[0][2].done:
+            heapq.heappop(ends)
+        return ends[0][0] if ends else math.inf
+
+    def run(self, until: float = None) -> dict:
+        events = self._events
+        sources = self._sources
+        capped = self.clicker._clicks
+        end = math.inf if until is None else math.nextafter(until, math.inf)
+        latest = self.clock.now
+        while True:
+            next_event = events[0][0] if events else math.inf
+            next_source = sources[0][0] if sources else math.inf
+            if min(next_event, next_source) >= end:
+                break
+            if next_event <= next_source:
+                t, _, item = heapq.heappop(events)
+                self.clock.now = latest = max(latest, t)
+                if item.__class__ is _MacroRun:
+                    self._step_macro(item, next_event)
+                else:
+                    item()
+                continue
+            t, _, item = heapq.heappop(sources)
+            self.clock.now = t
+            limit = min(next_event, end, self._next_end())
+            if sources:
+                if capped.limit > 0:
+                    limit = min(limit, sources[0][0])
+                else:
+                    self._unordered = True
+            if item.__class__ is _MacroRun:
+                self._step_macro(item, limit)
+            else:
+                self._step_channel(item, limit)
+            latest = max(latest, self.clock.now)
+        self.clock.now = latest if until is None else max(latest, until)
+        return self.result()
+
+    def result(self) -> dict:
+        if self._unordered:
+            self._unordered = False
+            if self.trace is not None:
+                self.trace.sort(key=lambda e: e[0])
+            events = self.backend.events
+            if events:
+                ordered = sorted(events, key=lambda e: e[0])
+                events.clear()
+                events.extend(ordered)
+        trace = self.trace or []
+        return {
+            "duration": self.clock.now,
+            "clicks": self.clicker.total_clicks_sent,
+            "by_source": dict(self.by_source),
+            "cap_hits": sorted(self.cap_hits, key=lambda e: e[0]),
+            "overlaps": sorted(self.overlaps, key=lambda e: e[0]),
+            "executor": {k: v for k, v in self.executor.stats().items() if k != "drops_by_macro"},
+            "trace": trace,
+        }
+
+    def close(self):
+        self.clicker.stop_all_channels()
+        self.clicker.shutdown()
+
+def estimate_macro(macro, stop_after_total: int = 0) -> dict:
+    timeline = macro.timeline()
+    if timeline.__class__ is RepeatedAction:
+        entries = timeline.entries
+        clicks = (entries - 1) * timeline.count + timeline.last_count if entries else 0
+        duration = (entries - 1) * timeline.spacing if entries else 0.0
+        capped = 0 < stop_after_total < clicks
+        if capped:
+            clicks = stop_after_total
+            duration = math.ceil(clicks / timeline.count) * timeline.spacing
+    else:
+        clicks = sum(entry[5] for entry in timeline if entry[1] in COUNTED_KINDS)
+        duration = timeline[-1][0] if timeline else 0.0
+        capped = 0 < stop_after_total < clicks
+        if capped:
+            sim = Simulation({"stop_at": str(stop_after_total)}, trace=False)
+            try:
+                sim.trigger(macro)
+                result = sim.run()
+            finally:
+                sim.close()
+            return {"clicks": result["clicks"], "duration": result["duration"], "actions": len(timeline),
+                    "capped": True}
+    return {"clicks": clicks, "duration": macro.start_delay + duration, "actions": len(timeline), "capped": capped}
+
+def format_duration(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.3g} s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{int(minutes)} min {seconds:.0f} s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{int(hours)} h {int(minutes)} min"
+
+def _parse_at(text: str):
+    name, _, at = text.rpartition("@")
+    if not name:
+        return text, 0.0
+    try:
+        return name, float(at)
+    except ValueError:
+        raise ValueError(f"bad time in --run {text!r}: expected NAME@SECONDS") from None
+
+def _parse_hold(text: str):
+    name, _, span = text.partition("@")
+    start, _, stop = span.partition(":")
+    try:
+        return name, float(start or 0.0), float(stop) if stop else None
+    except ValueError:
+        raise ValueError(f"bad span in --hold {text!r}: expected CLICKER@START:STOP") from None
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Simulate macros and clickers on a virtual clock and print what they would send.")
+    parser.add_argument("--macros", default="macros.json", help="macro file (default: macros.json)")
+    parser.add_argument("--profile", default=DEFAULT_PROFILE)
+    parser.add_argument("--config", help="JSON file with master clicker settings, as for autoclicker_headless")
+    parser.add_argument("--stop-at", help="total-click cap (0 = no automatic stop)")
+    parser.add_argument("--run", action="append", default=[], metavar="NAME[@SECONDS]",
+                        help="trigger the named macro at the given time (repeatable)")
+    parser.add_argument("--hold", action="append", default=[], metavar="CLICKER@START:STOP",
+                        help="keep a clicker ('master' or an extra clicker name) running from START to STOP")
+    parser.add_argument("--until", type=float, help="stop the simulation at this many seconds")
+    parser.add_argument("--trace", action="store_true", help="print every simulated event")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    settings = {}
+    try:
+        if args.config:
+            with open(args.config, "r", encoding="utf-8") as f:
+                settings.update(json.load(f))
+        if args.stop_at is not None:
+            settings["stop_at"] = args.stop_at
+        runs = [_parse_at(text) for text in args.run]
+        holds = [_parse_hold(text) for text in args.hold]
+        profile = MacroProfile(check_profile_name(args.profile), profile_path(args.macros, args.profile))
+        profile.load()
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    sim = Simulation(settings, profile.macros, trace=args.trace or args.json)
+    try:
+        macros = {m.name: m for m in profile.macros}
+        channels = {c.name: c for c in sim.clicker.channels}
+        for name, at in runs:
+            if name not in macros:
+                print(f"error: no macro named '{name}' in {profile.path}", file=sys.stderr)
+                return 2
+            sim.trigger(macros[name], at)
+        for name, start, stop in holds:
+            if name not in channels:
+                print(f"error: no clicker named '{name}'", file=sys.stderr)
+                return 2
+            sim.hold(channels[name], start, stop)
+        try:
+            result = sim.run(args.until)
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+    finally:
+        sim.close()
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    if args.trace:
+        for t, event, source, detail in result["trace"]:
+            print(f"{t:12.6f}  {event:<8} {source}  {'' if detail is None else detail}")
+    print(f"simulated {format_duration(result['duration'])}: {result['clicks']} clicks, "
+          f"{len(result['cap_hits'])} cap hits, {len(result['overlaps'])} overlaps")
+    for name, n in result["by_source"].items():
+        print(f"  {name}: {n}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import threading
+import time
+
+import numpy as np
+
+from autoclicker_core import normalize_watch
+
+BLOCK_ROWS = 16
+ERROR_BACKOFF = 1.0
+
+class ScreenGrabber:
+    def __init__(self):
+        try:
+            import mss
+        except ImportError:
+            from PIL import ImageGrab
+            self._mss = None
+            self._grab = ImageGrab.grab
+            self.order = "rgb"
+        else:
+            self._mss = mss.mss()
+            self.order = "bgr"
+
+    def grab(self, region):
+        x, y, w, h = region
+        if self._mss is not None:
+            shot = self._mss.grab({"left": x, "top": y, "width": w, "height": h})
+            return np.frombuffer(shot.bgra, np.uint8).reshape(h, w, 4)[:, :, :3]
+        image = self._grab(bbox=(x, y, x + w, y + h), all_screens=True)
+        return np.asarray(image.convert("RGB"))
+
+    def close(self):
+        if self._mss is not None:
+            self._mss.close()
+
+class RegionWatch:
+    def __init__(self, macro, spec: dict, order: str = "rgb"):
+        self.macro = macro
+        self.spec = spec
+        self.region = tuple(spec["region"])
+        self.interval = spec["interval"]
+        self.tolerance = spec["tolerance"]
+        self.next_due = 0.0
+        self.polls = 0
+        self.fired = 0
+        _, _, w, h = self.region
+        self._scratch = np.empty((min(BLOCK_ROWS, h), w, 3), np.int16)
+        self._worst = np.empty((min(BLOCK_ROWS, h), w), np.int16)
+        self._reference = None
+        self._matched = False
+        if spec["mode"] == "color":
+            color = spec["color"] if order == "rgb" else spec["color"][::-1]
+            self._target = np.array(color, np.int16)
+            self._allowed = w * h - max(1, int(np.ceil(spec["fraction"] * w * h)))
+            self.check = self._check_color
+        else:
+            self._needed = spec["pixels"]
+            self.check = self._check_change
+
+    def _count_off(self, frame, other, limit: int) -> int:
+        scratch = self._scratch
+        worst = self._worst
+        tolerance = self.tolerance
+        count = 0
+        for row in range(0, frame.shape[0], BLOCK_ROWS):
+            block = frame[row:row + BLOCK_ROWS]
+            rows = block.shape[0]
+            out = scratch[:rows]
+            np.subtract(block, other if other.ndim == 1 else other[row:row + BLOCK_ROWS], out=out, dtype=np.int16)
+            np.abs(out, out=out)
+            top = worst[:rows]
+            np.maximum(out[..., 0], out[..., 1], out=top)
+            np.maximum(top, out[..., 2], out=top)
+            count += int(np.count_nonzero(top > tolerance))
+            if count > limit:
+                break
+        return count
+
+    def _check_change(self, frame) -> bool:
+        self.polls += 1
+        reference = self._reference
+        if reference is None or reference.shape != frame.shape:
+            self._reference = frame.copy()
+            return False
+        if np.array_equal(frame, reference):
+            return False
+        if self._count_off(frame, reference, self._needed - 1) < self._needed:
+            return False
+        self._reference = frame.copy()
+        self.fired += 1
+        return True
+
+    def _check_color(self, frame) -> bool:
+        self.polls += 1
+        matched = self._count_off(frame, self._target, self._allowed) <= self._allowed
+        fire = matched and not self._matched
+        self._matched = matched
+        if fire:
+            self.fired += 1
+        return fire
+
+class WatchManager:
+    def __init__(self, fire, grabber_factory=ScreenGrabber, on_error=None):
+        self._fire = fire
+        self._grabber_factory = grabber_factory
+        self._on_error = on_error
+        self._order = "rgb"
+        self._macros = []
+        self._watches = []
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = None
+
+    def _report(self, macro, error: Exception):
+        if self._on_error is not None:
+            self._on_error(macro, error)
+
+    def set_macros(self, macros):
+        self._macros = [m for m in macros if m.watch]
+        if self._macros and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="screen-watchers", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def _build(self):
+        old = {id(w.macro): w for w in self._watches}
+        watches = []
+        for macro in self._macros:
+            try:
+                spec = normalize_watch(macro.watch)
+            except (ValueError, KeyError, TypeError) as e:
+                self._report(macro, e)
+                continue
+            watch = old.get(id(macro))
+            if watch is None or watch.spec != spec:
+                watch = RegionWatch(macro, spec, self._order)
+            watches.append(watch)
+        self._watches = watches
+
+    def stats(self):
+        return [{"name": w.macro.name, "mode": w.spec["mode"], "polls": w.polls, "fired": w.fired}
+                for w in self._watches]
+
+    def _run(self):
+        try:
+            grabber = self._grabber_factory()
+        except Exception as e:
+            self._thread = None
+            self._report(None, e)
+            return
+        self._order = grabber.order
+        try:
+            self._poll(grabber)
+        finally:
+            grabber.close()
+
+    def _poll(self, grabber):
+        wake = self._wake
+        while not self._stop:
+            if wake.is_set():
+                wake.clear()
+                self._build()
+            watches = self._watches
+            if not watches:
+                wake.wait()
+                continue
+            now = time.perf_counter()
+            due = min(w.next_due for w in watches)
+            if due > now:
+                wake.wait(due - now)
+                continue
+            for w in watches:
+                if w.next_due > now:
+                    continue
+                w.next_due = max(w.next_due + w.interval, now)
+                try:
+                    fire = w.check(grabber.grab(w.region))
+                except Exception as e:
+                    w.next_due = now + ERROR_BACKOFF
+                    self._report(w.macro, e)
+                    continue
+                if fire:
+                    self._fire(w.macro)
+
+    def close(self, timeout: float = 2.0):
+        self._stop = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
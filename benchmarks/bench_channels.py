@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autoclicker_core import DEFAULT_SETTINGS, AutoClicker, ClickerChannel, DeadlineScheduler
+
+def make_clicker() -> AutoClicker:
+    clicker = AutoClicker(macros_path=os.devnull, load_macros=False)
+    clicker._listener.stop()
+    clicker.set_backend("dry-run")
+    return clicker
+
+def run_heap(clicker: AutoClicker, count: int, cps: float, duration: float):
+    channels = [ClickerChannel(f"bench {i}", cps, x=i, y=0) for i in range(count)]
+    clicker.apply_settings(dict(DEFAULT_SETTINGS, backend="dry-run", channels=[c.to_dict() for c in channels]))
+    channels = clicker.channels[1:]
+    clicker.backend.reset()
+    cpu = time.process_time()
+    for channel in channels:
+        clicker.start_channel(channel)
+    time.sleep(duration)
+    cpu = time.process_time() - cpu
+    clicker.stop_all_channels()
+    clicker._channel_scheduler.quiesce()
+    stats = [channel.stats() for channel in channels]
+    return cpu, stats
+
+def run_threads(clicker: AutoClicker, count: int, cps: float, duration: float):
+    stop = threading.Event()
+    timers = [DeadlineScheduler(cps) for _ in range(count)]
+    backend = clicker.backend
+    backend.reset()
+
+    def loop(i, timer):
+        timer.start()
+        while not stop.is_set():
+            timer.wait()
+            backend.click("left", i, 0)
+
+    threads = [threading.Thread(target=loop, args=(i, t), daemon=True) for i, t in enumerate(timers)]
+    cpu = time.process_time()
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    cpu = time.process_time() - cpu
+    stop.set()
+    for t in threads:
+        t.join()
+    return cpu, [t.stats() for t in timers]
+
+def summarize(kind: str, count: int, cps: float, duration: float, cpu: float, stats: list):
+    achieved = [s["achieved_cps"] for s in stats]
+    return {
+        "scheduler": kind,
+        "channels": count,
+        "cps_per_channel": cps,
+        "cpu_pct": cpu / duration * 100.0,
+        "cpu_us_per_click": cpu * 1e6 / max(1, sum(s["ticks"] for s in stats)),
+        "achieved_min": min(achieved),
+        "achieved_mean": sum(achieved) / len(achieved),
+        "mean_late_ms": sum(s["mean_late_ms"] for s in stats) / len(stats),
+        "max_late_ms": max(s["max_late_ms"] for s in stats),
+        "missed": sum(s["missed"] for s in stats),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU cost and timing of N clicker channels on one timer heap.")
+    parser.add_argument("--counts", default="1,2,5,10,20,50")
+    parser.add_argument("--cps", type=float, default=20.0, help="rate of each channel")
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--threads", action="store_true", help="also run one sleeping thread per channel")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    clicker = make_clicker()
+    results = []
+    for count in (int(c) for c in args.counts.split(",")):
+        cpu, stats = run_heap(clicker, count, args.cps, args.duration)
+        results.append(summarize("heap", count, args.cps, args.duration, cpu, stats))
+        if args.threads:
+            cpu, stats = run_threads(clicker, count, args.cps, args.duration)
+            results.append(summarize("threads", count, args.cps, args.duration, cpu, stats))
+    clicker.shutdown()
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'scheduler':>9} {'channels':>8} {'cpu %':>7} {'cpu us/click':>13} {'min cps':>8} "
+          f"{'late ms':>8} {'max late':>9} {'missed':>7}")
+    for r in results:
+        print(f"{r['scheduler']:>9} {r['channels']:>8} {r['cpu_pct']:>7.1f} {r['cpu_us_per_click']:>13.1f} "
+              f"{r['achieved_min']:>8.2f} {r['mean_late_ms']:>8.3f} {r['max_late_ms']:>9.3f} {r['missed']:>7}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+# Click-engine benchmark suite. Runs headless on the dry-run backend (no clicks reach the
+# desktop); the GUI poll benchmark drives the real Tk frame loop when a display is
+# available (e.g. under xvfb-run) and falls back to the engine-side polling calls otherwise.
+#
+#   python benchmarks/bench_engine.py --json --output results/engine-$(git rev-parse --short HEAD).json
+#
+# Sections: cps (master-loop accuracy per target rate), latency (trigger -> first click for
+# the master clicker and for a macro), scaling (N macros fired at once), gui_poll (per-frame
+# poll cost and its effect on a 1000 CPS master loop), metrics (per-click cost of the timing
+# histograms on the master and macro paths; the budget is 1 us per click).
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pynput import keyboard
+
+from autoclicker_core import AutoClicker, Macro, MacroExecutor, RecordingBackend, SourceMetrics
+
+TRIGGER = keyboard.KeyCode.from_char("q")
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1))))]
+
+def summary(values) -> dict:
+    if not values:
+        return {"n": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+    return {"n": len(values), "mean": sum(values) / len(values), "p50": percentile(values, 50),
+            "p99": percentile(values, 99), "max": max(values)}
+
+def make_clicker(workers: int = 4) -> AutoClicker:
+    clicker = AutoClicker(macros_path=os.path.join(tempfile.gettempdir(), "bench-engine-macros.json"),
+                          load_macros=False)
+    clicker._listener.stop()
+    clicker.set_backend("dry-run")
+    if workers != 4:
+        clicker._macro_executor.shutdown()
+        clicker._macro_executor = MacroExecutor(clicker._run_macro, workers=workers)
+    clicker.master.trigger_key = TRIGGER
+    clicker._rebuild_channel_index()
+    return clicker
+
+def wait_for(predicate, timeout: float) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.0002)
+    return True
+
+def stop_master(clicker: AutoClicker):
+    clicker.stop_channel(clicker.master)
+    clicker._channel_scheduler.quiesce()
+
+def run_master(clicker: AutoClicker, cps: float, duration: float, burst: bool = False):
+    clicker.master.clicks_per_second = cps
+    clicker.master.burst = burst
+    clicker.backend.reset()
+    clicker.start_channel(clicker.master)
+    time.sleep(duration)
+    stop_master(clicker)
+    return list(clicker.backend.events), clicker.master_stats
+
+def bench_cps(clicker: AutoClicker, rates, duration: float, burst: bool):
+    results = []
+    for cps in rates:
+        events, stats = run_master(clicker, cps, max(duration, 4.0 / cps), burst)
+        times = [e[0] for e in events]
+        counts = [e[5] for e in events]
+        span = times[-1] - times[0] if len(times) > 1 else 0.0
+        achieved = (sum(counts) - counts[0]) / span if span > 0 else 0.0
+        period = counts[0] / cps if counts else 1.0 / cps
+        errors = [abs((b - a) - period) * 1000.0 for a, b in zip(times, times[1:])]
+        results.append({
+            "target_cps": cps,
+            "achieved_cps": achieved,
+            "error_pct": (achieved - cps) / cps * 100.0 if achieved else None,
+            "clicks": sum(counts),
+            "interval_error_ms": summary(errors),
+            "scheduler": stats,
+        })
+    return results
+
+def bench_latency(clicker: AutoClicker, repeat: int):
+    master, master_cb = [], []
+    clicker.master.mode = "press"
+    clicker.master.clicks_per_second = 100.0
+    clicker.master.burst = False
+    for _ in range(repeat):
+        clicker.backend.reset()
+        t0 = time.perf_counter()
+        clicker._on_key_press(TRIGGER)
+        master_cb.append((time.perf_counter() - t0) * 1e6)
+        if wait_for(lambda: clicker.backend.count, 1.0):
+            master.append((clicker.backend.events[0][0] - t0) * 1e6)
+        clicker._on_key_release(TRIGGER)
+        clicker._channel_scheduler.quiesce()
+    key = keyboard.KeyCode.from_char("m")
+    macro = Macro("latency", key, "left", "", 1, 0.0)
+    clicker.macros = [macro]
+    clicker._rebuild_macro_index()
+    executor = clicker._macro_executor
+    macro_lat, macro_cb = [], []
+    for _ in range(repeat):
+        clicker.backend.reset()
+        t0 = time.perf_counter()
+        clicker._on_key_press(key)
+        macro_cb.append((time.perf_counter() - t0) * 1e6)
+        if wait_for(lambda: clicker.backend.count, 1.0):
+            macro_lat.append((clicker.backend.events[0][0] - t0) * 1e6)
+        wait_for(lambda: not executor.is_running(macro), 1.0)
+    clicker.macros = []
+    clicker._rebuild_macro_index()
+    return {
+        "master_first_click_us": summary(master),
+        "master_callback_us": summary(master_cb),
+        "macro_first_click_us": summary(macro_lat),
+        "macro_callback_us": summary(macro_cb),
+    }
+
+def bench_scaling(clicker: AutoClicker, counts, clicks: int, interval: float):
+    results = []
+    for n in counts:
+        keys = [keyboard.KeyCode.from_vk(0x20000 + i) for i in range(n)]
+        clicker.macros = [Macro(f"scale {i}", keys[i], "left", "", clicks, interval, x_coord=i, y_coord=0)
+                          for i in range(n)]
+        clicker._rebuild_macro_index()
+        clicker.backend.reset()
+        t0 = time.perf_counter()
+        for key in keys:
+            clicker._on_key_press(key)
+        done = wait_for(lambda: clicker.backend.count >= n * clicks, 5.0 + n * clicks * interval)
+        events = list(clicker.backend.events)
+        per_macro = {}
+        for e in events:
+            per_macro.setdefault(e[3], []).append(e[0])
+        start_delay = [(ts[0] - t0) * 1000.0 for ts in per_macro.values()]
+        errors = [abs((b - a) - interval) * 1000.0 for ts in per_macro.values() for a, b in zip(ts, ts[1:])]
+        wall = events[-1][0] - t0 if events else 0.0
+        ideal = (clicks - 1) * interval
+        results.append({
+            "macros": n,
+            "completed": done,
+            "clicks": clicker.backend.count,
+            "wall_ms": wall * 1000.0,
+            "ideal_ms": ideal * 1000.0,
+            "overrun_ratio": wall / ideal if ideal > 0 else None,
+            "throughput_cps": clicker.backend.count / wall if wall > 0 else 0.0,
+            "start_delay_ms": summary(start_delay),
+            "interval_error_ms": summary(errors),
+        })
+        wait_for(lambda: not any(clicker._macro_executor.is_running(m) for m in clicker.macros), 5.0)
+    clicker.macros = []
+    clicker._rebuild_macro_index()
+    return {"workers": len(clicker._macro_executor._workers), "clicks_per_macro": clicks, "interval_s": interval,
+            "runs": results}
+
+def poll_engine(clicker: AutoClicker, stop: threading.Event, costs: list):
+    counter_at = 0.0
+    while not stop.wait(0.016):
+        t0 = time.perf_counter_ns()
+        clicker.status.take()
+        now = time.perf_counter()
+        if now - counter_at >= 0.1:
+            counter_at = now
+            clicker.total_clicks_sent
+            if clicker.is_clicking:
+                clicker.master_stats
+        costs.append((time.perf_counter_ns() - t0) / 1000.0)
+
+def bench_gui_poll_tk(duration: float, cps: float):
+    import tkinter as tk
+    import autoclicker
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            root = tk.Tk()
+            app = autoclicker.AutoClickerGUI(root)
+            app.clicker._listener.stop()
+            app.var_backend.set("dry-run")
+            costs = []
+            frame = app._on_frame
+
+            def timed_frame():
+                t0 = time.perf_counter_ns()
+                frame()
+                costs.append((time.perf_counter_ns() - t0) / 1000.0)
+
+            app._on_frame = timed_frame
+            root.update()
+            clicker = app.clicker
+
+            def pump(seconds: float):
+                end = time.perf_counter() + seconds
+                while time.perf_counter() < end:
+                    root.update()
+                    time.sleep(0.001)
+
+            clicker.master.clicks_per_second = cps
+            clicker.start_channel(clicker.master)
+            pump(duration)
+            stop_master(clicker)
+            stats = clicker.master_stats
+            clicker._macro_executor.shutdown()
+            root.destroy()
+        finally:
+            os.chdir(cwd)
+    return {"mode": "tk", "frame_us": summary(costs), "frames": len(costs), "master": stats}
+
+def bench_gui_poll(clicker: AutoClicker, duration: float, cps: float):
+    try:
+        return bench_gui_poll_tk(duration, cps)
+    except Exception as e:
+        fallback = str(e) or type(e).__name__
+    _, baseline = run_master(clicker, cps, duration)
+    costs = []
+    stop = threading.Event()
+    poller = threading.Thread(target=poll_engine, args=(clicker, stop, costs), daemon=True)
+    poller.start()
+    _, polled = run_master(clicker, cps, duration)
+    stop.set()
+    poller.join()
+    return {"mode": "engine", "tk_unavailable": fallback, "frame_us": summary(costs), "frames": len(costs),
+            "master": polled, "master_without_poll": baseline}
+
+def bench_metrics(clicker: AutoClicker, clicks: int, duration: float, rounds: int = 5):
+    backend = clicker.backend
+    clicker.backend = RecordingBackend(max_events=0)
+    timeline = Macro("overhead", None, "left", "", clicks, 0.0).timeline()
+    macro = {"off": None, "on": None}
+    master = {"off": None, "on": None}
+    for _ in range(rounds):
+        for name, metrics in (("off", None), ("on", SourceMetrics())):
+            clicker._clicks.reset()
+            t0 = time.perf_counter_ns()
+            clicker._play_timeline(timeline, threading.Event(), metrics)
+            elapsed = (time.perf_counter_ns() - t0) / clicks
+            macro[name] = elapsed if macro[name] is None else min(macro[name], elapsed)
+        for name in ("off", "on"):
+            clicker.metrics.enabled = name == "on"
+            clicker.backend.reset()
+            clicker.master.clicks_per_second = 1e6
+            clicker.start_channel(clicker.master)
+            time.sleep(duration / rounds)
+            stop_master(clicker)
+            elapsed = duration / rounds * 1e9 / max(1, clicker.backend.count)
+            master[name] = elapsed if master[name] is None else min(master[name], elapsed)
+            clicker.metrics.drain()
+    clicker.metrics.enabled = False
+    clicker.metrics.reset()
+    clicker.backend = backend
+    return {
+        "macro_click_ns": macro,
+        "macro_overhead_ns": macro["on"] - macro["off"],
+        "master_click_ns": master,
+        "master_overhead_ns": master["on"] - master["off"],
+        "budget_ns": 1000.0,
+    }
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+def print_report(result: dict):
+    print(f"revision {result['revision']}  python {result['python']}  {result['platform']}")
+    if "cps" in result:
+        print(f"\n{'target':>8} {'achieved':>10} {'err %':>7} {'int err p50':>12} {'p99 ms':>8} {'jitter ms':>10} {'missed':>7}")
+        for r in result["cps"]:
+            err = "-" if r["error_pct"] is None else f"{r['error_pct']:.2f}"
+            print(f"{r['target_cps']:>8g} {r['achieved_cps']:>10.2f} {err:>7} {r['interval_error_ms']['p50']:>12.3f} "
+                  f"{r['interval_error_ms']['p99']:>8.3f} {r['scheduler']['jitter_ms']:>10.3f} {r['scheduler']['missed']:>7}")
+    if "latency" in result:
+        print("\ntrigger -> first click (us)      p50       p99       max")
+        for name, s in result["latency"].items():
+            print(f"  {name:<26} {s['p50']:>9.1f} {s['p99']:>9.1f} {s['max']:>9.1f}")
+    if "scaling" in result:
+        s = result["scaling"]
+        print(f"\n{s['workers']} workers, {s['clicks_per_macro']} clicks @ {s['interval_s'] * 1000:g} ms per macro")
+        print(f"{'macros':>7} {'wall ms':>9} {'ideal ms':>9} {'overrun':>8} {'start p99 ms':>13} {'int err p99 ms':>15}")
+        for r in s["runs"]:
+            overrun = "-" if r["overrun_ratio"] is None else f"{r['overrun_ratio']:.2f}x"
+            print(f"{r['macros']:>7} {r['wall_ms']:>9.1f} {r['ideal_ms']:>9.1f} {overrun:>8} "
+                  f"{r['start_delay_ms']['p99']:>13.3f} {r['interval_error_ms']['p99']:>15.3f}")
+    if "gui_poll" in result:
+        g = result["gui_poll"]
+        print(f"\nGUI poll ({g['mode']}): {g['frames']} frames, mean {g['frame_us']['mean']:.1f} us, "
+              f"p99 {g['frame_us']['p99']:.1f} us; master {g['master']['achieved_cps']:.1f} cps, "
+              f"jitter {g['master']['jitter_ms']:.3f} ms")
+        if "master_without_poll" in g:
+            print(f"  without polling: {g['master_without_poll']['achieved_cps']:.1f} cps, "
+                  f"jitter {g['master_without_poll']['jitter_ms']:.3f} ms")
+    if "metrics" in result:
+        m = result["metrics"]
+        print(f"\nmetrics overhead per click: macro {m['macro_overhead_ns']:.0f} ns "
+              f"({m['macro_click_ns']['off']:.0f} -> {m['macro_click_ns']['on']:.0f}), master "
+              f"{m['master_overhead_ns']:.0f} ns ({m['master_click_ns']['off']:.0f} -> "
+              f"{m['master_click_ns']['on']:.0f}), budget {m['budget_ns']:.0f} ns")
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency benchmarks for the click engine.")
+    parser.add_argument("--only", default="cps,latency,scaling,gui_poll,metrics", help="comma-separated sections to run")
+    parser.add_argument("--rates", default="1,10,50,100,250,500,1000,2000")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per CPS run (at least 4 clicks)")
+    parser.add_argument("--burst", action="store_true", help="run the CPS section in burst mode")
+    parser.add_argument("--repeat", type=int, default=200, help="trigger presses per latency measurement")
+    parser.add_argument("--macros", default="1,2,4,8,16", help="macro counts for the scaling section")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--macro-clicks", type=int, default=50)
+    parser.add_argument("--macro-interval", type=float, default=0.01)
+    parser.add_argument("--gui-cps", type=float, default=1000.0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+    sections = set(args.only.split(","))
+    clicker = make_clicker(args.workers)
+    result = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    if "cps" in sections:
+        result["cps"] = bench_cps(clicker, [float(r) for r in args.rates.split(",")], args.duration, args.burst)
+        result["cps_burst"] = args.burst
+    if "latency" in sections:
+        result["latency"] = bench_latency(clicker, args.repeat)
+    if "scaling" in sections:
+        result["scaling"] = bench_scaling(clicker, [int(n) for n in args.macros.split(",")],
+                                          args.macro_clicks, args.macro_interval)
+    if "gui_poll" in sections:
+        result["gui_poll"] = bench_gui_poll(clicker, args.duration, args.gui_cps)
+    if "metrics" in sections:
+        result["metrics"] = bench_metrics(clicker, 50000, args.duration)
+    clicker._macro_executor.shutdown()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+
+if __name__ == "__main__":
+    main()
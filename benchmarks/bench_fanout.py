@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autoclicker_core import DEFAULT_SETTINGS, AutoClicker, ClickerChannel
+from autoclicker_fanout import FanoutController
+
+REPORT_INTERVAL = 0.25
+
+def single_process(workers: int, cps: float, duration: float) -> float:
+    clicker = AutoClicker(macros_path=os.devnull, load_macros=False, listen=False)
+    clicker.metrics.enabled = True
+    clicker.apply_settings(dict(DEFAULT_SETTINGS, backend="dry-run", clicks_per_second=str(cps)))
+    clicker.channels += [ClickerChannel(f"clicker {i}", clicks_per_second=cps) for i in range(1, workers)]
+    start = time.perf_counter()
+    for channel in clicker.channels:
+        clicker.start_channel(channel)
+    while time.perf_counter() - start < duration:
+        time.sleep(REPORT_INTERVAL)
+        clicker.metrics.drain()
+    clicks = clicker.total_clicks_sent
+    elapsed = time.perf_counter() - start
+    clicker.shutdown()
+    return clicks / elapsed
+
+def fanout(workers: int, cps: float, duration: float, displays, macros_path: str) -> dict:
+    ready = []
+    t0 = time.perf_counter()
+    on_event = lambda kind, worker, payload: ready.append(time.perf_counter() - t0) if kind == "ready" else None
+    targets = [(displays[i % len(displays)], []) for i in range(workers)]
+    controller = FanoutController(targets, macros_path=macros_path, settings={"backend": "dry-run",
+                                  "clicks_per_second": str(cps)}, start_master=True, duration=duration,
+                                  interval=REPORT_INTERVAL, on_event=on_event).start()
+    messages = 0
+    while controller.running:
+        messages += controller.poll()
+    controller.join()
+    snap = controller.snapshot()
+    return {"rate": snap["rate"], "failed": snap["failed"], "startup_s": max(ready, default=0.0),
+            "messages": messages}
+
+def main():
+    parser = argparse.ArgumentParser(description="Click throughput of N clickers in one process vs N fan-out workers.")
+    parser.add_argument("--workers", default=f"1,2,4,{os.cpu_count() or 1}")
+    parser.add_argument("--cps", type=float, default=1000000.0, help="requested rate per clicker (flat out)")
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--displays", default=os.environ.get("DISPLAY", ":0"),
+                        help="comma-separated X displays to spread workers over (dry-run sends nothing)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    displays = [d for d in args.displays.split(",") if d]
+    counts = sorted({int(c) for c in args.workers.split(",")})
+    fd, macros_path = tempfile.mkstemp(prefix="bench-fanout-", suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        f.write("[]")
+    results = []
+    try:
+        for n in counts:
+            single = single_process(n, args.cps, args.duration)
+            fan = fanout(n, args.cps, args.duration, displays, macros_path)
+            results.append({"workers": n, "single_process_cps": single, "fanout_cps": fan["rate"],
+                            "speedup": fan["rate"] / single if single else 0.0, "startup_s": fan["startup_s"],
+                            "reports": fan["messages"], "failed": fan["failed"]})
+    finally:
+        os.remove(macros_path)
+    if args.json:
+        print(json.dumps({"cpus": os.cpu_count(), "results": results}, indent=2))
+        return
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'one process/s':>14} {'fan-out/s':>12} {'speedup':>8} {'startup s':>10} {'reports':>8}")
+    for r in results:
+        print(f"{r['workers']:>8} {r['single_process_cps']:>14.0f} {r['fanout_cps']:>12.0f} {r['speedup']:>8.2f} "
+              f"{r['startup_s']:>10.2f} {r['reports']:>8}")
+
+if __name__ == "__main__":
+    main()
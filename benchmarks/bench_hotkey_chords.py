@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pynput import keyboard
+
+from autoclicker_core import AutoClicker, Hotkey, Macro
+
+MODIFIERS = (keyboard.Key.ctrl_l, keyboard.Key.shift_r, keyboard.Key.alt_l)
+
+def vk(i: int):
+    return keyboard.KeyCode.from_vk(0x10000 + i)
+
+def second_vk(i: int):
+    return keyboard.KeyCode.from_vk(0x80000 + i)
+
+def make_macros(count: int):
+    macros = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            trigger = vk(i)
+        elif kind == 1:
+            trigger = Hotkey([(1 | 2, vk(i))])
+        else:
+            trigger = Hotkey([(0, vk(i)), (4, second_vk(i))])
+        macros.append(Macro(name=f"bench {i}", trigger_key=trigger, button="left", key_to_send="",
+                            n_clicks=1, interval=0.0))
+    return macros
+
+def taps(*keys):
+    return [(True, k) for k in keys] + [(False, k) for k in reversed(keys)]
+
+def scenarios(count: int):
+    miss = keyboard.KeyCode.from_char("~")
+    last = lambda kind: max(i for i in range(count) if i % 3 == kind)
+    result = {"miss": (taps(miss), None)}
+    if count >= 3:
+        plain, chord, seq = last(0), last(1), last(2)
+        result["plain"] = (taps(vk(plain)), f"bench {plain}")
+        result["chord"] = (taps(MODIFIERS[0], MODIFIERS[1], vk(chord)), f"bench {chord}")
+        result["sequence"] = (taps(vk(seq)) + taps(MODIFIERS[2], second_vk(seq)), f"bench {seq}")
+        result["wrong_modifier"] = (taps(MODIFIERS[2], vk(chord)), None)
+    return result
+
+def run(clicker: AutoClicker, count: int, repeat: int):
+    fired = []
+    clicker._macro_executor.submit = lambda macro: fired.append(macro.name)
+    clicker.macros = make_macros(count)
+    start = time.perf_counter()
+    clicker._rebuild_macro_index()
+    compile_ms = (time.perf_counter() - start) * 1000.0
+    press, release = clicker._on_key_press, clicker._on_key_release
+    row = {"macros": count, "compile_ms": compile_ms}
+    for name, (events, expected) in scenarios(count).items():
+        fired.clear()
+        start = time.perf_counter_ns()
+        for _ in range(repeat):
+            for down, key in events:
+                if down:
+                    press(key)
+                else:
+                    release(key)
+        elapsed = time.perf_counter_ns() - start
+        wanted = [] if expected is None else [expected] * repeat
+        row[name] = {"ns_per_event": elapsed / (repeat * len(events)), "correct": fired == wanted}
+    return row
+
+def main():
+    parser = argparse.ArgumentParser(description="Chord and sequence hotkey matching cost per synthetic key event.")
+    parser.add_argument("--counts", default="0,10,1000,10000")
+    parser.add_argument("--repeat", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    clicker = AutoClicker(macros_path=os.devnull, load_macros=False)
+    clicker._listener.stop()
+    clicker.set_backend("dry-run")
+    results = [run(clicker, int(c), args.repeat) for c in args.counts.split(",")]
+    clicker.shutdown()
+    wrong = [r["macros"] for r in results for k, v in r.items() if isinstance(v, dict) and not v["correct"]]
+    if args.json:
+        print(json.dumps({"results": results, "incorrect": wrong}, indent=2))
+        return 1 if wrong else 0
+    names = ("miss", "plain", "chord", "sequence", "wrong_modifier")
+    print(f"{'macros':>8} {'compile ms':>11} " + " ".join(f"{n + ' ns':>17}" for n in names))
+    for r in results:
+        cells = " ".join(f"{r[n]['ns_per_event']:>17.0f}" if n in r else f"{'-':>17}" for n in names)
+        print(f"{r['macros']:>8} {r['compile_ms']:>11.2f} {cells}")
+    if wrong:
+        print(f"wrong macros fired with {', '.join(map(str, wrong))} macros")
+    return 1 if wrong else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
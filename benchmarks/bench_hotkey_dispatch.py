@@ -0,0 +1,51 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pynput import keyboard
+
+from autoclicker_core import AutoClicker, Macro
+
+def make_macros(count: int):
+    return [Macro(name=f"bench {i}", trigger_key=keyboard.KeyCode.from_vk(0x10000 + i), button="left",
+                  key_to_send="", n_clicks=1, interval=0.0)
+            for i in range(count)]
+
+def linear_dispatch(macros, key):
+    for macro in macros:
+        if key == macro.trigger_key:
+            return macro
+    return None
+
+def time_per_call(fn, key, repeat: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        fn(key)
+    return (time.perf_counter_ns() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="Listener-callback latency vs. number of macros.")
+    parser.add_argument("--counts", default="0,10,100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+    clicker = AutoClicker()
+    clicker._listener.stop()
+    clicker.set_backend("dry-run")
+    miss = keyboard.KeyCode.from_char("~")
+    print(f"{'macros':>8} {'linear miss ns':>15} {'index miss ns':>14} {'index hit ns':>13}")
+    for count in (int(c) for c in args.counts.split(",")):
+        clicker.macros = make_macros(count)
+        clicker._rebuild_macro_index()
+        linear = time_per_call(lambda k: linear_dispatch(clicker.macros, k), miss, args.repeat)
+        indexed = time_per_call(clicker._on_key_press, miss, args.repeat)
+        hit = "-"
+        if count:
+            hit = f"{time_per_call(clicker._on_key_press, clicker.macros[-1].trigger_key, args.repeat):.0f}"
+        print(f"{count:>8} {linear:>15.0f} {indexed:>14.0f} {hit:>13}")
+    clicker._macro_executor.shutdown()
+
+if __name__ == "__main__":
+    main()
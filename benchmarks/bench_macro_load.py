@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autoclicker_core import Macro, MacroStorage, hotkey_index_key
+
+KEYS = [f"f{i}" for i in range(1, 13)] + [chr(c) for c in range(ord("a"), ord("z") + 1)]
+
+def write_library(path: str, count: int):
+    docs = [{
+        "name": f"generated {i}",
+        "trigger_key": KEYS[i % len(KEYS)],
+        "button": ("left", "right", "key")[i % 3],
+        "key_to_send": "enter" if i % 3 == 2 else "",
+        "n_clicks": 1 + i % 50,
+        "interval": 0.05,
+        "x_coord": i % 1920 if i % 2 else None,
+        "y_coord": i % 1080 if i % 2 else None,
+        "start_delay": 0.0,
+    } for i in range(count)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(docs, f, indent=2)
+
+def load(path: str, chunk_size: int):
+    storage = MacroStorage(path)
+    macros = []
+    index = {}
+    first_chunk = None
+    start = time.perf_counter()
+    for docs in storage.iter_load(chunk_size):
+        chunk = [Macro.from_dict(d) for d in docs]
+        macros.extend(chunk)
+        for macro in chunk:
+            if macro.trigger_key is not None:
+                index.setdefault(hotkey_index_key(macro.trigger_key), macro)
+        if first_chunk is None:
+            first_chunk = time.perf_counter() - start
+    return macros, first_chunk or 0.0, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Macro library load time and memory vs. macro count.")
+    parser.add_argument("--counts", default="1000,10000,50000")
+    parser.add_argument("--chunk", type=int, default=500)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in (int(c) for c in args.counts.split(",")):
+            path = os.path.join(tmp, f"macros_{count}.json")
+            write_library(path, count)
+            load(path, args.chunk)
+            _, first_chunk, total = load(path, args.chunk)
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            macros, _, _ = load(path, args.chunk)
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append({
+                "macros": count,
+                "file_kb": os.path.getsize(path) / 1024.0,
+                "first_chunk_ms": first_chunk * 1000.0,
+                "total_ms": total * 1000.0,
+                "retained_bytes_per_macro": (retained - before) / max(1, len(macros)),
+                "peak_kb": (peak - before) / 1024.0,
+            })
+            del macros
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'macros':>8} {'file KB':>9} {'first chunk ms':>15} {'total ms':>9} {'B/macro':>8} {'peak KB':>9}")
+    for r in results:
+        print(f"{r['macros']:>8} {r['file_kb']:>9.0f} {r['first_chunk_ms']:>15.2f} {r['total_ms']:>9.1f} "
+              f"{r['retained_bytes_per_macro']:>8.0f} {r['peak_kb']:>9.0f}")
+
+if __name__ == "__main__":
+    main()
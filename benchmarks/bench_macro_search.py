@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autoclicker_core import Macro, MacroSearchIndex, parse_hotkey_string
+
+FRAME_MS = 16.0
+ROWS = 8
+WORDS = ["attack", "heal", "farm", "loot", "jump", "craft", "buy", "sell", "spam", "click", "mine", "fish",
+         "open", "close", "trade", "party", "self", "boss", "quest", "daily"]
+KEYS = [f"f{i}" for i in range(1, 13)] + [chr(c) for c in range(ord("a"), ord("z") + 1)] + ["space", "enter"]
+QUERIES = ["h", "he", "heal", "heal f", "heal party f5", "4999", "quest 12", "zzz"]
+TYPED = "heal party 49"
+
+def make_macros(count: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [Macro(f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}", parse_hotkey_string(rng.choice(KEYS)),
+                  "left", "", 1, 0.05) for i in range(count)]
+
+def timed_ms(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000.0, result
+
+def render_ms(items, top: int) -> float:
+    start = time.perf_counter()
+    tuple(m.display_name() for m in items[top:top + ROWS])
+    return (time.perf_counter() - start) * 1000.0
+
+def naive_filter(macros, query: str):
+    query = query.lower()
+    return [m for m in macros if query in m.display_name().lower()]
+
+def run(count: int, chunk: int, rng: random.Random):
+    macros = make_macros(count)
+    index = MacroSearchIndex()
+    chunk_ms = []
+    for i in range(0, count, chunk):
+        ms, _ = timed_ms(index.extend, macros[i:i + chunk])
+        chunk_ms.append(ms)
+    queries = {}
+    for query in QUERIES:
+        index._last_tokens = None
+        ms, found = timed_ms(index.search, query)
+        queries[query] = {"ms": ms + render_ms(found, 0), "matches": len(found)}
+    typing = []
+    for n in range(1, len(TYPED) + 1):
+        ms, found = timed_ms(index.search, TYPED[:n])
+        typing.append(ms + render_ms(found, 0))
+    everything = index.search("")
+    scroll = [render_ms(everything, rng.randrange(max(1, count - ROWS))) for _ in range(200)]
+    naive, _ = timed_ms(naive_filter, macros, "heal")
+    worst = max([q["ms"] for q in queries.values()] + typing + scroll)
+    return {
+        "macros": count,
+        "build_ms": sum(chunk_ms),
+        "max_chunk_ms": max(chunk_ms),
+        "queries": queries,
+        "typing_ms": typing,
+        "max_scroll_ms": max(scroll),
+        "naive_filter_ms": naive,
+        "worst_frame_ms": worst,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Macro search index and virtualized list cost vs. one frame.")
+    parser.add_argument("--counts", default="1000,10000,50000")
+    parser.add_argument("--chunk", type=int, default=500, help="macros indexed per load step")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    rng = random.Random(7)
+    results = [run(int(c), args.chunk, rng) for c in args.counts.split(",")]
+    over = [r["macros"] for r in results if r["worst_frame_ms"] > FRAME_MS or r["max_chunk_ms"] > FRAME_MS]
+    if args.json:
+        print(json.dumps({"frame_ms": FRAME_MS, "results": results, "over_budget": over}, indent=2))
+        return 1 if over else 0
+    for r in results:
+        print(f"{r['macros']} macros: index built in {r['build_ms']:.0f} ms (worst load step {r['max_chunk_ms']:.2f} ms), "
+              f"naive filter {r['naive_filter_ms']:.1f} ms")
+        for query, q in r["queries"].items():
+            print(f"  {query!r:>18}: {q['ms']:7.3f} ms  {q['matches']:>6} matches")
+        print(f"  typing {TYPED!r}: worst keystroke {max(r['typing_ms']):.3f} ms, "
+              f"scroll worst {r['max_scroll_ms']:.3f} ms, worst frame {r['worst_frame_ms']:.3f} ms")
+    if over:
+        print(f"over the {FRAME_MS:.0f} ms frame budget: {', '.join(map(str, over))} macros")
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
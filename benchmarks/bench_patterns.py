@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autoclicker_core import DEFAULT_SETTINGS, AutoClicker, parse_pattern_text
+from autoclicker_patterns import PatternStream
+
+PATTERNS = {
+    "fixed": "timing uniform 0",
+    "timing": "timing normal 0.2 seed 1",
+    "jitter": "timing normal 0.2 jitter 3 seed 1",
+    "area": "timing lognormal 0.3 area 80 40 jitter 2 seed 1",
+    "path": "timing uniform 0.3 path 100 100 400 100 400 300 seed 1",
+    "glide": "timing normal 0.2 area 80 40 glide 8 seed 1",
+}
+
+def generation_cost(text: str, clicks: int):
+    stream = PatternStream(parse_pattern_text(text), 1000.0, 500, 500)
+    per_click = stream.pattern["glide"] + 1
+    refills = []
+    start = time.perf_counter()
+    for _ in range(clicks * per_click):
+        if stream._i >= len(stream._events):
+            t0 = time.perf_counter()
+            stream.next()
+            refills.append(time.perf_counter() - t0)
+        else:
+            stream.next()
+    total = time.perf_counter() - start
+    return {
+        "ns_per_click": total * 1e9 / clicks,
+        "refill_ns_per_click": sum(refills) * 1e9 / clicks,
+        "max_refill_us": max(refills) * 1e6,
+    }
+
+def deterministic(text: str, clicks: int) -> bool:
+    pattern = parse_pattern_text(text)
+    return PatternStream(pattern, 50.0, 500, 500).take(clicks) == PatternStream(pattern, 50.0, 500, 500).take(clicks)
+
+def achieved_cps(clicker: AutoClicker, cps: float, pattern: str, duration: float):
+    clicker.apply_settings(dict(DEFAULT_SETTINGS, backend="dry-run", clicks_per_second=str(cps), use_fixed=True,
+                                master_x="500", master_y="500", pattern=pattern))
+    clicker.backend.reset()
+    clicker._clicks.reset()
+    cpu = time.process_time()
+    clicker.start_channel(clicker.master)
+    time.sleep(duration)
+    clicker.stop_channel(clicker.master)
+    clicker._channel_scheduler.quiesce()
+    cpu = time.process_time() - cpu
+    stats = clicker.master_stats
+    return {
+        "achieved_cps": stats["achieved_cps"],
+        "cpu_us_per_click": cpu * 1e6 / max(1, clicker.total_clicks_sent),
+        "max_late_ms": stats["max_late_ms"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of generating humanized click patterns vs. plain clicking.")
+    parser.add_argument("--clicks", type=int, default=200000, help="clicks to generate per pattern")
+    parser.add_argument("--cps", type=float, default=2000.0, help="rate for the end-to-end run")
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    clicker = AutoClicker(macros_path=os.devnull, load_macros=False)
+    clicker._listener.stop()
+    clicker.set_backend("dry-run")
+    results = []
+    baseline = achieved_cps(clicker, args.cps, "", args.duration)
+    for name, text in PATTERNS.items():
+        r = {"pattern": name, "text": text}
+        r.update(generation_cost(text, args.clicks))
+        r["deterministic"] = deterministic(text, 5000)
+        r.update(achieved_cps(clicker, args.cps, text, args.duration))
+        results.append(r)
+    clicker.shutdown()
+    if args.json:
+        print(json.dumps({"cps": args.cps, "plain": baseline, "patterns": results}, indent=2))
+        return
+    print(f"plain clicking at {args.cps:g} cps: {baseline['achieved_cps']:.1f} cps, "
+          f"{baseline['cpu_us_per_click']:.1f} us cpu/click, max late {baseline['max_late_ms']:.3f} ms")
+    print(f"{'pattern':>8} {'ns/click':>9} {'refill ns':>10} {'max refill us':>14} {'same seed':>10} "
+          f"{'cps':>8} {'us/click':>9} {'max late':>9}")
+    for r in results:
+        print(f"{r['pattern']:>8} {r['ns_per_click']:>9.0f} {r['refill_ns_per_click']:>10.0f} "
+              f"{r['max_refill_us']:>14.1f} {str(r['deterministic']):>10} {r['achieved_cps']:>8.1f} "
+              f"{r['cpu_us_per_click']:>9.1f} {r['max_late_ms']:>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pynput import keyboard
+
+from autoclicker_core import AutoClicker, Macro, profile_path
+
+def write_profile(path: str, count: int, offset: int):
+    docs = [Macro(name=f"bench {offset + i}", trigger_key=keyboard.KeyCode.from_vk(0x10000 + offset + i),
+                  button="left", key_to_send="", n_clicks=1, interval=0.0).to_dict() for i in range(count)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(docs, f)
+
+def timed_ms(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000.0
+
+def dispatch_during(clicker: AutoClicker, switch, key):
+    worst = [0.0]
+    stop = threading.Event()
+
+    def hammer():
+        while not stop.is_set():
+            t0 = time.perf_counter_ns()
+            clicker._on_key_press(key)
+            clicker._on_key_release(key)
+            worst[0] = max(worst[0], (time.perf_counter_ns() - t0) / 1e6)
+
+    thread = threading.Thread(target=hammer)
+    thread.start()
+    time.sleep(0.02)
+    switch()
+    time.sleep(0.02)
+    stop.set()
+    thread.join()
+    return worst[0]
+
+def run(directory: str, count: int):
+    macros_path = os.path.join(directory, f"macros-{count}.json")
+    names = ("default", "a", "b")
+    for i, name in enumerate(names):
+        write_profile(profile_path(macros_path, name), count, i * count)
+    clicker = AutoClicker(macros_path=macros_path)
+    clicker._listener.stop()
+    clicker._macro_executor.submit = lambda macro: None
+    key = keyboard.KeyCode.from_char("~")
+    first = timed_ms(clicker.activate_profile, "a")
+    cached = timed_ms(clicker.activate_profile, "default")
+    clicker.activate_profile("b")
+    switches = [timed_ms(clicker.activate_profile, names[i % 3]) for i in range(30)]
+    reload_ms = timed_ms(lambda: [None for _ in clicker.iter_load_macros()])
+    worst_dispatch = dispatch_during(clicker, lambda: [clicker.activate_profile(n) for n in names], key)
+    clicker.shutdown()
+    return {
+        "macros": count,
+        "first_load_ms": first,
+        "cached_switch_ms": cached,
+        "max_cached_switch_ms": max(switches),
+        "full_reload_ms": reload_ms,
+        "max_dispatch_during_switch_ms": worst_dispatch,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile load, cached switch and dispatch latency while switching.")
+    parser.add_argument("--counts", default="100,1000,10000")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    directory = tempfile.mkdtemp(prefix="bench-profiles-")
+    try:
+        results = [run(directory, int(c)) for c in args.counts.split(",")]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'macros':>8} {'first load ms':>14} {'cached ms':>10} {'max cached ms':>14} {'reload ms':>10} "
+          f"{'max dispatch ms':>16}")
+    for r in results:
+        print(f"{r['macros']:>8} {r['first_load_ms']:>14.2f} {r['cached_switch_ms']:>10.3f} "
+              f"{r['max_cached_switch_ms']:>14.3f} {r['full_reload_ms']:>10.2f} "
+              f"{r['max_dispatch_during_switch_ms']:>16.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pynput import keyboard, mouse
+
+from autoclicker_core import (
+    REPLAY_TOLERANCE_MS, AutoClicker, InputRecorder, Macro, PynputBackend, compress_recording, key_name, wait_until,
+)
+
+SHIFT = keyboard.Key.shift_l
+LEFT = mouse.Button.left
+
+SCRIPT = [
+    (0.000, "move", (100, 100)),
+    (0.008, "move", (110, 104)),
+    (0.008, "move", (120, 110)),
+    (0.040, "click", (120, 110, LEFT, True)),
+    (0.030, "click", (120, 110, LEFT, False)),
+    (0.150, "key_down", keyboard.KeyCode.from_char("a")),
+    (0.040, "key_up", keyboard.KeyCode.from_char("a")),
+    (0.100, "key_down", SHIFT),
+    (0.060, "key_down", keyboard.KeyCode.from_char("b")),
+    (0.020, "key_up", keyboard.KeyCode.from_char("b")),
+    (0.050, "key_up", SHIFT),
+    (0.250, "move", (400, 300)),
+    (0.020, "click", (400, 300, LEFT, True)),
+    (0.050, "move", (420, 310)),
+    (0.050, "click", (420, 310, LEFT, False)),
+    (0.500, "key_down", keyboard.Key.page_up),
+    (0.030, "key_up", keyboard.Key.page_up),
+]
+
+def capture(recorder: InputRecorder):
+    recorder.start()
+    t = time.perf_counter()
+    for delay, kind, arg in SCRIPT:
+        t += delay
+        wait_until(t)
+        if kind == "move":
+            recorder.on_move(*arg)
+        elif kind == "click":
+            recorder.on_click(*arg)
+        elif kind == "key_down":
+            recorder.on_key_down(arg)
+        else:
+            recorder.on_key_up(arg)
+    recorder.stop()
+    return recorder.events()
+
+def unsendable_keys(steps, resolve_pynput) -> list:
+    bad = []
+    for step in steps:
+        if "key" in step:
+            try:
+                if key_name(step["key"]) != step["key"]:
+                    raise ValueError
+                resolve_pynput(step["key"])
+            except ValueError:
+                bad.append(step["key"])
+    return bad
+
+def callback_cost_ns(recorder: InputRecorder, repeat: int) -> float:
+    recorder.start()
+    start = time.perf_counter_ns()
+    for i in range(repeat):
+        recorder.on_move(i & 1023, i & 511)
+    elapsed = time.perf_counter_ns() - start
+    recorder.stop()
+    return elapsed / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="Record synthetic input, compress it, replay it and compare timing.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tolerance-ms", type=float, default=REPLAY_TOLERANCE_MS)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    clicker = AutoClicker(macros_path=os.devnull, load_macros=False)
+    clicker.set_backend("dry-run")
+    recorder = InputRecorder(1024)
+    resolve_pynput = PynputBackend()._resolve_key
+    runs = []
+    for _ in range(args.runs):
+        steps, recorded = compress_recording(capture(recorder), with_times=True)
+        unsendable = unsendable_keys(steps, resolve_pynput)
+        timeline = Macro("replay", None, "left", "", 1, 0.0, steps=steps).timeline()
+        clicker.backend.reset()
+        clicker._play_timeline(timeline, threading.Event())
+        replayed = [e[0] for e in clicker.backend.events]
+        replayed = [t - replayed[0] for t in replayed]
+        compile_err = [abs(entry[0] - r) * 1000.0 for entry, r in zip(timeline, recorded)]
+        replay_err = [abs(p - r) * 1000.0 for p, r in zip(replayed, recorded)]
+        runs.append({
+            "events": len(SCRIPT),
+            "steps": len(steps),
+            "actions": len(timeline),
+            "max_compile_error_ms": max(compile_err),
+            "max_replay_error_ms": max(replay_err),
+            "mean_replay_error_ms": sum(replay_err) / len(replay_err),
+            "unsendable_keys": unsendable,
+        })
+    result = {
+        "tolerance_ms": args.tolerance_ms,
+        "record_callback_ns": callback_cost_ns(InputRecorder(1 << 16), 100000),
+        "max_replay_error_ms": max(r["max_replay_error_ms"] for r in runs),
+        "runs": runs,
+    }
+    result["within_tolerance"] = result["max_replay_error_ms"] <= args.tolerance_ms
+    result["keys_sendable"] = not any(r["unsendable_keys"] for r in runs)
+    clicker._macro_executor.shutdown()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"record callback: {result['record_callback_ns']:.0f} ns/event")
+        for r in runs:
+            print(f"{r['events']} events -> {r['steps']} steps ({r['actions']} actions): "
+                  f"compile err {r['max_compile_error_ms']:.3f} ms, replay err max {r['max_replay_error_ms']:.3f} ms "
+                  f"mean {r['mean_replay_error_ms']:.3f} ms")
+        verdict = "within" if result["within_tolerance"] else "OUTSIDE"
+        print(f"max replay error {result['max_replay_error_ms']:.3f} ms, {verdict} {args.tolerance_ms} ms tolerance")
+        if not result["keys_sendable"]:
+            unsendable = sorted({k for r in runs for k in r["unsendable_keys"]})
+            print(f"recorded keys not stored under backend key names: {unsendable}")
+    return 0 if result["within_tolerance"] and result["keys_sendable"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from autoclicker_core import DEFAULT_SETTINGS, AutoClicker, Macro, parse_steps_text
+from autoclicker_sim import Simulation, estimate_macro
+
+def make_macro(name: str, n_clicks: int, interval: float, **kwargs) -> Macro:
+    return Macro(name=name, trigger_key=None, button="left", key_to_send="", n_clicks=n_clicks, interval=interval,
+                 **kwargs)
+
+def scenarios(hours: float):
+    seconds = hours * 3600.0
+    long_macro = make_macro("long", int(seconds * 10), 0.1, start_delay=2.0)
+    steps = make_macro("steps", 1, 0.0, steps=parse_steps_text(
+        f"repeat {int(seconds)}\nclick left\nmove 10 10\nwait 1\nend"))
+    queued = make_macro("queued", 100, 0.05, policy="queue")
+    return {
+        "macro alone": ({}, [(long_macro, 0.0)], []),
+        "macro + master": ({"clicks_per_second": "20"}, [(long_macro, 0.0)], [(5.0, seconds)]),
+        "macro + master, cap": ({"clicks_per_second": "20", "stop_at": str(int(seconds * 15))},
+                                [(long_macro, 0.0)], [(5.0, seconds)]),
+        "steps + master": ({"clicks_per_second": "20"}, [(steps, 0.0)], [(0.0, seconds)]),
+        "queued triggers": ({}, [(queued, i * 1.0) for i in range(int(min(seconds, 3600)))], []),
+    }
+
+def simulate(settings: dict, triggers, holds, trace: bool):
+    sim = Simulation(settings, trace=trace)
+    try:
+        for macro, at in triggers:
+            sim.trigger(macro, at)
+        for start, stop in holds:
+            sim.hold(sim.clicker.master, start, stop)
+        t0 = time.perf_counter()
+        result = sim.run()
+        result["wall_ms"] = (time.perf_counter() - t0) * 1000.0
+    finally:
+        sim.close()
+    return result
+
+def real_run(settings: dict, triggers, holds, duration: float):
+    clicker = AutoClicker(macros_path=os.devnull, load_macros=False, listen=False)
+    clicker.apply_settings(dict(DEFAULT_SETTINGS, backend="dry-run", **settings))
+    start = time.perf_counter()
+    pending = sorted([(at, "trigger", m) for m, at in triggers] + [(a, "start", None) for a, _ in holds]
+                     + [(b, "stop", None) for _, b in holds], key=lambda e: e[0])
+    for at, kind, macro in pending:
+        time.sleep(max(0.0, start + at - time.perf_counter()))
+        if kind == "trigger":
+            clicker._macro_executor.submit(macro)
+        elif kind == "start":
+            clicker.start_channel(clicker.master)
+        else:
+            clicker.stop_channel(clicker.master)
+    time.sleep(max(0.0, start + duration - time.perf_counter()))
+    clicks = clicker.total_clicks_sent
+    clicker.shutdown()
+    return clicks
+
+def agreement(duration: float):
+    settings = {"clicks_per_second": "40", "stop_at": "60"}
+    triggers = [(make_macro("a", 30, 0.02), 0.0), (make_macro("b", 20, 0.03, start_delay=0.1), 0.05)]
+    holds = [(0.2, 0.8)]
+    simulated = simulate(settings, triggers, holds, trace=True)
+    real = real_run(settings, triggers, holds, duration)
+    return {"simulated_clicks": simulated["clicks"], "real_clicks": real,
+            "simulated_cap_at_s": simulated["cap_hits"][0][0] if simulated["cap_hits"] else None}
+
+def main():
+    parser = argparse.ArgumentParser(description="Virtual-clock simulation speed and agreement with the live engine.")
+    parser.add_argument("--hours", type=float, default=1.0, help="simulated time per scenario")
+    parser.add_argument("--no-trace", action="store_true", help="skip recording the event trace")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    results = []
+    for name, (settings, triggers, holds) in scenarios(args.hours).items():
+        r = simulate(settings, triggers, holds, trace=not args.no_trace)
+        results.append({"scenario": name, "simulated_s": r["duration"], "clicks": r["clicks"],
+                        "trace_events": len(r["trace"]), "cap_hits": len(r["cap_hits"]),
+                        "overlaps": len(r["overlaps"]), "wall_ms": r["wall_ms"],
+                        "speedup": r["duration"] / max(r["wall_ms"] / 1000.0, 1e-9)})
+    macro = make_macro("estimate", 1000000, 0.01)
+    t0 = time.perf_counter_ns()
+    for _ in range(1000):
+        estimate_macro(macro, 5000)
+    estimate_us = (time.perf_counter_ns() - t0) / 1000 / 1000.0
+    check = agreement(1.2)
+    if args.json:
+        print(json.dumps({"scenarios": results, "estimate_us": estimate_us, "agreement": check}, indent=2))
+        return
+    print(f"{'scenario':>22} {'simulated':>10} {'clicks':>9} {'events':>8} {'caps':>5} {'overlaps':>8} "
+          f"{'wall ms':>9} {'x real time':>12}")
+    for r in results:
+        print(f"{r['scenario']:>22} {r['simulated_s']:>9.0f}s {r['clicks']:>9} {r['trace_events']:>8} "
+              f"{r['cap_hits']:>5} {r['overlaps']:>8} {r['wall_ms']:>9.2f} {r['speedup']:>12.0f}")
+    print(f"editor estimate: {estimate_us:.2f} us per call")
+    print(f"live engine vs simulation: {check['real_clicks']} vs {check['simulated_clicks']} clicks, "
+          f"simulated cap at {check['simulated_cap_at_s']} s")
+
+if __name__ == "__main__":
+    main()
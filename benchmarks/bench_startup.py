@@ -0,0 +1,110 @@
+# Startup-time budget (cold start on the kiosk machines, measured with this script):
+#
+#   import autoclicker_core       <= 150 ms  (no tkinter, no pyautogui)
+#   import autoclicker            <= 250 ms  (tkinter, no pyautogui, no messagebox)
+#   process start -> first frame  <= 600 ms  (window mapped, before macros.json is parsed)
+#
+# pyautogui (and pymsgbox/pyscreeze/pytweening/Pillow behind it) is only imported once the
+# pyautogui backend sends its first click; tkinter.messagebox only when a dialog is shown;
+# macros.json is loaded after the first frame. The script exits non-zero when a budget
+# is exceeded, so it can gate a release.
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUDGETS_MS = {
+    "import autoclicker_core": 150.0,
+    "import autoclicker": 250.0,
+    "first frame": 600.0,
+}
+
+LAZY_MODULES = ("pyautogui", "tkinter.messagebox", "tkinter.simpledialog")
+
+FIRST_FRAME_CODE = """
+import tkinter as tk
+import autoclicker
+root = tk.Tk()
+app = autoclicker.AutoClickerGUI(root)
+root.update()
+print("frame", flush=True)
+app.clicker._listener.stop()
+root.destroy()
+"""
+
+def import_time(module: str):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    modules = {}
+    for line in result.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if m:
+            modules[m.group(4)] = int(m.group(2)) / 1000.0
+    return modules.get(module, 0.0), modules
+
+def first_frame_time():
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", FIRST_FRAME_CODE], cwd=ROOT,
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    elapsed = (time.perf_counter() - start) * 1000.0
+    _, err = proc.communicate()
+    if line.strip() != "frame":
+        raise RuntimeError(err.strip().splitlines()[-1] if err.strip() else "no frame")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time to first frame against the budget.")
+    parser.add_argument("--runs", type=int, default=5, help="take the best of N runs")
+    parser.add_argument("--top", type=int, default=10, help="show the N slowest imports")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    results = {}
+    details = {}
+    for module in ("autoclicker_core", "autoclicker"):
+        try:
+            runs = [import_time(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            results[f"import {module}"] = None
+            details[module] = str(e)
+            continue
+        best, modules = min(runs, key=lambda r: r[0])
+        results[f"import {module}"] = best
+        details[module] = {
+            "slowest": sorted(modules.items(), key=lambda kv: -kv[1])[:args.top],
+            "unexpected": [m for m in LAZY_MODULES if m in modules],
+        }
+    try:
+        results["first frame"] = min(first_frame_time() for _ in range(args.runs))
+    except RuntimeError as e:
+        results["first frame"] = None
+        details["first frame"] = str(e)
+    over = [name for name, value in results.items() if value is not None and value > BUDGETS_MS[name]]
+    eager = [m for d in details.values() if isinstance(d, dict) for m in d["unexpected"]]
+    if args.json:
+        print(json.dumps({"results_ms": results, "budgets_ms": BUDGETS_MS, "details": details,
+                          "over_budget": over, "eager_imports": eager}, indent=2))
+    else:
+        for name, value in results.items():
+            shown = "n/a" if value is None else f"{value:.1f} ms"
+            print(f"{name:<26} {shown:>10}   budget {BUDGETS_MS[name]:.0f} ms")
+        for module, d in details.items():
+            if isinstance(d, str):
+                print(f"{module}: {d}")
+                continue
+            print(f"slowest imports under {module}:")
+            for name, ms in d["slowest"]:
+                print(f"  {ms:8.1f} ms  {name}")
+        if eager:
+            print(f"imported eagerly but should be lazy: {', '.join(sorted(set(eager)))}")
+    return 1 if over or eager else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
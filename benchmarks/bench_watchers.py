@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from autoclicker_core import Macro, normalize_watch
+from autoclicker_watchers import RegionWatch, ScreenGrabber, WatchManager
+
+SCREEN = (1080, 1920)
+
+class SyntheticScreen:
+    order = "rgb"
+
+    def __init__(self):
+        self.frame = np.zeros(SCREEN + (3,), np.uint8)
+
+    def grab(self, region):
+        x, y, w, h = region
+        return self.frame[y:y + h, x:x + w].copy()
+
+    def close(self):
+        pass
+
+def make_watch(mode: str, size: int, interval: float = 0.1, x: int = 0, y: int = 0) -> Macro:
+    if mode == "change":
+        spec = {"mode": "change", "region": [x, y, size, size]}
+    else:
+        spec = {"mode": "color", "region": [x, y, size, size], "color": [255, 0, 0]}
+    spec["interval"] = interval
+    return Macro(f"{mode} {size}", None, "left", "", 1, 0.0, watch=normalize_watch(spec))
+
+def check_cost_ns(mode: str, size: int, changed: bool, repeat: int) -> float:
+    macro = make_watch(mode, size)
+    watch = RegionWatch(macro, macro.watch)
+    base = np.zeros((size, size, 3), np.uint8)
+    other = base.copy()
+    if changed:
+        other[:] = (255, 0, 0)
+    watch.check(base)
+    frames = (other, base) if changed else (base, base)
+    start = time.perf_counter_ns()
+    for i in range(repeat):
+        watch.check(frames[i & 1])
+    return (time.perf_counter_ns() - start) / repeat
+
+def detection_latency(mode: str, size: int, interval: float, runs: int):
+    screen = SyntheticScreen()
+    fired = threading.Event()
+    stamps = []
+
+    def fire(macro):
+        stamps.append(time.perf_counter())
+        fired.set()
+
+    manager = WatchManager(fire, grabber_factory=lambda: screen)
+    manager.set_macros([make_watch(mode, size, interval)])
+    time.sleep(interval * 3)
+    latencies = []
+    for i in range(runs):
+        screen.frame[:size, :size] = 0
+        time.sleep(interval * (2.0 + (i % 7) / 7.0))
+        fired.clear()
+        flipped = time.perf_counter()
+        screen.frame[:size, :size] = (255, 0, 0)
+        if fired.wait(interval * 10 + 1.0):
+            latencies.append((stamps[-1] - flipped) * 1000.0)
+    manager.close()
+    latencies.sort()
+    return {
+        "mode": mode,
+        "size": size,
+        "interval_ms": interval * 1000.0,
+        "detected": len(latencies),
+        "runs": runs,
+        "mean_ms": sum(latencies) / max(1, len(latencies)),
+        "p50_ms": latencies[len(latencies) // 2] if latencies else None,
+        "max_ms": latencies[-1] if latencies else None,
+    }
+
+def cpu_per_watcher(mode: str, size: int, count: int, interval: float, duration: float):
+    screen = SyntheticScreen()
+    manager = WatchManager(lambda macro: None, grabber_factory=lambda: screen)
+    macros = [make_watch(mode, size, interval, x=(i * size) % (SCREEN[1] - size)) for i in range(count)]
+    manager.set_macros(macros)
+    time.sleep(interval * 2)
+    cpu = time.process_time()
+    time.sleep(duration)
+    cpu = time.process_time() - cpu
+    polls = sum(s["polls"] for s in manager.stats())
+    manager.close()
+    return {
+        "mode": mode,
+        "size": size,
+        "watchers": count,
+        "interval_ms": interval * 1000.0,
+        "cpu_pct": cpu / duration * 100.0,
+        "cpu_pct_per_watcher": cpu / duration * 100.0 / count,
+        "cpu_us_per_poll": cpu * 1e6 / max(1, polls),
+    }
+
+def grab_cost_ms(size: int, repeat: int) -> float:
+    grabber = ScreenGrabber()
+    try:
+        grabber.grab((0, 0, size, size))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            grabber.grab((0, 0, size, size))
+        return (time.perf_counter() - start) * 1000.0 / repeat
+    finally:
+        grabber.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen watcher compare cost, detection latency and CPU per watcher.")
+    parser.add_argument("--sizes", default="1,32,200", help="square region sizes in pixels")
+    parser.add_argument("--interval", type=float, default=0.05, help="poll interval in seconds")
+    parser.add_argument("--runs", type=int, default=20, help="detections per latency measurement")
+    parser.add_argument("--watchers", default="1,10,50")
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--grab", action="store_true", help="also time real screen captures (needs a display)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    result = {"check": [], "latency": [], "cpu": [], "grab": []}
+    for mode in ("change", "color"):
+        for size in sizes:
+            repeat = max(200, 200000 // (size * size))
+            result["check"].append({
+                "mode": mode,
+                "size": size,
+                "unchanged_us": check_cost_ns(mode, size, False, repeat) / 1000.0,
+                "changed_us": check_cost_ns(mode, size, True, repeat) / 1000.0,
+            })
+            result["latency"].append(detection_latency(mode, size, args.interval, args.runs))
+        for count in (int(c) for c in args.watchers.split(",")):
+            result["cpu"].append(cpu_per_watcher(mode, sizes[-1], count, args.interval, args.duration))
+    if args.grab:
+        for size in sizes:
+            result["grab"].append({"size": size, "grab_ms": grab_cost_ms(size, 50)})
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{'mode':>7} {'size':>5} {'unchanged us':>13} {'changed us':>11}")
+    for r in result["check"]:
+        print(f"{r['mode']:>7} {r['size']:>5} {r['unchanged_us']:>13.2f} {r['changed_us']:>11.2f}")
+    print(f"\n{'mode':>7} {'size':>5} {'poll ms':>8} {'detected':>9} {'mean ms':>8} {'p50 ms':>7} {'max ms':>7}")
+    for r in result["latency"]:
+        if not r["detected"]:
+            print(f"{r['mode']:>7} {r['size']:>5} {r['interval_ms']:>8.0f} {0:>9}")
+            continue
+        print(f"{r['mode']:>7} {r['size']:>5} {r['interval_ms']:>8.0f} {r['detected']:>4}/{r['runs']:<4} "
+              f"{r['mean_ms']:>8.2f} {r['p50_ms']:>7.2f} {r['max_ms']:>7.2f}")
+    print(f"\n{'mode':>7} {'size':>5} {'watchers':>9} {'cpu %':>7} {'cpu %/watcher':>14} {'us/poll':>8}")
+    for r in result["cpu"]:
+        print(f"{r['mode']:>7} {r['size']:>5} {r['watchers']:>9} {r['cpu_pct']:>7.2f} "
+              f"{r['cpu_pct_per_watcher']:>14.3f} {r['cpu_us_per_poll']:>8.1f}")
+    for r in result["grab"]:
+        print(f"grab {r['size']}x{r['size']}: {r['grab_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
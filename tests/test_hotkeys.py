@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pynput import keyboard
+
+from autoclicker_core import HotkeyMachine, parse_hotkey_string
+
+def char(c: str):
+    return keyboard.KeyCode.from_char(c)
+
+def machine(*bindings):
+    hotkeys = HotkeyMachine()
+    for text, target in bindings:
+        hotkeys.bind(parse_hotkey_string(text), target)
+    return hotkeys
+
+def tap(hotkeys: HotkeyMachine, *keys):
+    fired = [hotkeys.press(k) for k in keys]
+    for k in reversed(keys):
+        hotkeys.release(k)
+    return [t for t in fired if t is not None]
+
+def test_chord_needs_its_modifiers():
+    hotkeys = machine(("ctrl+shift+g", "chord"), ("g", "plain"))
+    assert tap(hotkeys, keyboard.Key.ctrl_l, keyboard.Key.shift_r, char("g")) == ["chord"]
+    assert tap(hotkeys, char("g")) == ["plain"]
+    assert tap(hotkeys, keyboard.Key.alt_l, char("g")) == ["plain"]
+
+def test_chord_without_fallback_ignores_other_modifiers():
+    hotkeys = machine(("ctrl+g", "chord"))
+    assert tap(hotkeys, keyboard.Key.alt_l, char("g")) == []
+    assert tap(hotkeys, keyboard.Key.ctrl_r, char("g")) == ["chord"]
+
+def test_sequence_with_modifier_step():
+    hotkeys = machine(("g alt+h", "seq"), ("h", "plain"))
+    assert tap(hotkeys, char("g")) == []
+    assert tap(hotkeys, keyboard.Key.alt_l, char("h")) == ["seq"]
+    assert tap(hotkeys, char("h")) == ["plain"]
+
+def test_sequence_with_modifier_first_step():
+    hotkeys = machine(("ctrl+k ctrl+d", "seq"))
+    assert tap(hotkeys, keyboard.Key.ctrl_l, char("k")) == []
+    assert tap(hotkeys, keyboard.Key.ctrl_l, char("d")) == ["seq"]
+
+def test_sequence_times_out():
+    hotkeys = machine(("g h", "seq"))
+    hotkeys.timeout = 0.0
+    tap(hotkeys, char("g"))
+    assert tap(hotkeys, char("h")) == []
+
+def test_modifier_alone_is_a_trigger():
+    hotkeys = machine(("shift", "mod"))
+    assert tap(hotkeys, keyboard.Key.shift) == ["mod"]